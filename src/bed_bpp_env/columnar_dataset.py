@@ -0,0 +1,238 @@
+"""
+Contains a columnar on-disk format for order sequences. The items of all orders are stored in contiguous `.npy` arrays
+that are opened as memory maps, hence, many processes can share one dataset without parsing the JSON file of the order
+sequence. The strings are dictionary-encoded, and the `Order` objects are only created on demand.
+"""
+
+import json
+from array import array
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from bed_bpp_env.data_model.item import Item
+from bed_bpp_env.data_model.order import Order, Properties
+from bed_bpp_env.io_utils import iter_json_object_items
+
+FORMAT_VERSION = 1
+"""The version of the columnar format, which is stored in the metadata."""
+
+METADATA_FILE_NAME = "metadata.json"
+"""The name of the file that stores the order identifiers, the properties of the orders and the string tables."""
+
+_ITEM_COLUMNS = ("dimensions", "weights", "sequences", "articles", "ids", "product_groups")
+_ORDER_COLUMNS = ("offsets", "targets")
+
+
+class ItemColumns(NamedTuple):
+    """The items of an order as columns, each column is a read-only view of the memory-mapped arrays."""
+
+    dimensions: np.ndarray
+    """The length, width and height of each item in millimeters as array of shape `(n_items, 3)`."""
+    weights: np.ndarray
+    """The weight of each item in kilograms."""
+    sequences: np.ndarray
+    """The position of each item within the item sequence."""
+    articles: np.ndarray
+    """The code of the article of each item, see `ColumnarOrderDataset.articles`."""
+
+
+def convert_order_sequence_to_columnar(order_sequence_path: Path, output_dir: Path) -> None:
+    """Converts the order sequence that is stored in the given JSON file to the columnar format. The JSON file is
+    streamed, i.e., the orders are converted one after another.
+
+    Args:
+        order_sequence_path (Path): The path to the JSON file that contains the order sequence.
+        output_dir (Path): The directory in which the columnar dataset is stored, it is created if necessary.
+    """
+    dimensions, weights, sequences = array("q"), array("d"), array("q")
+    string_columns = {"articles": array("q"), "ids": array("q"), "product_groups": array("q")}
+    string_tables = {column: {} for column in ("articles", "ids", "product_groups", "targets")}
+    offsets, targets = array("q", [0]), array("q")
+    order_ids, order_properties = [], []
+
+    def encode(column: str, value: str) -> int:
+        return string_tables[column].setdefault(value, len(string_tables[column]))
+
+    for order_id, serialized_order in iter_json_object_items(order_sequence_path):
+        for serialized_item in serialized_order["item_sequence"].values():
+            item = Item.from_dict(serialized_item)
+            dimensions.extend((int(item.length_mm), int(item.width_mm), int(item.height_mm)))
+            weights.append(float(item.weight_kg))
+            sequences.append(int(item.sequence))
+            string_columns["articles"].append(encode("articles", item.article))
+            string_columns["ids"].append(encode("ids", item.id))
+            string_columns["product_groups"].append(encode("product_groups", item.product_group))
+
+        properties = Properties.from_dict(serialized_order["properties"])
+        offsets.append(len(sequences))
+        targets.append(encode("targets", properties.target))
+        order_ids.append(order_id)
+        order_properties.append([properties.id, properties.order_number, properties.type])
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    columns = {
+        "dimensions": np.asarray(dimensions, dtype=np.int64).reshape(-1, 3),
+        "weights": np.asarray(weights, dtype=np.float64),
+        "sequences": np.asarray(sequences, dtype=np.int64),
+        **{column: np.asarray(codes, dtype=np.int64) for column, codes in string_columns.items()},
+    }
+    for column, values in columns.items():
+        np.save(output_dir / f"items_{column}.npy", values)
+    np.save(output_dir / "orders_offsets.npy", np.asarray(offsets, dtype=np.int64))
+    np.save(output_dir / "orders_targets.npy", np.asarray(targets, dtype=np.int64))
+
+    metadata = {
+        "version": FORMAT_VERSION,
+        "order_ids": order_ids,
+        "order_properties": order_properties,
+        "strings": {column: list(table) for column, table in string_tables.items()},
+    }
+    with open(output_dir / METADATA_FILE_NAME, "w") as file:
+        json.dump(metadata, file)
+
+
+class ColumnarOrderDataset:
+    """An order sequence in the columnar format. The arrays are opened as read-only memory maps, thus, the items of an
+    order are read from the disk when they are accessed and the pages are shared by all processes that open the same
+    dataset. An order is accessed by its identifier in constant time.
+
+    When a dataset is pickled, e.g., to send it to a worker process, only its directory is pickled and the arrays are
+    mapped again in the receiving process.
+
+    Args:
+        directory (Path): The directory of the dataset that was created by `convert_order_sequence_to_columnar`.
+
+    Examples:
+        >>> dataset = ColumnarOrderDataset(path)
+        >>> dataset.items("00100001").dimensions  # no copy of the items
+        memmap([[600, 400, 220], ...])
+        >>> dataset.order("00100001")  # creates the `Order`
+        Order(id='00100001', ...)
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self._directory = Path(directory)
+
+        with open(self._directory / METADATA_FILE_NAME) as file:
+            metadata: dict = json.load(file)
+        if metadata["version"] != FORMAT_VERSION:
+            raise ValueError(f"the columnar format version {metadata['version']} is not supported")
+
+        self._order_ids: list[str] = metadata["order_ids"]
+        self._order_properties: list[list[str]] = metadata["order_properties"]
+        self._strings: dict[str, list[str]] = metadata["strings"]
+        self._order_index = {order_id: index for index, order_id in enumerate(self._order_ids)}
+
+        self._items = {
+            column: np.load(self._directory / f"items_{column}.npy", mmap_mode="r") for column in _ITEM_COLUMNS
+        }
+        self._orders = {
+            column: np.load(self._directory / f"orders_{column}.npy", mmap_mode="r") for column in _ORDER_COLUMNS
+        }
+
+    def __getstate__(self) -> dict:
+        return {"directory": self._directory}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["directory"])
+
+    def __len__(self) -> int:
+        return len(self._order_ids)
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._order_index
+
+    @property
+    def order_ids(self) -> list[str]:
+        """The identifiers of the orders in the sequence of the order sequence."""
+        return list(self._order_ids)
+
+    @property
+    def articles(self) -> list[str]:
+        """The articles, the code of an article is its index in this list."""
+        return list(self._strings["articles"])
+
+    def n_items(self, order_id: str) -> int:
+        """Returns the amount of items of the given order."""
+        item_slice = self._item_slice(order_id)
+        return item_slice.stop - item_slice.start
+
+    def target(self, order_id: str) -> str:
+        """Returns the palletizing target of the given order."""
+        return self._strings["targets"][int(self._orders["targets"][self._index(order_id)])]
+
+    def items(self, order_id: str, start: int = 0, stop: int = None) -> ItemColumns:
+        """Returns the items of the given order as columns without copying them.
+
+        Args:
+            order_id (str): The identifier of the order.
+            start (int, optional): The position of the first item within the item sequence. Defaults to `0`.
+            stop (int, optional): The position after the last item within the item sequence. Defaults to `None`,
+                i.e., up to the last item.
+
+        Returns:
+            ItemColumns: The views of the items.
+        """
+        item_slice = self._item_slice(order_id)
+        start, stop, _ = slice(start, stop).indices(item_slice.stop - item_slice.start)
+        batch = slice(item_slice.start + start, item_slice.start + max(start, stop))
+        return ItemColumns(
+            dimensions=self._items["dimensions"][batch],
+            weights=self._items["weights"][batch],
+            sequences=self._items["sequences"][batch],
+            articles=self._items["articles"][batch],
+        )
+
+    def order(self, order_id: str) -> Order:
+        """Creates the `Order` with the given identifier.
+
+        Args:
+            order_id (str): The identifier of the order.
+
+        Returns:
+            Order: The order, equal to the order that is loaded from the JSON file.
+        """
+        index = self._index(order_id)
+        item_slice = self._item_slice(order_id)
+        articles, ids, product_groups = (
+            self._strings["articles"],
+            self._strings["ids"],
+            self._strings["product_groups"],
+        )
+
+        item_sequence = []
+        for i_item in range(item_slice.start, item_slice.stop):
+            length, width, height = self._items["dimensions"][i_item].tolist()
+            item_sequence.append(
+                Item(
+                    article=articles[self._items["articles"][i_item]],
+                    id=ids[self._items["ids"][i_item]],
+                    product_group=product_groups[self._items["product_groups"][i_item]],
+                    length_mm=length,
+                    width_mm=width,
+                    height_mm=height,
+                    weight_kg=float(self._items["weights"][i_item]),
+                    sequence=int(self._items["sequences"][i_item]),
+                )
+            )
+
+        properties_id, order_number, order_type = self._order_properties[index]
+        properties = Properties(
+            id=properties_id, order_number=order_number, type=order_type, target=self.target(order_id)
+        )
+        return Order(id=order_id, item_sequence=item_sequence, properties=properties)
+
+    def _index(self, order_id: str) -> int:
+        """Returns the index of the given order."""
+        index = self._order_index.get(order_id)
+        if index is None:
+            raise KeyError(order_id)
+        return index
+
+    def _item_slice(self, order_id: str) -> slice:
+        """Returns the slice of the items of the given order in the item columns."""
+        index = self._index(order_id)
+        return slice(int(self._orders["offsets"][index]), int(self._orders["offsets"][index + 1]))
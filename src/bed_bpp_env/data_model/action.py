@@ -1,4 +1,4 @@
-from dataclasses import dataclass, fields
+from dataclasses import dataclass
 from typing import Self
 
 from bed_bpp_env.data_model.dataclass_base import DataclassBase
@@ -6,7 +6,7 @@ from bed_bpp_env.data_model.item import Item
 from bed_bpp_env.data_model.position_3d import Position3D
 
 
-@dataclass
+@dataclass(slots=True)
 class Action(DataclassBase):
     """An action represents which item is placed, in which location, and in which orientation."""
 
@@ -20,20 +20,11 @@ class Action(DataclassBase):
     @classmethod
     def from_dict(cls, serialized: dict[str, str | list[dict]]) -> Self:
         """Deserialize dictionary into dataclass instance."""
-        init_kwargs = {}
-        for f in fields(cls):
-            key = f.name
-
-            if key == "item":
-                init_kwargs[key] = Item.from_dict(serialized[key])
-
-            elif key == "flb_coordinates":
-                init_kwargs[key] = Position3D(*serialized[key])
-
-            else:
-                init_kwargs[key] = serialized[key]
-
-        return cls(**init_kwargs)
+        return cls(
+            item=Item.from_dict(serialized["item"]),
+            orientation=serialized["orientation"],
+            flb_coordinates=Position3D(*serialized["flb_coordinates"]),
+        )
 
     def to_dict(self) -> dict:
         """Converts the object to a dictionary."""
@@ -1,21 +1,94 @@
+import inspect
 from abc import ABC
-from dataclasses import dataclass, fields
-from typing import Self
+from collections.abc import Callable
+from dataclasses import Field, InitVar, dataclass, fields
+from typing import ClassVar, Self, get_origin
 
 
-@dataclass
-class DataclassBase(ABC):
-    """Base class for data model that deserializes instances by considering a defined `alias`."""
+def _is_field(annotation: object) -> bool:
+    """Returns whether a class variable with the given annotation is a field, i.e., neither a `ClassVar` nor an `InitVar`."""
+    if isinstance(annotation, str):
+        return not annotation.startswith(("ClassVar", "typing.ClassVar", "InitVar", "dataclasses.InitVar"))
+    return annotation is not ClassVar and get_origin(annotation) is not ClassVar and not isinstance(annotation, InitVar)
+
+
+def _aliases(cls: type) -> list[tuple[str, str]]:
+    """
+    Returns the name and the alias of each field that is passed to `__init__`. Since `__init_subclass__` is called
+    before the `dataclass` decorator processes the class, the fields of the class itself are read from its body, unless
+    the decorator already processed it, e.g., when it recreates the class with `__slots__`.
+    """
+    if "__dataclass_fields__" in cls.__dict__:
+        return [(f.name, f.metadata.get("alias", f.name)) for f in fields(cls) if f.init]
+
+    init_and_alias: dict[str, tuple[bool, str]] = {}
+    for base in reversed(cls.__mro__[1:]):
+        if "__dataclass_fields__" in base.__dict__:
+            for f in fields(base):
+                init_and_alias[f.name] = (f.init, f.metadata.get("alias", f.name))
+    for name, annotation in inspect.get_annotations(cls).items():
+        if _is_field(annotation):
+            default = cls.__dict__.get(name)
+            if isinstance(default, Field):
+                init_and_alias[name] = (default.init, default.metadata.get("alias", name))
+            else:
+                init_and_alias[name] = (True, name)
+    return [(name, alias) for name, (init, alias) in init_and_alias.items() if init]
+
+
+def _make_from_dict(aliases: list[tuple[str, str]]) -> Callable:
+    """
+    Returns the deserializer for the given fields. If the input contains the alias of each field, the instance is
+    created without any further lookups, otherwise each field is looked up by either its alias or its original name.
+    """
+    all_aliases = {alias for _, alias in aliases}
+
+    def from_dict(cls: type, serialized: dict) -> object:
+        if serialized.keys() >= all_aliases:
+            return cls(**{name: serialized[alias] for name, alias in aliases})
 
-    @classmethod
-    def from_dict(cls, serialized: dict[str, str]) -> Self:
-        """Deserialize dictionary into dataclass instance, considering defined `alias`."""
         init_kwargs = {}
-        for f in fields(cls):
-            alias = f.metadata.get("alias", f.name)
+        for name, alias in aliases:
             # Support either the alias or the original name in the input dict
             if alias in serialized:
-                init_kwargs[f.name] = serialized[alias]
-            elif f.name in serialized:
-                init_kwargs[f.name] = serialized[f.name]
+                init_kwargs[name] = serialized[alias]
+            elif name in serialized:
+                init_kwargs[name] = serialized[name]
         return cls(**init_kwargs)
+
+    return from_dict
+
+
+def _make_to_dict(aliases: list[tuple[str, str]]) -> Callable:
+    """Returns the serializer for the given fields, which uses the alias of each field as key."""
+
+    def to_dict(self: object) -> dict:
+        return {alias: getattr(self, name) for name, alias in aliases}
+
+    return to_dict
+
+
+@dataclass(slots=True)
+class DataclassBase(ABC):
+    """
+    Base class for data model that deserializes instances by considering a defined `alias`.
+
+    The deserializer and the serializer of a subclass are generated once, when the subclass is created. Hence, the
+    fields and their aliases are not resolved for each instance.
+    """
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        # the decorator replaces the class with a slotted one, hence, the class is named explicitly
+        super(DataclassBase, cls).__init_subclass__(**kwargs)
+        aliases = _aliases(cls)
+        cls._from_dict_codec = _make_from_dict(aliases)
+        cls._to_dict_codec = _make_to_dict(aliases)
+
+    @classmethod
+    def from_dict(cls, serialized: dict[str, str]) -> Self:
+        """Deserialize dictionary into dataclass instance, considering defined `alias`."""
+        return cls._from_dict_codec(cls, serialized)
+
+    def to_dict(self) -> dict:
+        """Converts the object to a dictionary, considering defined `alias`."""
+        return type(self)._to_dict_codec(self)
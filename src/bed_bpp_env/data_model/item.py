@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field, fields
+from dataclasses import dataclass, field
 
 from bed_bpp_env.data_model.dataclass_base import DataclassBase
 
 
-@dataclass
+@dataclass(slots=True)
 class Item(DataclassBase):
     """Represents an object that has to be packed and that is part of an order."""
 
@@ -38,13 +38,3 @@ class Item(DataclassBase):
             key_value_pair_repr += f"{key}: {value}\n"
 
         return key_value_pair_repr
-
-    def to_dict(self) -> dict[str, str | int | float]:
-        """Converts the object to a dictionary."""
-        item_to_dict = {}
-
-        for item_field in fields(self):
-            key = item_field.metadata.get("alias", item_field.name)
-            item_to_dict[key] = getattr(self, item_field.name)
-
-        return item_to_dict
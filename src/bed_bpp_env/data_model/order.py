@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field, fields
+from dataclasses import dataclass, field
 
 from bed_bpp_env.data_model.dataclass_base import DataclassBase
 from bed_bpp_env.data_model.item import Item
@@ -36,19 +36,10 @@ class Order(object):
     @classmethod
     def from_dict(cls, serialized: dict[str, str | int | None]) -> Order:
         """Deserialize dictionary into dataclass instance."""
-        init_kwargs = {}
-        for f in fields(cls):
-            key = f.name
-
-            if key == "item_sequence":
-                item_sequence = [Item.from_dict(serialized_item) for serialized_item in serialized[key].values()]
-                init_kwargs[key] = item_sequence
-
-            elif key == "properties":
-                serialized_properties = serialized[key]
-                init_kwargs[key] = Properties.from_dict(serialized_properties)
-
-            else:
-                init_kwargs[key] = serialized[key]
-
-        return cls(**init_kwargs)
+        item_from_dict = Item.from_dict
+        item_sequence = [item_from_dict(serialized_item) for serialized_item in serialized["item_sequence"].values()]
+        return cls(
+            id=serialized["id"],
+            item_sequence=item_sequence,
+            properties=Properties.from_dict(serialized["properties"]),
+        )
@@ -1,4 +1,4 @@
-from dataclasses import dataclass, fields
+from dataclasses import dataclass
 from typing import Self
 
 from bed_bpp_env.data_model.action import Action
@@ -20,18 +20,9 @@ class PackingPlan(DataclassBase):
     @classmethod
     def from_dict(cls, serialized: dict[str, str | list[dict]]) -> Self:
         """Deserialize dictionary into dataclass instance."""
-        init_kwargs = {}
-        for f in fields(cls):
-            key = f.name
-
-            if key == "actions":
-                action_sequence = [Action.from_dict(serialized_action) for serialized_action in serialized[key]]
-                init_kwargs[key] = action_sequence
-
-            else:
-                init_kwargs[key] = serialized[key]
-
-        return cls(**init_kwargs)
+        action_from_dict = Action.from_dict
+        actions = [action_from_dict(serialized_action) for serialized_action in serialized["actions"]]
+        return cls(id=serialized["id"], actions=actions)
 
     def to_dict(self) -> dict:
         """Converts the object to a dictionary."""
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, fields
+from dataclasses import dataclass
 from typing import Optional
 
 from bed_bpp_env.data_model.dataclass_base import DataclassBase
@@ -11,7 +11,7 @@ SERIALIZE_NONE = False
 """Indicates whether `None` values are serialized."""
 
 
-@dataclass
+@dataclass(slots=True)
 class Position3D(DataclassBase):
     """A position in 3d with an optional area name."""
 
@@ -31,15 +31,9 @@ class Position3D(DataclassBase):
 
     def to_dict(self) -> dict[str, str | int | None]:
         """Converts the object to a dictionary."""
-        position_to_dict = {}
+        position_to_dict = DataclassBase.to_dict(self)
 
-        for position_field in fields(self):
-            key = position_field.name
-            value = getattr(self, position_field.name)
-
-            if not SERIALIZE_NONE and value is None:
-                continue
-
-            position_to_dict[key] = value
+        if not SERIALIZE_NONE:
+            position_to_dict = {key: value for key, value in position_to_dict.items() if value is not None}
 
         return position_to_dict
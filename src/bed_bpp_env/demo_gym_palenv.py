@@ -31,7 +31,6 @@ logger = logging.getLogger(__name__)
 # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
 if __name__ == "__main__":
-    import json
     import subprocess
 
     from bed_bpp_env.environment.palletizing_environment import PalletizingEnvironment
@@ -47,9 +46,6 @@ if __name__ == "__main__":
     heuristic = LowestArea()
 
     order_data_path = utils.PARSEDARGUMENTS["data"]
-    with open(order_data_path) as f:
-        ORDERS_FOR_EPISODES = json.load(f, parse_int=False)
-
     order_sequence = load_order_sequence(order_data_path)
 
     # USE IMPLEMENTED WRAPPERS
@@ -0,0 +1,84 @@
+"""
+This module contains a class that represents the coordinates in which the FLB corner of an item can be placed such
+that the item is completely inside the palletizing target.
+"""
+
+import functools
+
+import numpy as np
+
+from bed_bpp_env.environment.storage_mode import StorageMode
+
+
+@functools.lru_cache(maxsize=16)
+def _allowed_area_mask(targetsize: tuple, footprint: tuple, dtype: type) -> np.ndarray:
+    """Creates the read-only mask of an allowed area, the masks are shared by all allowed areas with the same key."""
+    mask = np.zeros((targetsize[1], targetsize[0]), dtype=dtype)
+    mask[0 : max(targetsize[1] - footprint[1], 0), 0 : max(targetsize[0] - footprint[0], 0)] = 1
+    mask.flags.writeable = False
+    return mask
+
+
+class AllowedArea:
+    """
+    The allowed area of an item in an orientation, i.e., the coordinates in which the FLB corner of the item can be
+    placed. The allowed area is always a single axis-aligned rectangle that starts in the origin, hence, only the
+    target size and the item's footprint are stored. The mask of the area is created on demand and cached, so that all
+    allowed areas with the same target size, footprint and data type share the same read-only `np.ndarray`.
+
+    For compatibility with code that expects the mask, an allowed area can be used like an `np.ndarray`, e.g., in
+    `np.argwhere(np.asarray(allowed_area) == 1)`. Note that the mask accesses the coordinates in (y, x) order.
+
+    Parameters.
+    -----------
+    targetsize: tuple
+        The palletizing target's size of the base area in x- and y-direction given in millimeters.
+    footprint: tuple
+        The size of the item in x- and y-direction in the considered orientation given in millimeters.
+    storage_mode: StorageMode (default = StorageMode.DEFAULT)
+        Defines the data type of the mask.
+    """
+
+    __slots__ = ("_target_size", "_footprint", "_storage_mode")
+
+    def __init__(self, targetsize: tuple, footprint: tuple, storage_mode: StorageMode = StorageMode.DEFAULT) -> None:
+        self._target_size = (int(targetsize[0]), int(targetsize[1]))
+        """The palletizing target's size of the base area in x- and y-direction given in millimeters."""
+        self._footprint = (int(footprint[0]), int(footprint[1]))
+        """The size of the item in x- and y-direction in the considered orientation given in millimeters."""
+        self._storage_mode = StorageMode(storage_mode)
+        """Defines the data type of the mask."""
+
+    def __repr__(self) -> str:
+        return f"AllowedArea(bounds={self.bounds})"
+
+    def __contains__(self, coordinates: tuple) -> bool:
+        """Returns whether the FLB corner of the item can be placed in the given `(x, y)` coordinates."""
+        start_x, start_y, end_x, end_y = self.bounds
+        return (start_x <= coordinates[0] < end_x) and (start_y <= coordinates[1] < end_y)
+
+    def __array__(self, dtype: type = None, copy: bool = None) -> np.ndarray:
+        if dtype is None and not copy:
+            return self.mask
+        return np.array(self.mask, dtype=dtype)
+
+    def __getitem__(self, key) -> np.ndarray:
+        return self.mask[key]
+
+    @property
+    def bounds(self) -> tuple[int, int, int, int]:
+        """The rectangle of the allowed area as `(x_start, y_start, x_end, y_end)`, where the end coordinates are
+        exclusive. The rectangle is empty if the item does not fit on the target."""
+        end_x = max(self._target_size[0] - self._footprint[0], 0)
+        end_y = max(self._target_size[1] - self._footprint[1], 0)
+        return 0, 0, end_x, end_y
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """The shape of the mask, i.e., the size of the target in y- and x-direction."""
+        return self._target_size[1], self._target_size[0]
+
+    @property
+    def mask(self) -> np.ndarray:
+        """The read-only mask of the allowed area, `1` if the item can be placed in a coordinate, else `0`."""
+        return _allowed_area_mask(self._target_size, self._footprint, self._storage_mode.mask_dtype)
@@ -0,0 +1,283 @@
+"""
+The module `batch_palletizing_environment` contains a vectorized version of the `PalletizingEnvironment`, which follows
+the `gymnasium.vector.VectorEnv` API and palletizes `N` orders in lockstep.
+
+Each sub-environment palletizes the items of its order in the sequence of the order, i.e., the task is `"O3DBP-1-1"`.
+Whenever the episode of a sub-environment has ended, it is reset with the next order of the given order sequence in the
+following call of `step` (next-step autoreset). Once the order sequence is exhausted, the sub-environment stays
+terminated and ignores its actions.
+"""
+
+import logging
+from collections import deque
+from collections.abc import Iterable
+from typing import Any, Optional
+
+import numpy as np
+from gymnasium.spaces import Box, Dict, Discrete
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
+
+from bed_bpp_env.data_model.action import Action
+from bed_bpp_env.data_model.item import Item
+from bed_bpp_env.data_model.order import Order
+from bed_bpp_env.data_model.packing_plan import PackingPlan
+from bed_bpp_env.data_model.position_3d import Position3D
+from bed_bpp_env.environment import MAXHEIGHT_OBSERVATION_SPACE, SIZE_EURO_PALLET, SIZE_ROLLCONTAINER
+from bed_bpp_env.environment.batch_space_3d import BatchSpace3D
+
+logger = logging.getLogger(__name__)
+
+
+class BatchPalletizingEnvironment(VectorEnv):
+    """
+    The BatchPalletizingEnvironment palletizes `num_envs` orders in lockstep. The height maps of all sub-environments are
+    stored in a `BatchSpace3D`, thus, a call of `step` calculates the FLB z-coordinates, the support ratios and the new
+    height maps of all sub-environments with whole-array operations.
+
+    Parameters.
+    -----------
+    num_envs: int
+        The amount of sub-environments.
+    target: str (default = "euro-pallet")
+        The palletizing target of all sub-environments. Orders with a different target are rejected.
+
+    Examples.
+    ---------
+    >>> envs = BatchPalletizingEnvironment(num_envs=2)
+    >>> observations, infos = envs.reset(options={"order_sequence": order_sequence})
+    >>> actions = {
+            "x": np.array([0, 100]),
+            "y": np.array([0, 0]),
+            "orientation": np.array([0, 1]),
+            "item": infos["next_items_selection"], # optional, checked against the next items
+        }
+    >>> observations, rewards, terminations, truncations, infos = envs.step(actions)
+    """
+
+    metadata = {"autoreset_mode": AutoresetMode.NEXT_STEP}
+
+    def __init__(self, num_envs: int, target: str = "euro-pallet") -> None:
+        self.num_envs = num_envs
+        """The amount of sub-environments."""
+
+        self._target = target
+        """The palletizing target of all sub-environments."""
+        if target == "rollcontainer":
+            self._size = SIZE_ROLLCONTAINER
+        elif target == "euro-pallet":
+            self._size = SIZE_EURO_PALLET
+        else:
+            raise ValueError(f"target {target} unknown")
+
+        self._n_orientations = 2
+        """The amount of different orientations that are allowed during palletization."""
+
+        self.single_action_space = Dict(
+            {
+                "x": Discrete(self._size[0]),
+                "y": Discrete(self._size[1]),
+                "orientation": Discrete(self._n_orientations),
+            }
+        )
+        """The action space of a single sub-environment."""
+        self.action_space = batch_space(self.single_action_space, self.num_envs)
+        """The action space of all sub-environments."""
+
+        self.single_observation_space = Box(
+            low=0, high=MAXHEIGHT_OBSERVATION_SPACE, shape=(self._size[1], self._size[0]), dtype=int
+        )
+        """The observation space of a single sub-environment, i.e., the heights in each coordinate of the target."""
+        self.observation_space = batch_space(self.single_observation_space, self.num_envs)
+        """The observation space of all sub-environments."""
+
+        self._target_spaces = BatchSpace3D(self.num_envs, self._size)
+        """Represents the 3D spaces where the palletization takes place."""
+
+        self._pending_orders: deque[Order] = deque()
+        """The orders that have not been assigned to a sub-environment yet."""
+        self._current_orders: list[Optional[Order]] = [None] * self.num_envs
+        """The order each sub-environment palletizes, `None` if the order sequence is exhausted."""
+        self._item_sequence_counters = np.zeros(self.num_envs, dtype=int)
+        """The position within the item sequence of the current order of each sub-environment."""
+        self._actions: list[list[Action]] = [[] for _ in range(self.num_envs)]
+        """The actions of the current episode of each sub-environment."""
+        self._palletized_volume = np.zeros(self.num_envs)
+        """The palletized volume of all items in cm^3 of each sub-environment."""
+        self._autoreset = np.zeros(self.num_envs, dtype=bool)
+        """Indicates which sub-environments are reset in the next call of `step`."""
+
+        self._packing_plans: list[PackingPlan] = []
+        """The packing plans of the finished episodes."""
+
+    def reset(
+        self, *, seed: Optional[int] = None, options: Optional[dict[str, Any]] = None
+    ) -> tuple[np.ndarray, dict[str, Any]]:
+        """
+        Resets all sub-environments. If the options contain an `"order_sequence"`, the orders of this sequence are
+        distributed to the sub-environments.
+
+        Parameters.
+        -----------
+        seed: int (default = None)
+            The seed, it is not used since the environment is deterministic.
+        options: dict (default = None)
+            May contain the key `"order_sequence"` whose value is an iterable of `Order`.
+
+        Returns.
+        --------
+        observations: np.ndarray
+            The heights of all sub-environments with shape `(N, H, W)`.
+        infos: dict
+            Additional information, each value has one entry for every sub-environment.
+        """
+        super().reset(seed=seed)
+
+        if options is not None and options.get("order_sequence") is not None:
+            self._set_order_sequence(options["order_sequence"])
+        else:
+            # restart the episodes of the orders that are currently palletized
+            self._pending_orders.extendleft(reversed([order for order in self._current_orders if order is not None]))
+
+        self._packing_plans = []
+        self._reset_sub_environments(np.ones(self.num_envs, dtype=bool))
+
+        return self._target_spaces.getHeights(), self._get_infos()
+
+    def step(self, actions: dict) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict[str, Any]]:
+        """
+        Palletizes the next item of every running sub-environment at the given positions. Sub-environments whose episode
+        has ended in the previous call are reset instead and their actions are ignored.
+
+        Parameters.
+        -----------
+        actions: dict
+            Contains the arrays `"x"`, `"y"` and `"orientation"` with one value for each sub-environment. The optional
+            key `"item"` holds the items that are placed, they must match the next items of the sub-environments.
+
+        Returns.
+        --------
+        observations: np.ndarray
+            The heights of all sub-environments with shape `(N, H, W)`.
+        rewards: np.ndarray
+            The rewards of the sub-environments.
+        terminations: np.ndarray
+            Indicates which episodes have ended.
+        truncations: np.ndarray
+            Always `False`, since episodes are not truncated.
+        infos: dict
+            Additional information, each value has one entry for every sub-environment.
+        """
+        reset_now = self._autoreset.copy()
+        self._reset_sub_environments(reset_now)
+
+        running = np.array([order is not None for order in self._current_orders]) & ~reset_now
+        next_items = self._get_next_items()
+        self.__checkActionItems(actions.get("item"), next_items, running)
+
+        # gather the item sizes, items of not running sub-environments have size zero
+        orientation = np.asarray(actions["orientation"], dtype=int)
+        item_sizes = np.zeros((self.num_envs, 3), dtype=int)
+        for i_env in np.flatnonzero(running):
+            item = next_items[i_env]
+            item_sizes[i_env] = item.length_mm, item.width_mm, item.height_mm
+        delta_x = np.where(orientation == 0, item_sizes[:, 0], item_sizes[:, 1])
+        delta_y = np.where(orientation == 0, item_sizes[:, 1], item_sizes[:, 0])
+
+        flb_x, flb_y = np.asarray(actions["x"], dtype=int), np.asarray(actions["y"], dtype=int)
+        flb_z, support_ratio = self._target_spaces.addItems(
+            flb_x, flb_y, delta_x, delta_y, item_sizes[:, 2], active=running
+        )
+
+        self._palletized_volume += (delta_x * delta_y * item_sizes[:, 2]) / 1000.0
+        self._item_sequence_counters += running
+
+        for i_env in np.flatnonzero(running):
+            self._actions[i_env].append(
+                Action(
+                    item=next_items[i_env],
+                    orientation=int(orientation[i_env]),
+                    flb_coordinates=Position3D(x=int(flb_x[i_env]), y=int(flb_y[i_env]), z=int(flb_z[i_env])),
+                )
+            )
+
+        n_items_in_orders = np.array(
+            [0 if order is None else len(order.item_sequence) for order in self._current_orders]
+        )
+        episode_done = running & (self._item_sequence_counters >= n_items_in_orders)
+        for i_env in np.flatnonzero(episode_done):
+            self._packing_plans.append(PackingPlan(id=self._current_orders[i_env].id, actions=self._actions[i_env]))
+
+        exhausted = np.array([order is None for order in self._current_orders])
+        terminations = episode_done | exhausted
+        self._autoreset = episode_done
+        rewards = episode_done.astype(float)
+        truncations = np.zeros(self.num_envs, dtype=bool)
+
+        infos = self._get_infos()
+        infos.update({"support_area/%": support_ratio, "flb_z": flb_z, "placed": running})
+
+        return self._target_spaces.getHeights(), rewards, terminations, truncations, infos
+
+    def close_extras(self, **kwargs: Any) -> None:
+        self._pending_orders.clear()
+
+    def getPackingPlans(self) -> list[PackingPlan]:
+        """Returns the packing plans of all episodes that have ended since the last `reset`."""
+        return self._packing_plans
+
+    def _set_order_sequence(self, order_sequence: Iterable[Order]) -> None:
+        """Stores the given orders as pending orders and checks whether their target fits to this environment."""
+        self._pending_orders = deque(order_sequence)
+        for order in self._pending_orders:
+            if order.properties.target != self._target:
+                raise ValueError(f"order {order.id} has target {order.properties.target}, expected {self._target}")
+        self._current_orders = [None] * self.num_envs
+
+    def _reset_sub_environments(self, to_reset: np.ndarray) -> None:
+        """Assigns the next pending orders to the given sub-environments and resets their targets."""
+        for i_env in np.flatnonzero(to_reset):
+            self._current_orders[i_env] = self._pending_orders.popleft() if self._pending_orders else None
+            self._actions[i_env] = []
+            if self._current_orders[i_env] is not None:
+                logger.info(f"sub-environment {i_env}: CURRENT ORDER:{self._current_orders[i_env].id}")
+
+        self._target_spaces.reset(to_reset)
+        self._item_sequence_counters[to_reset] = 0
+        self._palletized_volume[to_reset] = 0.0
+        self._autoreset[to_reset] = False
+
+    def _get_next_items(self) -> list[Optional[Item]]:
+        """Returns the next item of every sub-environment, `None` if there is none."""
+        next_items = []
+        for order, counter in zip(self._current_orders, self._item_sequence_counters):
+            if order is None or counter >= len(order.item_sequence):
+                next_items.append(None)
+            else:
+                next_items.append(order.item_sequence[counter])
+        return next_items
+
+    def _get_infos(self) -> dict[str, Any]:
+        """Returns the information about every sub-environment."""
+        next_items = np.empty(self.num_envs, dtype=object)
+        next_items[:] = self._get_next_items()
+        order_ids = np.array([None if order is None else order.id for order in self._current_orders], dtype=object)
+
+        infos = {
+            "order_id": order_ids,
+            "next_items_selection": next_items,
+            "item_volume_on_target/cm^3": self._palletized_volume.copy(),
+            "all_orders_considered": all(order is None for order in self._current_orders) and not self._pending_orders,
+        }
+        return infos
+
+    def __checkActionItems(
+        self, action_items: Optional[Iterable[Item]], next_items: list[Optional[Item]], running: np.ndarray
+    ) -> None:
+        """Raises a `ValueError` if an item of the given actions is not the next item of a running sub-environment."""
+        if action_items is None:
+            return
+
+        for i_env, (action_item, next_item) in enumerate(zip(action_items, next_items)):
+            if running[i_env] and action_item != next_item:
+                raise ValueError(f"item {action_item} must not be selected in sub-environment {i_env}.")
@@ -0,0 +1,183 @@
+"""
+This module contains a class that represents several virtual, three-dimensional spaces of identical size, whose height
+maps are stored in a single array.
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from bed_bpp_env.environment import HEIGHT_TOLERANCE_MM
+
+logger = logging.getLogger(__name__)
+
+
+class BatchSpace3D:
+    """
+    This class represents `N` virtual spaces to which items are added in lockstep. In contrast to `Space3D`, the
+    heights and the uppermost items of all spaces are stored in a single `np.ndarray` of shape `(N, H, W)`, such that
+    the FLB z-coordinates, the support ratios and the update of the height maps are calculated for all spaces at once.
+    Only the footprints of the items are gathered into an array of shape `(N, max_delta_y, max_delta_x)` and written
+    back, hence, a step costs `O(N * footprint)` like `Space3D.addItem` for each space, and not `O(N * H * W)`.
+
+    Note that the spaces do not store `Cuboid` objects, i.e., neighbors and support surfaces of single items are not
+    available. Use `Space3D` if you need them.
+
+    Parameters.
+    -----------
+    n_spaces: int
+        The amount of spaces.
+    basesize: tuple (default = (1200, 800))
+        The size of the base area of every space in x- and y-direction given in millimeters.
+
+    Attributes.
+    -----------
+    _heights: np.ndarray
+        This `np.ndarray` has the shape `(N, H, W)` and stores the height in each position of each space in millimeters.
+    _n_placed_items: np.ndarray
+        The amount of items that are placed in each space.
+    _size: tuple
+        The size of the base area of every space in x- and y-direction given in millimeters.
+    _uppermost_items: np.ndarray
+        This `np.ndarray` has the same shape as `_heights` and stores the counter of the uppermost item in each space.
+    """
+
+    def __init__(self, n_spaces: int, basesize: tuple = (1_200, 800)) -> None:
+        self._size = basesize
+        """The size of the base area of every space in x- and y-direction given in millimeters."""
+
+        batch_shape = n_spaces, self._size[1], self._size[0]
+        self._heights = np.zeros(batch_shape, dtype=int)
+        """This `np.ndarray` has the shape `(N, H, W)` and stores the height in each position of each space in millimeters."""
+
+        self._uppermost_items = np.zeros(batch_shape, dtype=int)
+        """This `np.ndarray` has the same shape as `_heights` and stores the counter of the uppermost item in each space."""
+
+        self._n_placed_items = np.zeros(n_spaces, dtype=int)
+        """The amount of items that are placed in each space."""
+
+    @property
+    def n_spaces(self) -> int:
+        """The amount of spaces."""
+        return self._heights.shape[0]
+
+    def addItems(
+        self,
+        flb_x: np.ndarray,
+        flb_y: np.ndarray,
+        delta_x: np.ndarray,
+        delta_y: np.ndarray,
+        item_height: np.ndarray,
+        active: Optional[np.ndarray] = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Adds one item to every active space and returns the FLB z-coordinates and the direct support ratios of the items.
+
+        The z-coordinate of an item is the maximum height below its footprint. A coordinate of the footprint counts as
+        direct support if its height is at least the z-coordinate minus `HEIGHT_TOLERANCE_MM`. Items that exceed the
+        base area are cropped like in `Space3D.addItem`, items that are completely outside the base area are not added.
+
+        Parameters.
+        -----------
+        flb_x: np.ndarray
+            The x-coordinates of the FLB corners of the items, one for each space.
+        flb_y: np.ndarray
+            The y-coordinates of the FLB corners of the items, one for each space.
+        delta_x: np.ndarray
+            The size of the items in x-direction.
+        delta_y: np.ndarray
+            The size of the items in y-direction.
+        item_height: np.ndarray
+            The height of the items.
+        active: np.ndarray (default = None)
+            A boolean mask that defines to which spaces an item is added. If `None`, an item is added to all spaces.
+
+        Returns.
+        --------
+        flb_z: np.ndarray
+            The z-coordinates of the FLB corners of the items. The value is `0` for inactive spaces and items that are
+            not added.
+        support_ratio: np.ndarray
+            The ratio of the items' base areas that have direct support, values are in `[0, 1]`. The value is `0` for
+            inactive spaces and items that are not added.
+        """
+        if active is None:
+            active = np.ones(self.n_spaces, dtype=bool)
+        flb_x = np.broadcast_to(np.asarray(flb_x, dtype=int), self.n_spaces)
+        flb_y = np.broadcast_to(np.asarray(flb_y, dtype=int), self.n_spaces)
+        item_height = np.broadcast_to(np.asarray(item_height, dtype=int), self.n_spaces)
+
+        # each footprint is cropped to the base area
+        start_x, start_y = np.clip(flb_x, 0, self._size[0]), np.clip(flb_y, 0, self._size[1])
+        end_x = np.clip(flb_x + np.asarray(delta_x, dtype=int), start_x, self._size[0])
+        end_y = np.clip(flb_y + np.asarray(delta_y, dtype=int), start_y, self._size[1])
+        cropped_x, cropped_y = end_x - start_x, end_y - start_y
+        placed = np.asarray(active, dtype=bool) & (cropped_x > 0) & (cropped_y > 0)
+
+        flb_z = np.zeros(self.n_spaces, dtype=int)
+        support_ratio = np.zeros(self.n_spaces)
+        self._n_placed_items += placed
+        spaces = np.flatnonzero(placed)
+        if spaces.size == 0:
+            return flb_z, support_ratio
+
+        # the footprints are gathered into windows of the size of the largest footprint, which are shifted into the
+        # base area where necessary, and the positions of each window outside its footprint are masked
+        window_y, window_x = cropped_y[spaces].max(), cropped_x[spaces].max()
+        window_start_y = np.minimum(start_y[spaces], self._size[1] - window_y)
+        window_start_x = np.minimum(start_x[spaces], self._size[0] - window_x)
+        offsets_y = np.arange(window_y) + (window_start_y - start_y[spaces])[:, None]
+        offsets_x = np.arange(window_x) + (window_start_x - start_x[spaces])[:, None]
+        in_footprint_y = (offsets_y >= 0) & (offsets_y < cropped_y[spaces, None])
+        in_footprint_x = (offsets_x >= 0) & (offsets_x < cropped_x[spaces, None])
+        in_footprint = in_footprint_y[:, :, None] & in_footprint_x[:, None, :]
+        window = spaces, window_start_y, window_start_x
+
+        heights_in_windows = sliding_window_view(self._heights, (window_y, window_x), axis=(1, 2), writeable=True)
+        heights = heights_in_windows[window]
+        heights_in_footprints = np.where(in_footprint, heights, np.iinfo(heights.dtype).min)
+        flb_z[spaces] = heights_in_footprints.max(axis=(1, 2))
+        supported = heights_in_footprints >= flb_z[spaces, None, None] - HEIGHT_TOLERANCE_MM
+        support_ratio[spaces] = np.count_nonzero(supported, axis=(1, 2)) / (cropped_x[spaces] * cropped_y[spaces])
+
+        # the windows of different spaces do not overlap, hence, they are written back as a whole
+        np.copyto(heights, (flb_z[spaces] + item_height[spaces])[:, None, None], where=in_footprint)
+        heights_in_windows[window] = heights
+        uppermost_items_in_windows = sliding_window_view(
+            self._uppermost_items, (window_y, window_x), axis=(1, 2), writeable=True
+        )
+        uppermost_items = uppermost_items_in_windows[window]
+        np.copyto(uppermost_items, self._n_placed_items[spaces, None, None], where=in_footprint)
+        uppermost_items_in_windows[window] = uppermost_items
+
+        return flb_z, support_ratio
+
+    def reset(self, spaces: Optional[np.ndarray] = None) -> None:
+        """
+        Resets the heights and the uppermost items of the given spaces to their initial values.
+
+        Parameters.
+        -----------
+        spaces: np.ndarray (default = None)
+            A boolean mask or the indices of the spaces that are reset. If `None`, all spaces are reset.
+        """
+        if spaces is None:
+            spaces = slice(None)
+
+        self._heights[spaces] = 0
+        self._uppermost_items[spaces] = 0
+        self._n_placed_items[spaces] = 0
+
+    def getHeights(self) -> np.ndarray:
+        """Returns the heights in millimeters in each coordinate of every space, the shape is `(N, H, W)`."""
+        return self._heights
+
+    def getUppermostItems(self) -> np.ndarray:
+        """Returns the counter of the uppermost item in each coordinate of every space, the shape is `(N, H, W)`."""
+        return self._uppermost_items
+
+    def getNPlacedItems(self) -> np.ndarray:
+        """Returns the amount of placed items in each space."""
+        return self._n_placed_items
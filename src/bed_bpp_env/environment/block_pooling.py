@@ -0,0 +1,90 @@
+"""
+This module pools two-dimensional arrays, e.g., height maps, in blocks of equal size. The blocks are formed by reshaping
+the array, i.e., no Python loop over the blocks is needed. If the shape of the array is not divisible by the block size,
+the remaining rows and columns at the end are not pooled.
+"""
+
+import numpy as np
+
+
+def pooled_shape(shape: tuple[int, int], blocksize: tuple[int, int]) -> tuple[int, int]:
+    """
+    Returns the shape of the pooled array.
+
+    Parameters.
+    -----------
+    shape: tuple
+        The shape of the array that is pooled.
+    blocksize: tuple
+        The size of the blocks in the same order as the shape, i.e., `(size_y, size_x)` for height maps.
+
+    Returns.
+    --------
+    shape: tuple
+        The shape of the pooled array.
+    """
+    return shape[0] // blocksize[0], shape[1] // blocksize[1]
+
+
+def block_pool(values: np.ndarray, blocksize: tuple[int, int], reduction: np.ufunc = np.maximum) -> np.ndarray:
+    """
+    Returns the reduction of each block of the given array.
+
+    Parameters.
+    -----------
+    values: np.ndarray
+        The two-dimensional array that is pooled.
+    blocksize: tuple
+        The size of the blocks in the same order as the shape of the array.
+    reduction: np.ufunc (default = np.maximum)
+        The function that reduces the values of a block, e.g., `np.maximum` or `np.minimum`.
+
+    Returns.
+    --------
+    pooled: np.ndarray
+        The pooled array, its shape is given by `pooled_shape`.
+    """
+    n_blocks_0, n_blocks_1 = pooled_shape(values.shape, blocksize)
+    blocks = values[: n_blocks_0 * blocksize[0], : n_blocks_1 * blocksize[1]].reshape(
+        n_blocks_0, blocksize[0], n_blocks_1, blocksize[1]
+    )
+    return reduction.reduce(blocks, axis=(1, 3))
+
+
+def update_block_pool(
+    pooled: np.ndarray,
+    values: np.ndarray,
+    area: tuple[int, int, int, int],
+    blocksize: tuple[int, int],
+    reduction: np.ufunc = np.maximum,
+) -> None:
+    """
+    Pools the blocks that overlap the given area of the array again and writes them to the pooled array. The other
+    blocks of the pooled array are not changed.
+
+    Parameters.
+    -----------
+    pooled: np.ndarray
+        The pooled array, which is updated.
+    values: np.ndarray
+        The two-dimensional array that was pooled and has changed in the given area.
+    area: tuple
+        The changed area as `(start_1, start_0, end_1, end_0)`, i.e., `(x_start, y_start, x_end, y_end)` for height maps,
+        where the end coordinates are exclusive.
+    blocksize: tuple
+        The size of the blocks in the same order as the shape of the array.
+    reduction: np.ufunc (default = np.maximum)
+        The function that reduces the values of a block.
+    """
+    start_1, start_0, end_1, end_0 = area
+    first_block_0, first_block_1 = max(start_0, 0) // blocksize[0], max(start_1, 0) // blocksize[1]
+    last_block_0 = min(-(-end_0 // blocksize[0]), pooled.shape[0])
+    last_block_1 = min(-(-end_1 // blocksize[1]), pooled.shape[1])
+    if first_block_0 >= last_block_0 or first_block_1 >= last_block_1:
+        return
+
+    changed_values = values[
+        first_block_0 * blocksize[0] : last_block_0 * blocksize[0],
+        first_block_1 * blocksize[1] : last_block_1 * blocksize[1],
+    ]
+    pooled[first_block_0:last_block_0, first_block_1:last_block_1] = block_pool(changed_values, blocksize, reduction)
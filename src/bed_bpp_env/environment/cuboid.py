@@ -12,29 +12,77 @@ import numpy as np
 from bed_bpp_env.data_model.item import Item
 from bed_bpp_env.data_model.position_3d import Position3D
 from bed_bpp_env.environment.direction import Direction, opposite_direction
+from bed_bpp_env.environment.spatial_resolution import FULL_RESOLUTION, footprint_in_cells
+from bed_bpp_env.environment.storage_mode import StorageMode
 
 logger = logging.getLogger(__name__)
 
 
+def closed_intervals_overlap(interval: tuple[int, int], other: tuple[int, int]) -> bool:
+    """Returns `True` if the closed intervals `(first, last)` have at least one value in common."""
+    return max(interval[0], other[0]) <= min(interval[1], other[1])
+
+
 class Cuboid(object):
     """
     Instances of this class represents cubic items that can be placed in a three-dimensional space, e.g., `Space3D`.
 
+    An object only stores the dimensions, the FLB coordinates and the orientation of the item, as well as the
+    rectangles where the items below support it. The array representation and the support surfaces are created
+    when they are accessed for the first time.
+
     Parameters.
     -----------
     properties: dict
         The properties of the item.
+    storage_mode: StorageMode (default = StorageMode.DEFAULT)
+        Defines the data types of the representation and the support surfaces.
+    resolution: tuple (default = (1, 1))
+        The size of a cell of the space in x- and y-direction in millimeters. The footprint of the item is given in
+        cells and rounded up, its height is always given in millimeters.
     """
 
-    def __init__(self, metadata: Item) -> None:
+    __slots__ = (
+        "_metadata",
+        "_storage_mode",
+        "_resolution",
+        "_footprint_shape",
+        "_flb_coordinates",
+        "_items_below",
+        "_neighbors",
+        "_support_rectangles",
+        "_percentage_direct_support_surface",
+        "_representation",
+        "_direct_support_surface",
+        "_effective_support_surface",
+    )
+
+    _CACHED_ARRAYS = ("_representation", "_direct_support_surface", "_effective_support_surface")
+    """The attributes that are created from the geometry of the item when they are accessed for the first time."""
+
+    def __init__(
+        self, metadata: Item, storage_mode: StorageMode = StorageMode.DEFAULT, resolution: tuple = FULL_RESOLUTION
+    ) -> None:
         self._metadata = metadata
 
-        self._direct_support_surface = None
-        """This np.ndarray has exactly the same shape as the item and its values are in `[0, 1]`. A value of `1` 
-        represents direct support with the item below in this coordinate, otherwise the value is `0`."""
+        self._storage_mode = StorageMode(storage_mode)
+        """Defines the data types of the representation and the support surfaces."""
+
+        self._resolution = resolution
+        """The size of a cell of the space in x- and y-direction in millimeters."""
+
+        self._footprint_shape = self.__footprintShapeInOrientation(0)
+        """The size of the item's base area as `(delta_y, delta_x)`, i.e., it depends on the orientation."""
+
+        self._support_rectangles: list[tuple[int, int, int, int]] = []
+        """The areas of the base area that have direct support, given as `(start_x, start_y, end_x, end_y)` relative to
+        the FLB coordinates of this object."""
         self._percentage_direct_support_surface: Optional[float] = None
         """A `float` that indicates how many percent of this object's base area has direct support from below. Values are in `[0, 1]`."""
-        self._effective_support_surface = None
+        self._direct_support_surface: Optional[np.ndarray] = None
+        """This np.ndarray has exactly the same shape as the item and its values are in `[0, 1]`. A value of `1` 
+        represents direct support with the item below in this coordinate, otherwise the value is `0`."""
+        self._effective_support_surface: Optional[np.ndarray] = None
         """The effective support surface of the item."""
 
         self._items_below: list[Self] = []
@@ -43,12 +91,18 @@ class Cuboid(object):
         self._neighbors = {Direction.NORTH: [], Direction.EAST: [], Direction.SOUTH: [], Direction.WEST: []}
         """Stores the items that are situated around this object."""
 
-        self._representation = self.height * np.ones((self.width, self.length), dtype=int)
-        """A `np.ndarray` that represents the item. It has the shape of the item's base area size and its values are the height in millimeters."""
+        self._representation: Optional[np.ndarray] = None
+        """A read-only `np.ndarray` that represents the item. It has the shape of the item's base area size and its values are the height in millimeters."""
 
         self._flb_coordinates = None
         """A `list` that stores the front left bottom (FLB) coordinate of the item."""
 
+    def __getstate__(self) -> tuple[None, dict]:
+        # the cached arrays are not copied since they can be created again
+        slots = {slot: getattr(self, slot) for slot in self.__slots__}
+        slots.update({cached_array: None for cached_array in self._CACHED_ARRAYS})
+        return None, slots
+
     @property
     def id(self) -> str:
         """The identifier of this cuboid."""
@@ -56,13 +110,13 @@ class Cuboid(object):
 
     @property
     def length(self) -> int:
-        """The length of this cuboid."""
-        return int(self._metadata.length_mm)
+        """The length of this cuboid in cells, i.e., in millimeters for the full resolution."""
+        return self.__footprintShapeInOrientation(0)[1]
 
     @property
     def width(self) -> int:
-        """The width of this cuboid."""
-        return int(self._metadata.width_mm)
+        """The width of this cuboid in cells, i.e., in millimeters for the full resolution."""
+        return self.__footprintShapeInOrientation(0)[0]
 
     @property
     def height(self) -> int:
@@ -76,8 +130,8 @@ class Cuboid(object):
 
     @property
     def volume(self) -> float:
-        """The volume of this cuboid."""
-        return float(self.length * self.width * self.height)
+        """The volume of this cuboid in cubic millimeters."""
+        return float(int(self._metadata.length_mm) * int(self._metadata.width_mm) * self.height)
 
     @property
     def flb(self) -> Position3D:
@@ -92,6 +146,8 @@ class Cuboid(object):
     def direct_support_surface(self) -> np.ndarray:
         """This np.ndarray has exactly the same shape as the item and its values are in `[0, 1]`. A value of 1
         represents direct support with the item below in this coordinate, otherwise the value is 0."""
+        if self._direct_support_surface is None and self._percentage_direct_support_surface is not None:
+            self._calculate_direct_support_surface()
         return self._direct_support_surface
 
     @property
@@ -100,10 +156,18 @@ class Cuboid(object):
         to the item below."""
         return self._percentage_direct_support_surface
 
+    @property
+    def support_rectangles(self) -> list[tuple[int, int, int, int]]:
+        """The areas of the base area that have direct support, given as `(start_x, start_y, end_x, end_y)` relative to
+        the FLB coordinates, in the sequence of `items_below`."""
+        return self._support_rectangles
+
     @property
     def effective_support_surface(self) -> np.ndarray:
         """An array that shows where the item has effective support. The shape of this array is identical to the
         item's shape; a value `1` represents effective support, `0` says no effective support."""
+        if self._effective_support_surface is None and self._percentage_direct_support_surface is not None:
+            self._calculate_effective_support_surface()
         return self._effective_support_surface
 
     @property
@@ -138,11 +202,9 @@ class Cuboid(object):
         value: int
             The value of the item's orientation.
         """
-        if value == 1:
-            shape = self._representation.shape
-            self._representation = self._representation.reshape((shape[1], shape[0]))
-        elif value == 0:
-            pass
+        if value in (0, 1):
+            self._footprint_shape = self.__footprintShapeInOrientation(value)
+            self._representation = None
         else:
             logger.warning(f'item "{self.id}" orientation: value {value} is not known! do nothing')
 
@@ -156,34 +218,86 @@ class Cuboid(object):
         orientation: int
             Indicates whether the long edge is parallel to the long edge of the target or whether the item is rotated by 90 degrees.
         """
-        shape = self._representation.shape
+        shape = self._footprint_shape
 
-        if shape == (self.width, self.length):
+        if shape == self.__footprintShapeInOrientation(0):
             return 0
-        elif shape == (self.length, self.width):
+        elif shape == self.__footprintShapeInOrientation(1):
             return 1
         else:
             logger.warning(f'item "{self.id}" get orientation: not known! return None')
             return None
 
+    def __footprintShapeInOrientation(self, orientation: int) -> tuple[int, int]:
+        """Returns the size of the item's base area in cells as `(delta_y, delta_x)` in the given orientation."""
+        delta_x, delta_y = footprint_in_cells(
+            self._metadata.length_mm, self._metadata.width_mm, orientation, self._resolution
+        )
+        return delta_y, delta_x
+
     def store_items_directly_below(self, items: list[Self]) -> None:
-        """Sets the attribute that stores the items that are directly below this object."""
+        """Sets the attribute that stores the items that are directly below this object and calculates the
+        percentage of the direct support surface. The support surfaces are created when they are accessed."""
         self._items_below = items
+        self._direct_support_surface = None
+        self._effective_support_surface = None
 
-        self._calculate_direct_support_surface()
-        self._calculate_effective_support_surface()
+        self._calculate_support_rectangles()
+
+    @property
+    def footprint_shape(self) -> tuple[int, int]:
+        """The size of the item's base area as `(delta_y, delta_x)`, i.e., the shape of the array representation."""
+        return self._footprint_shape
 
     @property
     def array_representation(self) -> np.ndarray:
-        """The item represented as array."""
+        """The item represented as read-only array, it is a view of a single value and therefore needs no memory."""
+        if self._representation is None:
+            height = np.asarray(self.height, dtype=self._storage_mode.height_dtype)
+            self._representation = np.broadcast_to(height, self._footprint_shape)
         return self._representation
 
+    def edge_intervals(self, which: Direction) -> tuple[tuple[int, int], tuple[int, int]]:
+        """
+        Returns the closed intervals of the x- and y-coordinates of the edge of an item when it is placed in an
+        `Space3D`.
+
+        On the edges, where either the x coordinate, or the y coordinate is only one number, also the value before is
+        added to the interval. E.g., if an item is located in (100,100,0), then the x-interval of the west edge is
+        `(99, 100)`.
+
+        Parameters.
+        -----------
+        which: Direction
+            Defines for which edge you get the intervals.
+
+        Returns.
+        --------
+        x_interval: tuple
+            The first and the last x-coordinate of the edge.
+        y_interval: tuple
+            The first and the last y-coordinate of the edge.
+        """
+        (first_x, last_x), (first_y, last_y) = self.x_interval, self.y_interval
+
+        if which is Direction.NORTH:
+            return (first_x, last_x), (last_y, last_y + 1)
+        elif which is Direction.EAST:
+            return (last_x, last_x + 1), (first_y, last_y)
+        elif which is Direction.SOUTH:
+            return (first_x, last_x), (first_y - 1, first_y)
+        elif which is Direction.WEST:
+            return (first_x - 1, first_x), (first_y, last_y)
+
+        raise ValueError("direction is not recognized")
+
     def coordinates_ranges_of_edge(self, which: Direction) -> dict[str, set[int]]:
         """
         Returns the coordinates of the edge of an item when it is placed in an `Space3D`.
 
         On the edges, where either the x coordinate, or the y coordinate is only one number, also the value before is added to the coordinates set. E.g., if an item is located in (100,100,0), then the x coordinate for the west edge is `set([99, 100])`.
 
+        Prefer `edge_intervals`, which does not create the sets.
 
         Parameters.
         -----------
@@ -195,35 +309,26 @@ class Cuboid(object):
         coordinates: dict
             Key is either `x` or `y`, and the values are a set object that contains the values of the coordinates.
         """
-        flb_x = self.flb.x
-        flb_y = self.flb.y
-        width, length = self._representation.shape
+        if which not in Direction:
+            return {"x": set(), "y": set()}
 
-        if which is Direction.NORTH:
-            coordinates = {
-                "x": set(range(flb_x, (flb_x + length))),
-                "y": set(range(flb_y + width - 1, flb_y + width + 1)),
-            }
-        elif which is Direction.EAST:
-            coordinates = {
-                "x": set(range(flb_x + length - 1, flb_x + length + 1)),
-                "y": set(range(flb_y, (flb_y + width))),
-            }
-        elif which is Direction.SOUTH:
-            coordinates = {
-                "x": set(range(flb_x, (flb_x + length))),
-                "y": set(range(flb_y - 1, flb_y + 1)),
-            }
-        elif which is Direction.WEST:
-            coordinates = {
-                "x": set(range(flb_x - 1, flb_x + 1)),
-                "y": set(range(flb_y, (flb_y + width))),
-            }
+        (first_x, last_x), (first_y, last_y) = self.edge_intervals(which)
+        return {"x": set(range(first_x, last_x + 1)), "y": set(range(first_y, last_y + 1))}
 
-        else:
-            coordinates = {"x": set(), "y": set()}
+    @property
+    def x_interval(self) -> tuple[int, int]:
+        """The closed interval of the x-coordinates of this item, i.e., `(flb_x, flb_x + length - 1)`."""
+        return self.flb.x, self.flb.x + self._footprint_shape[1] - 1
 
-        return coordinates
+    @property
+    def y_interval(self) -> tuple[int, int]:
+        """The closed interval of the y-coordinates of this item, i.e., `(flb_y, flb_y + width - 1)`."""
+        return self.flb.y, self.flb.y + self._footprint_shape[0] - 1
+
+    @property
+    def z_interval(self) -> tuple[int, int]:
+        """The closed interval of the z-coordinates of this item, i.e., `(flb_z, flb_z + height - 1)`."""
+        return self.flb.z, self.flb.z + int(self.height) - 1
 
     @property
     def coordinates_z_range(self) -> set[int]:
@@ -235,9 +340,8 @@ class Cuboid(object):
         zCoordinates: set
             The range of the x-coordinates of this item ({flb_z, ..., flb_z + height}).
         """
-        flb_z = self.flb.z
-        height = self._representation[0, 0]
-        return set(range(flb_z, flb_z + height))
+        first_z, last_z = self.z_interval
+        return set(range(first_z, last_z + 1))
 
     @property
     def coordinates_x_range(self) -> set[int]:
@@ -249,9 +353,8 @@ class Cuboid(object):
         xCoordinates: set
             The range of the x-coordinates of this item ({flb_x, ..., flb_x + length}).
         """
-        flb_x = self.flb.x
-        length = self._representation.shape[1]
-        return set(range(flb_x, flb_x + length))
+        first_x, last_x = self.x_interval
+        return set(range(first_x, last_x + 1))
 
     @property
     def coordinates_y_range(self) -> set[int]:
@@ -263,9 +366,8 @@ class Cuboid(object):
         yCoordinates: set
             The range of the y-coordinates of this item ({flb_y, ..., flb_y + width}).
         """
-        flb_y = self.flb.y
-        width = self._representation.shape[0]
-        return set(range(flb_y, flb_y + width))
+        first_y, last_y = self.y_interval
+        return set(range(first_y, last_y + 1))
 
     def store_neighbors(self, neighbors: dict[Direction, list[Self]]) -> None:
         """
@@ -304,106 +406,90 @@ class Cuboid(object):
         if neighbor not in self._neighbors[edge]:
             self._neighbors[edge].append(neighbor)
 
-    def _calculate_direct_support_surface(self) -> None:
+    def remove_neighbor(self, edge: Direction, neighbor: Self) -> None:
+        """
+        Removes the given neighbor from the defined edge of this object's neighbors.
+
+        Parameters.
+        -----------
+        edge: Direction
+            On which edge have `self` and `neighbor` contact.
+        neighbor: Cuboid
+            The neighbor that is removed from this object.
+        """
+        if neighbor in self._neighbors[edge]:
+            self._neighbors[edge].remove(neighbor)
+
+    def _calculate_support_rectangles(self) -> None:
+        """Calculates the rectangles where the items below overlap with this object and the percentage of the direct
+        support surface."""
         if self._items_below == []:
             # object is directly located on palletizing target
             self._percentage_direct_support_surface = 1.0
-            self._direct_support_surface = np.ones(self._representation.shape, dtype=int)
+            self._support_rectangles = [(0, 0, self._footprint_shape[1], self._footprint_shape[0])]
 
         else:
             self._percentage_direct_support_surface = 0.0  # initial value
-            self._direct_support_surface = np.zeros(self._representation.shape, dtype=int)
+            self._support_rectangles = []
 
-            self_coordinate_x, self_coordinate_y = self.coordinates_x_range, self.coordinates_y_range
+            base_area = self._footprint_shape[0] * self._footprint_shape[1]
             for item_below in self._items_below:
-                overlapping_points_x = set.intersection(self_coordinate_x, item_below.coordinates_x_range)
-                overlapping_points_y = set.intersection(self_coordinate_y, item_below.coordinates_y_range)
-
-                self._percentage_direct_support_surface += (len(overlapping_points_x) * len(overlapping_points_y)) / (
-                    self._representation.shape[0] * self._representation.shape[1]
-                )
-
-                # create the DirectSupportSurface ndarray
-                start_x, start_y = (
-                    min(overlapping_points_x) - self.flb.x,
-                    min(overlapping_points_y) - self.flb.y,
-                )
-                end_x, end_y = (
-                    max(overlapping_points_x) - self.flb.x + 1,
-                    max(overlapping_points_y) - self.flb.y + 1,
-                )
-
-                self._direct_support_surface[start_y:end_y, start_x:end_x] = np.ones(
-                    (end_y - start_y, end_x - start_x), dtype=int
-                )
+                # the overlap of the ranges of the coordinates relative to this object's FLB coordinates
+                start_x = max(self.flb.x, item_below.flb.x) - self.flb.x
+                end_x = min(self.flb.x + self._footprint_shape[1], item_below.flb.x + item_below.footprint_shape[1])
+                end_x -= self.flb.x
+                start_y = max(self.flb.y, item_below.flb.y) - self.flb.y
+                end_y = min(self.flb.y + self._footprint_shape[0], item_below.flb.y + item_below.footprint_shape[0])
+                end_y -= self.flb.y
 
-        logger.debug(f'item "{self.id}" direct support surface(%): {self._percentage_direct_support_surface}')
+                self._percentage_direct_support_surface += ((end_x - start_x) * (end_y - start_y)) / base_area
+                self._support_rectangles.append((start_x, start_y, end_x, end_y))
 
-    def _calculate_effective_support_surface(self) -> None:
-        if self._items_below == []:
-            self._effective_support_surface = self._direct_support_surface.copy()
+        logger.debug(f'item "{self.id}" direct support surface(%): {self._percentage_direct_support_surface}')
 
-        else:
-            self._effective_support_surface = np.zeros(self._representation.shape, dtype=int)
+    def _calculate_direct_support_surface(self) -> None:
+        self._direct_support_surface = np.zeros(self._footprint_shape, dtype=self._storage_mode.mask_dtype)
+        for start_x, start_y, end_x, end_y in self._support_rectangles:
+            self._direct_support_surface[start_y:end_y, start_x:end_x] = 1
 
-            self_coordinate_x, self_coordinate_y = self.coordinates_x_range, self.coordinates_y_range
-            for item_below in self._items_below:
-                overlapping_points_x = set.intersection(self_coordinate_x, item_below.coordinates_x_range)
-                overlapping_points_y = set.intersection(self_coordinate_y, item_below.coordinates_y_range)
-
-                # create the DirectSupportSurface ndarray
-                start_x, start_y = (
-                    min(overlapping_points_x) - self.flb.x,
-                    min(overlapping_points_y) - self.flb.y,
-                )
-                end_x, end_y = (
-                    max(overlapping_points_x) - self.flb.x + 1,
-                    max(overlapping_points_y) - self.flb.y + 1,
-                )
-
-                self._effective_support_surface[start_y:end_y, start_x:end_x] = np.ones(
-                    (end_y - start_y, end_x - start_x), dtype=int
-                )
-
-            if len(self._items_below) > 1:
-                # multi package support => change corners
-                coords_effective_support_surface = np.argwhere(self._effective_support_surface >= 1)
-
-                min_1st_coord = np.amin(coords_effective_support_surface[:, 0])  # min first coord
-                max_1st_coord = np.amax(coords_effective_support_surface[:, 0])  # max first coord
-
-                cand_min1_extr2 = np.where(
-                    coords_effective_support_surface[:, 0] == min_1st_coord,
-                    coords_effective_support_surface[:, 1],
-                    np.nan,
-                )
-                min_1st_max_2nd = int(np.nanmax(cand_min1_extr2))
-                min_1st_min_2nd = int(np.nanmin(cand_min1_extr2))
-
-                cand_max1_extr2 = np.where(
-                    coords_effective_support_surface[:, 0] == max_1st_coord,
-                    coords_effective_support_surface[:, 1],
-                    np.nan,
-                )
-                max_1st_max_2nd = int(np.nanmax(cand_max1_extr2))
-                max_1st_min_2nd = int(np.nanmin(cand_max1_extr2))
-
-                point1 = [min_1st_coord, min_1st_min_2nd]
-                point2 = [min_1st_coord, min_1st_max_2nd]
-                point3 = [max_1st_coord, max_1st_max_2nd]
-                point4 = [max_1st_coord, max_1st_min_2nd]
-
-                start_x = min(point1[1], point4[1])
-                start_y = min(point1[0], point2[0])
-
-                end_x = max(point2[1], point3[1]) + 1
-                end_y = max(point3[0], point4[0]) + 1
-
-                self._effective_support_surface[start_y:end_y, start_x:end_x] = np.ones(
-                    (end_y - start_y, end_x - start_x), dtype=int
-                )
-            else:
-                # single package support
-                self._effective_support_surface = np.multiply(
-                    self._effective_support_surface, self._direct_support_surface
-                )
+    def _calculate_effective_support_surface(self) -> None:
+        # the effective support surface is based on the direct support surface, i.e., the overlaps with the items below
+        self._effective_support_surface = self.direct_support_surface.copy()
+
+        if len(self._items_below) > 1:
+            # multi package support => change corners
+            coords_effective_support_surface = np.argwhere(self._effective_support_surface >= 1)
+
+            min_1st_coord = np.amin(coords_effective_support_surface[:, 0])  # min first coord
+            max_1st_coord = np.amax(coords_effective_support_surface[:, 0])  # max first coord
+
+            cand_min1_extr2 = np.where(
+                coords_effective_support_surface[:, 0] == min_1st_coord,
+                coords_effective_support_surface[:, 1],
+                np.nan,
+            )
+            min_1st_max_2nd = int(np.nanmax(cand_min1_extr2))
+            min_1st_min_2nd = int(np.nanmin(cand_min1_extr2))
+
+            cand_max1_extr2 = np.where(
+                coords_effective_support_surface[:, 0] == max_1st_coord,
+                coords_effective_support_surface[:, 1],
+                np.nan,
+            )
+            max_1st_max_2nd = int(np.nanmax(cand_max1_extr2))
+            max_1st_min_2nd = int(np.nanmin(cand_max1_extr2))
+
+            point1 = [min_1st_coord, min_1st_min_2nd]
+            point2 = [min_1st_coord, min_1st_max_2nd]
+            point3 = [max_1st_coord, max_1st_max_2nd]
+            point4 = [max_1st_coord, max_1st_min_2nd]
+
+            start_x = min(point1[1], point4[1])
+            start_y = min(point1[0], point2[0])
+
+            end_x = max(point2[1], point3[1]) + 1
+            end_y = max(point3[0], point4[0]) + 1
+
+            self._effective_support_surface[start_y:end_y, start_x:end_x] = np.ones(
+                (end_y - start_y, end_x - start_x), dtype=int
+            )
@@ -7,6 +7,8 @@ import logging
 import matplotlib.pyplot as plt
 import numpy as np
 
+from bed_bpp_env.environment.storage_mode import StorageMode
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,17 +19,28 @@ class HeightMap:
     Note that the np.arrays access the coordinates in (y, x) order.
     """
 
-    def __init__(self, title: str = "HeightMap", size: tuple = (1200, 800), initialheight: int = 0) -> None:
+    def __init__(
+        self,
+        title: str = "HeightMap",
+        size: tuple = (1200, 800),
+        initialheight: int = 0,
+        storage_mode: StorageMode = StorageMode.DEFAULT,
+    ) -> None:
         self._title = title
         """Defining the object for which this height map is created."""
 
+        self._storage_mode = StorageMode(storage_mode)
+        """Defines the data type of the heights."""
+
         self._initial_height = int(initialheight)
         """The initial height of the height map."""
 
         self._size = size
         """The size of the height map. Note that the first element is the size in x-direction and the second in y-direction. Thus, when creating a `np.array`, the elements have to be swapped."""
 
-        self._heights = self._initial_height * np.ones((int(self._size[1]), int(self._size[0])), dtype=int)
+        self._heights = np.full(
+            (int(self._size[1]), int(self._size[0])), self._initial_height, dtype=self._storage_mode.height_dtype
+        )
         """The heights on the target represented as `np.array`. Every unit is in millimeters."""
 
         self.shape = self._heights.shape
@@ -54,7 +67,9 @@ class HeightMap:
         """
         self._size = resize
 
-        self._heights = self._initial_height * np.ones((int(self._size[1]), int(self._size[0])), dtype=int)
+        self._heights = np.full(
+            (int(self._size[1]), int(self._size[0])), self._initial_height, dtype=self._storage_mode.height_dtype
+        )
         self.shape = self._heights.shape
         self._percentage_support_surface = []
 
@@ -76,9 +91,9 @@ class HeightMap:
         percentage_direct_item_support = float(idx_area_direct_support.shape[0]) / float(delta_x * delta_y)
         self._percentage_support_surface.append(percentage_direct_item_support)
         # set all height values of the area where the item map is updated to the target z coordinate
-        self._heights[y_start:y_end, x_start:x_end] = flb_coordinates[2] * np.ones((delta_y, delta_x), dtype=int)
+        self._heights[y_start:y_end, x_start:x_end] = flb_coordinates[2]
         # add the height of the item
-        self._heights[y_start:y_end, x_start:x_end] += other.getHeights()
+        self._heights[y_start:y_end, x_start:x_end] += other.getHeights().astype(self._heights.dtype, copy=False)
 
         return percentage_direct_item_support
 
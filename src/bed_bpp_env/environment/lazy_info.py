@@ -0,0 +1,186 @@
+"""
+This module contains the mapping that the palletizing environments return as `info` in `step` and `reset`.
+"""
+
+from collections.abc import Callable, Collection, Iterator, Mapping, MutableMapping
+from typing import Any, Optional
+
+ALL_INFO_KEYS = "all"
+"""The value of the configuration `info_keys` that produces all keys."""
+
+
+def parse_info_keys(value: str) -> Optional[frozenset[str]]:
+    """
+    Parses the value of the configuration `info_keys`.
+
+    Parameters.
+    -----------
+    value: str
+        Either `"all"` or the comma-separated keys that are produced.
+
+    Returns.
+    --------
+    keys: frozenset
+        The keys that are produced, `None` if all keys are produced.
+    """
+    if value.strip() == ALL_INFO_KEYS:
+        return None
+
+    return frozenset(key.strip() for key in value.split(",") if key.strip() != "")
+
+
+class ExpiredInfoError(KeyError):
+    """Raised when a lazy value of a `LazyInfo` is accessed that was not computed before the environment changed."""
+
+    def __str__(self) -> str:
+        return str(self.args[0])
+
+
+class _Pending:
+    """A value of a `LazyInfo` that is computed on the first access."""
+
+    __slots__ = ("function", "args")
+
+    def __init__(self, function: Callable, args: tuple) -> None:
+        self.function = function
+        self.args = args
+
+
+def _apply_to_value(function: Callable, value: Any) -> Any:
+    """Returns `function(value)`, where a lazy value is computed first."""
+    if isinstance(value, _Pending):
+        value = value.function(*value.args)
+    return function(value)
+
+
+class LazyInfo(MutableMapping):
+    """
+    A mapping for the additional information of a palletizing environment. Expensive values are added with `set_lazy`,
+    they are computed on the first access and stored afterwards. Keys that are not produced according to the given keys
+    are ignored when they are set.
+
+    The lazy values are computed from the state of the environment at the time of the access. Hence, the environment
+    calls `expire` before its state changes, which removes the values that have not been accessed yet. Accessing such a
+    value afterwards raises an `ExpiredInfoError` that names the change. A copy or a pickled info contains all values,
+    i.e., the lazy values are computed when the info is copied.
+
+    Parameters.
+    -----------
+    keys: Collection (default = None)
+        The keys that are produced, `None` if all keys are produced.
+
+    Examples.
+    ---------
+    >>> info = LazyInfo()
+    >>> info.set_lazy("corner_points", space.getCornerPointsIn3D, (400, 300, 200))
+    >>> info["corner_points"]  # calls space.getCornerPointsIn3D((400, 300, 200))
+    [(0, 0, 0)]
+    """
+
+    def __init__(self, keys: Optional[Collection[str]] = None) -> None:
+        self._keys = None if keys is None else frozenset(keys)
+        """The keys that are produced, `None` if all keys are produced."""
+        self._data: dict[str, Any] = {}
+        """The stored values and the values that have not been computed yet."""
+        self._expired: dict[str, str] = {}
+        """The keys of the lazy values that expired and the change of the environment that made them expire."""
+
+    def __getstate__(self) -> dict:
+        # the lazy values are computed, since their functions refer to the state of the environment, which is not copied
+        for key, value in self._data.items():
+            if isinstance(value, _Pending):
+                self._data[key] = value.function(*value.args)
+        return self.__dict__.copy()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._data and key in self._expired:
+            raise ExpiredInfoError(
+                f"the value of {key!r} was not accessed before the environment changed in {self._expired[key]}, access"
+                " it before or copy the info"
+            )
+        value = self._data[key]
+        if isinstance(value, _Pending):
+            value = value.function(*value.args)
+            self._data[key] = value
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if self.produces(key):
+            self._data[key] = value
+            self._expired.pop(key, None)
+
+    def __delitem__(self, key: str) -> None:
+        del self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        values = ", ".join(
+            f"{key!r}: {'<lazy>' if isinstance(value, _Pending) else repr(value)}" for key, value in self._data.items()
+        )
+        return "{" + values + "}"
+
+    def produces(self, key: str) -> bool:
+        """Returns whether the given key is produced."""
+        return self._keys is None or key in self._keys
+
+    def set_lazy(self, key: str, function: Callable, *args: Any) -> None:
+        """
+        Sets a value that is computed as `function(*args)` on the first access of the key. The function is not called
+        if the key is not produced or never accessed.
+
+        Parameters.
+        -----------
+        key: str
+            The key of the value.
+        function: Callable
+            The function that computes the value.
+        *args: Any
+            The arguments of the function.
+        """
+        if self.produces(key):
+            self._data[key] = _Pending(function, args)
+            self._expired.pop(key, None)
+
+    def map_lazy(self, key: str, function: Callable) -> None:
+        """
+        Replaces the value of the given key by `function(value)`, which is computed on the first access of the key. If
+        the value is lazy, it is not computed before. Nothing happens if the key does not exist.
+
+        Parameters.
+        -----------
+        key: str
+            The key of the value.
+        function: Callable
+            The function that is applied to the value.
+        """
+        if key in self._data:
+            self._data[key] = _Pending(_apply_to_value, (function, self._data[key]))
+
+    def update(self, other: Mapping = (), /, **kwargs: Any) -> None:
+        """Updates the mapping like `dict.update`, but the lazy values of another `LazyInfo` stay lazy."""
+        if isinstance(other, LazyInfo):
+            for key, value in other._data.items():
+                self[key] = value
+            other = ()
+
+        super().update(other, **kwargs)
+
+    def expire(self, change: str = "a later call") -> None:
+        """
+        Removes the lazy values that have not been computed yet.
+
+        Parameters.
+        -----------
+        change: str (default = "a later call")
+            The change of the environment, e.g., `"step 3 of order 0001"`, which is named when an expired value is
+            accessed.
+        """
+        for key, value in self._data.items():
+            if isinstance(value, _Pending):
+                self._expired[key] = change
+        self._data = {key: value for key, value in self._data.items() if not isinstance(value, _Pending)}
@@ -21,10 +21,21 @@ from bed_bpp_env.data_model.item import Item
 from bed_bpp_env.data_model.order import Order
 from bed_bpp_env.data_model.position_3d import Position3D
 from bed_bpp_env.environment import MAXHEIGHT_OBSERVATION_SPACE, SIZE_EURO_PALLET, SIZE_ROLLCONTAINER
+from bed_bpp_env.environment.allowed_area import AllowedArea
 from bed_bpp_env.environment.cuboid import Cuboid
+from bed_bpp_env.environment.lazy_info import LazyInfo, parse_info_keys
 from bed_bpp_env.environment.lc import LC
-from bed_bpp_env.environment.space_3d import Space3D
+from bed_bpp_env.environment.space_backend import create_space_3d, parse_height_pyramid
+from bed_bpp_env.environment.spatial_resolution import (
+    coordinates_in_mm,
+    footprint_in_cells,
+    height_pyramid_in_cells,
+    parse_spatial_resolution,
+    size_in_cells,
+)
+from bed_bpp_env.environment.storage_mode import StorageMode
 from bed_bpp_env.evaluation.kpis import KPIs
+from bed_bpp_env.io_utils import PackingPlanStreamWriter, compact_packing_plan_stream
 from bed_bpp_env.utils import OUTPUTDIRECTORY, PARSEDARGUMENTS
 from bed_bpp_env.utils.configuration import USEDCONFIGURATIONFILE
 from bed_bpp_env.visualization.palletizing_environment_visualization import PalletizingEnvironmentVisualization
@@ -49,6 +60,8 @@ class PalletizingEnvironment(gym.Env):
     Note
 
     We must save the heights in mm steps and provide the allowed areas in mm steps, since otherwise information gets lost and due to rounding errors we do not palletize them in the "best" positions.
+
+    For faster simulations, e.g., in training runs, a coarser `spatial_resolution` can be configured. Then, the observation, the actions, the allowed areas and the corner points are given in cells of this size, whereas the heights are still given in millimeters. The footprints of the items are rounded up and the base area of the target is rounded down, thus, the placements are also feasible in mm steps. The packing plans store the coordinates in millimeters.
     """
 
     metadata = {"render_modes": ["human", "rgb_array"], "render_fps": 4}
@@ -62,21 +75,39 @@ class PalletizingEnvironment(gym.Env):
         self._size_multiplicator = 1
         """TBD needed for rescalewrapper and isItemSelectable"""
 
+        self._resolution = parse_spatial_resolution(conf.get("default", "spatial_resolution", fallback="(1,1)"))
+        """The size of a cell of the simulation in x- and y-direction in millimeters."""
+        self._grid_size = size_in_cells(self._size, self._resolution)
+        """The palletizing target's size of the base area in x- and y-direction given in cells."""
+
+        self._storage_mode = StorageMode(conf.get("environment", "storage_mode", fallback="default"))
+        """Defines the data types of the height maps, the uppermost items and the support masks."""
+
         self.action_space = Dict(
             {
-                "x": Discrete(self._size[0]),
-                "y": Discrete(self._size[1]),
+                "x": Discrete(self._grid_size[0]),
+                "y": Discrete(self._grid_size[1]),
                 "orientation": Discrete(self._n_orientations),
             }
         )
         """The action space consists of the simple action spaces for x-, y-coordinate and the orientation of the item."""
 
         self.observation_space = Box(
-            low=0, high=MAXHEIGHT_OBSERVATION_SPACE, shape=(self._size[1], self._size[0]), dtype=int
+            low=0,
+            high=MAXHEIGHT_OBSERVATION_SPACE,
+            shape=(self._grid_size[1], self._grid_size[0]),
+            dtype=self._storage_mode.height_dtype,
         )
         """The observation space describes the heights in each coordinate on the palletizing target."""
 
-        self._target_space = Space3D(self._size)
+        self._target_space = create_space_3d(
+            self._grid_size,
+            conf.get("environment", "space_backend", fallback="dense"),
+            self._storage_mode,
+            height_pyramid_in_cells(
+                parse_height_pyramid(conf.get("environment", "height_pyramid", fallback="none")), self._resolution
+            ),
+        )
         """Represents the 3D space where the palletization takes place."""
 
         self._actions = []
@@ -100,6 +131,19 @@ class PalletizingEnvironment(gym.Env):
         self._packing_plans = {}
         """The created packing plans of the solver/agent."""
 
+        packing_plan_format = conf.get("environment", "packing_plan_format", fallback="json")
+        if packing_plan_format not in ("json", "jsonl"):
+            raise ValueError(f"packing plan format {packing_plan_format} is not supported")
+        self._packing_plan_writer: Optional[PackingPlanStreamWriter] = None
+        """Appends each finished packing plan to `packing_plans.jsonl` if the format is `jsonl`, else `None`."""
+        if packing_plan_format == "jsonl":
+            self._packing_plan_writer = PackingPlanStreamWriter(
+                OUTPUTDIRECTORY / "packing_plans.jsonl",
+                int(conf.get("environment", "packing_plan_fsync_interval", fallback="0")),
+            )
+        self._written_order_ids = set()
+        """The identifiers of the orders whose packing plans were written by the packing plan writer."""
+
         self._n_item_preview = int(conf.get("environment", "preview"))
         """The amount of preview items."""
         self._n_item_selection = int(conf.get("environment", "selection"))
@@ -113,6 +157,11 @@ class PalletizingEnvironment(gym.Env):
         self._kpis = KPIs()
         """Holds the values of the KPIs for each order."""
 
+        self._info_keys = parse_info_keys(conf.get("environment", "info_keys", fallback="all"))
+        """The keys of the info that are produced, `None` if all keys are produced."""
+        self._info = LazyInfo(self._info_keys)
+        """The info that was returned by the last call of `step` or `reset`. Its lazy values expire when the state changes."""
+
     def step(self, action: dict) -> tuple[np.ndarray, float, bool, dict]:
         """
         In the step function we have to palletize the given item at the given position. Translated to this implementation that means that we have to
@@ -142,7 +191,8 @@ class PalletizingEnvironment(gym.Env):
                 "item": {'article': 'cake-00104295', 'id': 'c00104295', 'product_group': 'confectionery', 'length/mm': 590, 'width/mm': 200, 'height/mm': 210, 'weight/kg': 7.67, 'sequence': 1}
             }
         """
-        info = {}
+        self._info.expire(f"step {len(self._actions) + 1}")
+        info = LazyInfo(self._info_keys)
 
         # get the variables that are needed here
         step_vars = self._get_step_variables(action)
@@ -151,35 +201,21 @@ class PalletizingEnvironment(gym.Env):
             raise ValueError(f"item {item_for_action} must not be selected.")
 
         # define the item
-        item = Cuboid(item_for_action)
+        item = Cuboid(item_for_action, self._storage_mode, self._resolution)
         item.set_orientation(step_vars["orientation"])
 
-        # create a np.ndarray that has the same shape as the target, its elements are 1 if the item is located in this region and 0 otherwise
-        item_on_target = np.zeros((self._size[1], self._size[0]), dtype=int)
-        item_delta_y, item_delta_x = item.array_representation.shape
+        # obtain the FLB height for the item in the selected (x, y)-coordinate, the footprint is cropped at the edges
+        item_delta_y, item_delta_x = item.footprint_shape
         start_x, start_y = step_vars["xCoord"], step_vars["yCoord"]
-        try:
-            item_on_target[start_y : start_y + item_delta_y, start_x : start_x + item_delta_x] = np.ones(
-                item.array_representation.shape, dtype=int
-            )
-        except Exception:
-            # have to crop item like in `environment.Space3D.addItem`
-            logger.warning("cropped item")
-            cropped_shape = (
-                min(item_on_target.shape[0], start_y + item_delta_y) - start_y,
-                min(item_on_target.shape[1], start_x + item_delta_x) - start_x,
-            )
-            item_on_target[start_y : start_y + cropped_shape[0], start_x : start_x + cropped_shape[1]] = np.ones(
-                cropped_shape, dtype=int
-            )
-
-        # obtaiin the FLB height for the item in the selected (x, y)-coordinate
-        max_height_in_target_area = int(np.amax(np.multiply(self._target_space.getHeights(), item_on_target)))
+        max_height_in_target_area = self._target_space.max_height_in_footprint(
+            start_x, start_y, item_delta_x, item_delta_y
+        )
 
-        # define the action in the needed format
+        # define the action in the needed format, the packing plan stores the coordinates in millimeters
+        flb_x_mm, flb_y_mm = coordinates_in_mm(start_x, start_y, self._resolution)
         action_extended = {
             "item": item_for_action,
-            "flb_coordinates": [step_vars["xCoord"], step_vars["yCoord"], max_height_in_target_area],
+            "flb_coordinates": [flb_x_mm, flb_y_mm, max_height_in_target_area],
             "orientation": step_vars["orientation"],
         }
         self._actions.append(action_extended)
@@ -187,7 +223,7 @@ class PalletizingEnvironment(gym.Env):
         logger.info(f"step() -> extended action: {action_extended}")
 
         # add the item to the palletizing target
-        self._target_space.addItem(item, action_extended["orientation"], action_extended["flb_coordinates"])
+        self._target_space.addItem(item, action_extended["orientation"], [start_x, start_y, max_height_in_target_area])
         info.update({"support_area/%": item.percentage_direct_support_surface})
 
         # prepare for next call of step
@@ -202,6 +238,7 @@ class PalletizingEnvironment(gym.Env):
 
         reward = self.__getReward(done)
         info = self.__getInfo("step", info, done)
+        self._info = info
 
         step_returns = self._target_space.getHeights(), reward, done, info
         return step_returns
@@ -228,6 +265,7 @@ class PalletizingEnvironment(gym.Env):
             A dictionary that contains additional information that might be useful for the machine learning agent.
         """
         self.__savePackingPlan()
+        self._info.expire("reset")
         # # # # # Change the Order that is considered # # # # #
         done = False
         # change the current order
@@ -260,11 +298,12 @@ class PalletizingEnvironment(gym.Env):
             # size is given as `"x,y,z"`
             sizes = palletizing_target.split(",")
             self._size = (int(sizes[0]), int(sizes[1]))
+        self._grid_size = size_in_cells(self._size, self._resolution)
 
         self.action_space = Dict(
             {
-                "x": Discrete(self._size[0]),
-                "y": Discrete(self._size[1]),
+                "x": Discrete(self._grid_size[0]),
+                "y": Discrete(self._grid_size[1]),
                 "orientation": Discrete(self._n_orientations),
             }
         )
@@ -274,7 +313,7 @@ class PalletizingEnvironment(gym.Env):
             visID=self._current_order.id, target=palletizing_target
         )
 
-        self._target_space.reset(self._size)
+        self._target_space.reset(self._grid_size)
         self._actions = []
         self._palletized_volume = 0.0
         self._kpis.reset(self._target_space, self._current_order)
@@ -289,6 +328,7 @@ class PalletizingEnvironment(gym.Env):
         # # # # # Obtain the Observation and Info # # # # #
         observation = self._target_space.getHeights()
         info = self.__getInfo("reset", done=done)
+        self._info = info
 
         return observation, info
 
@@ -408,12 +448,17 @@ class PalletizingEnvironment(gym.Env):
         return selectable
 
     def __savePackingPlan(self, tofile: bool = False) -> None:
+        """
+        Saves the packing plan of the current order. In the format `json`, all packing plans are kept and
+        `packing_plans.json` is written again. In the format `jsonl`, the packing plan is appended to
+        `packing_plans.jsonl` and not kept, the file is converted to `packing_plans.json` if `tofile` is `True`.
+        """
         if self._current_order is None:
             # do nothing
             pass
         else:
             order_key = self._current_order.id
-            if order_key not in self._packing_plans.keys():
+            if order_key not in self._packing_plans.keys() and order_key not in self._written_order_ids:
                 # serialize items
                 actions_with_serialized_items = []
                 for action in self._actions:
@@ -421,12 +466,21 @@ class PalletizingEnvironment(gym.Env):
                     serializable_action = action
                     serializable_action["item"] = item.to_dict()
                     actions_with_serialized_items.append(serializable_action)
-                self._packing_plans[order_key] = actions_with_serialized_items
+                if self._packing_plan_writer is None:
+                    self._packing_plans[order_key] = actions_with_serialized_items
+                else:
+                    self._packing_plan_writer.write(order_key, actions_with_serialized_items)
+                    self._written_order_ids.add(order_key)
 
                 packing_plan = {order_key: self._actions}
                 logger.info(f"PackingPlan = {packing_plan}")
 
-        if True:  # tofile:
+        if self._packing_plan_writer is not None:
+            if tofile and self._written_order_ids:
+                self._packing_plan_writer.close()
+                compact_packing_plan_stream(self._packing_plan_writer.file_path, OUTPUTDIRECTORY / "packing_plans.json")
+
+        elif True:  # tofile:
             output_file = OUTPUTDIRECTORY / "packing_plans.json"
             if not OUTPUTDIRECTORY.exists():
                 OUTPUTDIRECTORY.mkdir(parents=True, exist_ok=True)
@@ -443,10 +497,12 @@ class PalletizingEnvironment(gym.Env):
             reward = 0.0
         return reward
 
-    def __getInfo(self, calledby: str = "step", additionalinfo: Optional[dict] = None, done: bool = False) -> dict:
-        """Get the info dictionary after reset or step."""
+    def __getInfo(
+        self, calledby: str = "step", additionalinfo: Optional[LazyInfo] = None, done: bool = False
+    ) -> LazyInfo:
+        """Get the info dictionary after reset or step. The allowed areas and corner points are computed on first access."""
         if additionalinfo is None:
-            info = {}
+            info = LazyInfo(self._info_keys)
         else:
             info = additionalinfo
 
@@ -462,25 +518,22 @@ class PalletizingEnvironment(gym.Env):
         elif calledby == "reset":
             # if done is True, then all orders are considered
             if not done:
-                # obtain np.array with allowed area
+                # obtain the allowed areas
                 next_items = self.__obtainNextItems()
                 item = next_items["selection"][0]
-                allowed_area = self._obtain_allowed_areas(item)
-
-                corner_points = self.__determineCornerPoints(next_items["selection"])
 
+                info["all_orders_considered"] = done
+                info.set_lazy("allowed_area", self._obtain_allowed_areas, item)
                 info.update(
                     {
-                        "all_orders_considered": done,
-                        "allowed_area": allowed_area,
                         "order_id": self._current_order.id,
                         "palletizing_target": self._current_order.properties.target,
                         "next_items_selection": next_items["selection"],
                         "next_items_preview": next_items["preview"],
                         "n_items_in_order": len(self._current_order.item_sequence),
-                        "corner_points": corner_points,
                     }
                 )
+                info.set_lazy("corner_points", self.__determineCornerPoints, list(next_items["selection"]))
 
             else:
                 # all orders considered
@@ -524,7 +577,8 @@ class PalletizingEnvironment(gym.Env):
 
     def _obtain_allowed_areas(self, item: Item) -> dict:
         """
-        This method returns a dictionary that contains np.arrays, which define in which coordinates the given item can be placed.
+        This method returns a dictionary that contains the allowed areas, which define in which coordinates the given item can be placed. The allowed areas store only their rectangle, their masks are created on demand and shared between all items with the same footprint.
+
         Returns.
         --------
         allowed_area: dict
@@ -533,34 +587,24 @@ class PalletizingEnvironment(gym.Env):
         Example.
         --------
         >>> allowed_area = {
-                0: np.array,
-                1: np.array,
-                <orientation>: np.array # element == 1: allowed; element == 0: not allowed
+                0: AllowedArea,
+                1: AllowedArea,
+                <orientation>: AllowedArea # np.asarray(AllowedArea): element == 1: allowed; element == 0: not allowed
             }
         """
         allowed_area = {}
-        # if item is None:
-        #     return {}  # {0: np.zeros((self._size), dtype=int), 1: np.zeros((self._size), dtype=int)}
 
-        # create the arrays such that the item is completely inside the palletizing target
-        item_length, item_width = int(item.length_mm), int(item.width_mm)
+        # the item must be completely inside the palletizing target
         for orientation in range(self._n_orientations):
-            if orientation == 0:
-                delta_x, delta_y = item_length, item_width
-            elif orientation == 1:
-                delta_x, delta_y = item_width, item_length
+            delta_x, delta_y = footprint_in_cells(item.length_mm, item.width_mm, orientation, self._resolution)
 
-            if (self._size[1] >= delta_y) and (self._size[0] >= delta_x):
+            if (self._grid_size[1] >= delta_y) and (self._grid_size[0] >= delta_x):
                 # check whether the items can be placed in the target
-                allowed_coordinates = np.zeros((self._size[1], self._size[0]), dtype=int)
-                allowed_coordinates[0 : self._size[1] - delta_y, 0 : self._size[0] - delta_x] = np.ones(
-                    (self._size[1] - delta_y, self._size[0] - delta_x)
-                )
-                allowed_area[orientation] = allowed_coordinates
+                allowed_area[orientation] = AllowedArea(self._grid_size, (delta_x, delta_y), self._storage_mode)
 
         return allowed_area
 
-    def __prepareForNextStep(self, placeditem: Item) -> dict:
+    def __prepareForNextStep(self, placeditem: Item) -> LazyInfo:
         """
         This method prepares the environment for the next call of the `step` method. Hence, the _item_sequence_counter is increased and the next palletizing items and their allowed positions on the target are calculated, unless the current episode has not finished (after the currently called `step`).
 
@@ -569,14 +613,17 @@ class PalletizingEnvironment(gym.Env):
         info: dict
             Information that is returned by the `step` method.
         """
-        info = {}
+        info = LazyInfo()
 
         self._item_sequence_counter += 1
         if self._item_sequence_counter >= len(self._current_order.item_sequence):
             done = True  # episode finished
             info.update(
                 {
-                    "allowed_area": {0: np.zeros((self._size), dtype=int), 1: np.zeros((self._size), dtype=int)},
+                    "allowed_area": {
+                        0: np.zeros((self._grid_size), dtype=int),
+                        1: np.zeros((self._grid_size), dtype=int),
+                    },
                     "next_items_selection": [],
                     "next_items_preview": [],
                 }
@@ -587,19 +634,11 @@ class PalletizingEnvironment(gym.Env):
             self.__updateItemsPreview()
             next_items = self.__obtainNextItems()
             item = next_items["selection"][0]
-            allowed_area = self._obtain_allowed_areas(item)
-
-            # get the corner points for the items that can be selected
-            corner_points = self.__determineCornerPoints(next_items["selection"])
 
-            info.update(
-                {
-                    "allowed_area": allowed_area,
-                    "next_items_selection": next_items["selection"],
-                    "next_items_preview": next_items["preview"],
-                    "corner_points": corner_points,
-                }
-            )
+            # the allowed area and the corner points for the items that can be selected are computed on first access
+            info.set_lazy("allowed_area", self._obtain_allowed_areas, item)
+            info.update({"next_items_selection": next_items["selection"], "next_items_preview": next_items["preview"]})
+            info.set_lazy("corner_points", self.__determineCornerPoints, list(next_items["selection"]))
 
         info.update({"done": done})
 
@@ -729,13 +768,10 @@ class PalletizingEnvironment(gym.Env):
             if item is not None:
                 corner_points[item.article] = {}
                 for orientation in range(self._n_orientations):
-                    if orientation == 0:
-                        length, width, height = item.length_mm, item.width_mm, item.height_mm
-                    elif orientation == 1:
-                        width, length, height = item.length_mm, item.width_mm, item.height_mm
+                    length, width = footprint_in_cells(item.length_mm, item.width_mm, orientation, self._resolution)
 
                     corner_points[item.article][orientation] = self._target_space.getCornerPointsIn3D(
-                        (length, width, height)
+                        (length, width, item.height_mm)
                     )
 
         return corner_points
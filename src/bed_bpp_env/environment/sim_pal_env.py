@@ -5,7 +5,7 @@ Similar to `PalletizingEnvironment`, but with little changes for the tasks with
 import configparser
 import copy
 import logging
-from typing import Tuple
+from typing import Optional, Tuple
 
 import gymnasium as gym
 import numpy as np
@@ -13,7 +13,16 @@ from gymnasium.spaces import Box, Dict, Discrete
 
 from bed_bpp_env.environment import MAXHEIGHT_OBSERVATION_SPACE, SIZE_EURO_PALLET, SIZE_ROLLCONTAINER
 from bed_bpp_env.environment.cuboid import Cuboid
-from bed_bpp_env.environment.space_3d import Space3D
+from bed_bpp_env.environment.lazy_info import LazyInfo, parse_info_keys
+from bed_bpp_env.environment.space_backend import create_space_3d, parse_height_pyramid
+from bed_bpp_env.environment.spatial_resolution import (
+    coordinates_in_mm,
+    footprint_in_cells,
+    height_pyramid_in_cells,
+    parse_spatial_resolution,
+    size_in_cells,
+)
+from bed_bpp_env.environment.storage_mode import StorageMode
 from bed_bpp_env.evaluation.kpis import KPIs
 from bed_bpp_env.utils import PARSEDARGUMENTS
 from bed_bpp_env.utils.configuration import USEDCONFIGURATIONFILE
@@ -39,22 +48,38 @@ class SimPalEnv(gym.Env):
         """The palletizing target's size of the base area in x- and y-direction given in millimeters."""
         self.__N_ORIENTATION = 2
         """The amount of different orientations that are allowed during palletization."""
+        self.__StorageMode = StorageMode(conf.get("environment", "storage_mode", fallback="default"))
+        """Defines the data types of the height maps, the uppermost items and the support masks."""
+        self.__Resolution = parse_spatial_resolution(conf.get("default", "spatial_resolution", fallback="(1,1)"))
+        """The size of a cell of the simulation in x- and y-direction in millimeters."""
+        self.__GridSize = size_in_cells(self._size, self.__Resolution)
+        """The palletizing target's size of the base area in x- and y-direction given in cells."""
 
         self.action_space = Dict(
             {
-                "x": Discrete(self._size[0]),
-                "y": Discrete(self._size[1]),
+                "x": Discrete(self.__GridSize[0]),
+                "y": Discrete(self.__GridSize[1]),
                 "orientation": Discrete(self.__N_ORIENTATION),
             }
         )
         """The action space consists of the simple action spaces for x-, y-coordinate and the orientation of the item."""
 
         self.observation_space = Box(
-            low=0, high=MAXHEIGHT_OBSERVATION_SPACE, shape=(self._size[1], self._size[0]), dtype=int
+            low=0,
+            high=MAXHEIGHT_OBSERVATION_SPACE,
+            shape=(self.__GridSize[1], self.__GridSize[0]),
+            dtype=self.__StorageMode.height_dtype,
         )
         """The observation space describes the heights in each coordinate on the palletizing target."""
 
-        self.__TargetSpace = Space3D(self._size)
+        self.__TargetSpace = create_space_3d(
+            self.__GridSize,
+            conf.get("environment", "space_backend", fallback="dense"),
+            self.__StorageMode,
+            height_pyramid_in_cells(
+                parse_height_pyramid(conf.get("environment", "height_pyramid", fallback="none")), self.__Resolution
+            ),
+        )
         """Represents the 3D space where the palletization takes place."""
 
         self._actions = []
@@ -85,6 +110,11 @@ class SimPalEnv(gym.Env):
         self.__KPIs = KPIs()
         """Holds the values of the KPIs for each order."""
 
+        self.__InfoKeys = parse_info_keys(conf.get("environment", "info_keys", fallback="all"))
+        """The keys of the info that are produced, `None` if all keys are produced."""
+        self.__Info = LazyInfo(self.__InfoKeys)
+        """The info that was returned by the last call of `step` or `reset`. Its lazy values expire when the state changes."""
+
         self.__MPScoreEstimation = False
         """Needed for the update item preview """
 
@@ -117,42 +147,27 @@ class SimPalEnv(gym.Env):
                 "item": {'article': 'cake-00104295', 'id': 'c00104295', 'product_group': 'confectionery', 'length/mm': 590, 'width/mm': 200, 'height/mm': 210, 'weight/kg': 7.67, 'sequence': 1}
             }
         """
-        info = {}
+        self.__Info.expire(f"step {len(self._actions) + 1}")
+        info = LazyInfo(self.__InfoKeys)
 
         # get the variables that are needed here
         step_vars = self.__getStepVariables(action)
         item_for_action = action["item"]
 
         # define the item
-        item = Cuboid(step_vars["item"])
+        item = Cuboid(step_vars["item"], self.__StorageMode, self.__Resolution)
         item.set_orientation(step_vars["orientation"])
 
-        # create a np.ndarray that has the same shape as the target, its elements are 1 if the item is located in this region and 0 otherwise
-        item_on_target = np.zeros((self._size[1], self._size[0]), dtype=int)
-        item_delta_y, item_delta_x = item.array_representation.shape
+        # obtain the FLB height for the item in the selected (x, y)-coordinate, the footprint is cropped at the edges
+        item_delta_y, item_delta_x = item.footprint_shape
         start_x, start_y = step_vars["xCoord"], step_vars["yCoord"]
-        try:
-            item_on_target[start_y : start_y + item_delta_y, start_x : start_x + item_delta_x] = np.ones(
-                item.array_representation.shape, dtype=int
-            )
-        except Exception:
-            # have to crop item like in `environment.Space3D.addItem`
-            logger.warning("cropped item")
-            cropped_shape = (
-                min(item_on_target.shape[0], start_y + item_delta_y) - start_y,
-                min(item_on_target.shape[1], start_x + item_delta_x) - start_x,
-            )
-            item_on_target[start_y : start_y + cropped_shape[0], start_x : start_x + cropped_shape[1]] = np.ones(
-                cropped_shape, dtype=int
-            )
-
-        # obtaiin the FLB height for the item in the selected (x, y)-coordinate
-        maxHeightInTargetArea = int(np.amax(np.multiply(self.__TargetSpace.getHeights(), item_on_target)))
+        maxHeightInTargetArea = self.__TargetSpace.max_height_in_footprint(start_x, start_y, item_delta_x, item_delta_y)
 
-        # define the action in the needed format
+        # define the action in the needed format, the coordinates are stored in millimeters
+        flbXmm, flbYmm = coordinates_in_mm(start_x, start_y, self.__Resolution)
         actionExt = {
             "item": step_vars["item"],
-            "flb_coordinates": [step_vars["xCoord"], step_vars["yCoord"], maxHeightInTargetArea],
+            "flb_coordinates": [flbXmm, flbYmm, maxHeightInTargetArea],
             "orientation": step_vars["orientation"],
         }
         self._actions.append(actionExt)
@@ -160,7 +175,7 @@ class SimPalEnv(gym.Env):
         logger.debug(f"step() -> extended action: {actionExt}")
 
         # add the item to the palletizing target
-        self.__TargetSpace.addItem(item, actionExt["orientation"], actionExt["flb_coordinates"])
+        self.__TargetSpace.addItem(item, actionExt["orientation"], [start_x, start_y, maxHeightInTargetArea])
         info.update({"support_area/%": item.percentage_direct_support_surface})
 
         # prepare for next call of step
@@ -174,6 +189,7 @@ class SimPalEnv(gym.Env):
 
         reward = self.__getReward(done)
         info = self.__getInfo("step", info)
+        self.__Info = info
 
         stepReturns = self.__TargetSpace.getHeights(), reward, done, info
         return stepReturns
@@ -199,6 +215,7 @@ class SimPalEnv(gym.Env):
         info: dict
             A dictionary that contains additional information that might be useful for the machine learning agent.
         """
+        self.__Info.expire("reset")
         # # # # # Change the Order that is considered # # # # #
         done = False
         # change the current order
@@ -237,16 +254,17 @@ class SimPalEnv(gym.Env):
             # size is given as `"x,y,z"`
             sizes = palletizingTarget.split(",")
             self._size = tuple([int(sizes[0]), int(sizes[1])])
+        self.__GridSize = size_in_cells(self._size, self.__Resolution)
 
         self.action_space = Dict(
             {
-                "x": Discrete(self._size[0]),
-                "y": Discrete(self._size[1]),
+                "x": Discrete(self.__GridSize[0]),
+                "y": Discrete(self.__GridSize[1]),
                 "orientation": Discrete(self.__N_ORIENTATION),
             }
         )
 
-        self.__TargetSpace.reset(self._size)
+        self.__TargetSpace.reset(self.__GridSize)
         self._actions = []
         self.__PalletizedVolume = 0.0
         self.__KPIs.reset(self.__TargetSpace, self.__CurrentOrder)
@@ -261,6 +279,7 @@ class SimPalEnv(gym.Env):
         # # # # # Obtain the Observation and Info # # # # #
         observation = self.__TargetSpace.getHeights()
         info = self.__getInfo("reset")
+        self.__Info = info
 
         return observation, info
 
@@ -280,9 +299,9 @@ class SimPalEnv(gym.Env):
             reward = 0.0
         return reward
 
-    def __getInfo(self, calledby: str = "step", additionalinfo: dict = {}) -> dict:
-        """Get the info dictionary after reset or step"""
-        info = additionalinfo
+    def __getInfo(self, calledby: str = "step", additionalinfo: Optional[LazyInfo] = None) -> LazyInfo:
+        """Get the info dictionary after reset or step. The corner points are computed on first access."""
+        info = LazyInfo(self.__InfoKeys) if additionalinfo is None else additionalinfo
 
         if calledby == "step":
             info.update(
@@ -303,17 +322,15 @@ class SimPalEnv(gym.Env):
                 nextItems = self.__obtainNextItems()
                 item = nextItems["selection"][0]
 
-                cornerPoints = self.__determineCornerPoints(nextItems["selection"])
-
                 info.update(
                     {
                         "all_orders_considered": done,
                         "order_id": self.__CurrentOrder["key"],
                         "next_items_selection": nextItems["selection"],
                         "next_items_preview": nextItems["preview"],
-                        "corner_points": cornerPoints,
                     }
                 )
+                info.set_lazy("corner_points", self.__determineCornerPoints, list(nextItems["selection"]))
 
             else:
                 # all orders considered
@@ -354,7 +371,7 @@ class SimPalEnv(gym.Env):
 
         return stepVar
 
-    def __prepareForNextStep(self, placeditem: dict) -> dict:
+    def __prepareForNextStep(self, placeditem: dict) -> LazyInfo:
         """
         This method prepares the environment for the next call of the `step` method. Hence, the __ItemSequenceCounter is increased and the next palletizing items and their allowed positions on the target are calculated, unless the current episode has not finished (after the currently called `step`).
 
@@ -363,7 +380,7 @@ class SimPalEnv(gym.Env):
             info: dict
                 Information that is returned by the `step` method.
         """
-        info = {}
+        info = LazyInfo()
 
         self.__ItemSequenceCounter += 1
         if self.__ItemSequenceCounter > len(self.__CurrentOrder["order"]["item_sequence"]):
@@ -375,16 +392,14 @@ class SimPalEnv(gym.Env):
             self.__updateItemsPreview()
             nextItems = self.__obtainNextItems()
 
-            # get the corner points for the items that can be selected
-            cornerPoints = self.__determineCornerPoints(nextItems["selection"])
-
+            # the corner points for the items that can be selected are computed on first access
             info.update(
                 {  # "allowed_area": allowedArea,
                     "next_items_selection": nextItems["selection"],
                     "next_items_preview": nextItems["preview"],
-                    "corner_points": cornerPoints,
                 }
             )
+            info.set_lazy("corner_points", self.__determineCornerPoints, list(nextItems["selection"]))
 
         info.update({"done": done})
 
@@ -440,13 +455,12 @@ class SimPalEnv(gym.Env):
             if not (itemArticle is None):
                 cornerPoints[itemArticle] = {}
                 for orientation in range(self.__N_ORIENTATION):
-                    if orientation == 0:
-                        length, width, height = item.get("length/mm"), item.get("width/mm"), item.get("height/mm")
-                    elif orientation == 1:
-                        width, length, height = item.get("length/mm"), item.get("width/mm"), item.get("height/mm")
+                    length, width = footprint_in_cells(
+                        item.get("length/mm"), item.get("width/mm"), orientation, self.__Resolution
+                    )
 
                     cornerPoints[itemArticle][orientation] = self.__TargetSpace.getCornerPointsIn3D(
-                        (length, width, height)
+                        (length, width, item.get("height/mm"))
                     )
 
         return cornerPoints
@@ -522,6 +536,63 @@ class SimPalEnv(gym.Env):
 
         self.__MPScoreEstimation = True
 
+    def snapshot(self) -> tuple:
+        """
+        Opens a snapshot of the current state of the environment and returns its token. Afterwards, steps can be
+        simulated and reverted with `restore`, which replaces a `copy.deepcopy` of the environment. Call `release` if
+        the snapshot is not needed anymore.
+
+        Returns.
+        --------
+        token: tuple
+            The token that is passed to `restore` and `release`.
+        """
+        token = (
+            self.__TargetSpace.snapshot(),
+            len(self._actions),
+            self.__PalletizedVolume,
+            self.__ItemSequenceCounter,
+            list(self.__ItemsSelection),
+            list(self.__ItemsPreview),
+            self.__MPScoreEstimation,
+            self.__KPIs.getState(),
+        )
+        return token
+
+    def restore(self, token: tuple) -> None:
+        """
+        Reverts all steps that were made after the snapshot with the given token was opened. The snapshot stays open.
+
+        Parameters.
+        -----------
+        token: tuple
+            The token that was returned by `snapshot`.
+        """
+        (
+            spaceToken,
+            nActions,
+            palletizedVolume,
+            itemSequenceCounter,
+            itemsSelection,
+            itemsPreview,
+            mpScoreEstimation,
+            kpiState,
+        ) = token
+
+        self.__Info.expire("restore")
+        self.__TargetSpace.restore(spaceToken)
+        del self._actions[nActions:]
+        self.__PalletizedVolume = palletizedVolume
+        self.__ItemSequenceCounter = itemSequenceCounter
+        self.__ItemsSelection = list(itemsSelection)
+        self.__ItemsPreview = list(itemsPreview)
+        self.__MPScoreEstimation = mpScoreEstimation
+        self.__KPIs.setState(kpiState)
+
+    def release(self, token: tuple) -> None:
+        """Releases the snapshot with the given token without changing the environment."""
+        self.__TargetSpace.release(token[0])
+
     def remStoredOrder(self) -> None:
         """
         Deletes the stored benchmark data order.
@@ -0,0 +1,218 @@
+"""
+This module contains a class that represents a virtual, three-dimensional space whose top surface is stored as a set of
+axis-aligned rectangles instead of a height map with one value per millimeter.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from bed_bpp_env.environment import HEIGHT_TOLERANCE_MM
+from bed_bpp_env.environment.space_3d import Space3D
+
+_X_START, _Y_START, _X_END, _Y_END, _TOP, _COUNTER = range(6)
+"""The columns of the array that stores the rectangles of the skyline."""
+
+
+class SkylineSpace3D(Space3D):
+    """
+    This class represents a virtual space to which items are added. In contrast to `Space3D`, the top surface of the
+    space (the skyline) is stored as disjoint, axis-aligned rectangles that cover the base area. Each rectangle holds
+    the height and the counter of the uppermost item in its area.
+
+    The footprint queries iterate over the rectangles, thus, their cost depends on the amount of placed items rather
+    than on the size of the base area. The parts of a covered rectangle that remain visible are merged with adjacent
+    rectangles of the same item if their union is a rectangle, hence, the rectangles do not fragment further than the
+    items require. The height pyramid is pooled from the rectangles, too. The height map and the uppermost items are
+    only created if `getHeights` or `getUppermostItems` is called. Afterwards, they are kept up to date with each added
+    and each removed item, but they are not copied or pickled together with the space.
+
+    Parameters.
+    -----------
+    basesize: tuple (default = (1200, 800))
+        The space's size of the base area in x- and y-direction given in millimeters.
+
+    Attributes.
+    -----------
+    _rectangles: np.ndarray
+        This `np.ndarray` has the shape `(n_rectangles, 6)` and stores the rectangles of the top surface as
+        `(x_start, y_start, x_end, y_end, top, counter)`, where the end coordinates are exclusive.
+    _surface_cache: tuple
+        The height map and the uppermost items as `np.ndarray`, `None` if they have not been requested yet.
+    """
+
+    def _reset_surface(self) -> None:
+        """Creates the empty top surface, i.e., a single rectangle that covers the base area."""
+        self._rectangles = np.array([[0, 0, self._size[0], self._size[1], 0, 0]], dtype=int)
+        """The rectangles of the top surface as `(x_start, y_start, x_end, y_end, top, counter)`."""
+
+        self._surface_cache: Optional[tuple[np.ndarray, np.ndarray]] = None
+        """The height map and the uppermost items as `np.ndarray`, `None` if they have not been requested yet."""
+
+    def __getstate__(self) -> dict:
+        state = super().__getstate__()
+        state["_surface_cache"] = None
+        return state
+
+    def _get_uppermost_items_in_area(
+        self, start_x: int, start_y: int, end_x: int, end_y: int, heightlevel: int
+    ) -> np.ndarray:
+        rectangles = self._rectangles[self.__intersects(start_x, start_y, end_x, end_y)]
+        return np.unique(rectangles[rectangles[:, _TOP] >= heightlevel, _COUNTER])
+
+    def _set_top_surface(self, start_x: int, start_y: int, end_x: int, end_y: int, height: int, counter: int) -> None:
+        if start_x >= end_x or start_y >= end_y:
+            # the item is located outside of the base area, an empty rectangle would intersect its neighbors
+            return
+
+        intersects = self.__intersects(start_x, start_y, end_x, end_y)
+        covered = self._rectangles[intersects]
+
+        # the parts of the covered rectangles that are not covered by the new rectangle remain, i.e., the parts in front
+        # of and behind the new rectangle with full length as well as the parts left and right of it
+        middle_y_start = np.maximum(covered[:, _Y_START], start_y)
+        middle_y_end = np.minimum(covered[:, _Y_END], end_y)
+        front, behind, left, right = covered.copy(), covered.copy(), covered.copy(), covered.copy()
+        front[:, _Y_END] = middle_y_start
+        behind[:, _Y_START] = middle_y_end
+        left[:, _Y_START], left[:, _Y_END], left[:, _X_END] = middle_y_start, middle_y_end, start_x
+        right[:, _Y_START], right[:, _Y_END], right[:, _X_START] = middle_y_start, middle_y_end, end_x
+        remaining = np.concatenate([front, behind, left, right])
+        remaining = remaining[
+            (remaining[:, _X_START] < remaining[:, _X_END]) & (remaining[:, _Y_START] < remaining[:, _Y_END])
+        ]
+
+        new_rectangle = np.array([[start_x, start_y, end_x, end_y, height, counter]], dtype=int)
+        rectangles = np.concatenate([self._rectangles[~intersects], remaining, new_rectangle])
+        self._rectangles = self.__merge(rectangles, remaining[:, _COUNTER])
+
+        if self._surface_cache is not None:
+            heights, uppermost_items = self._surface_cache
+            heights[start_y:end_y, start_x:end_x] = height
+            uppermost_items[start_y:end_y, start_x:end_x] = counter
+
+    def _get_top_surface_state(self, start_x: int, start_y: int, end_x: int, end_y: int) -> tuple:
+        # `_set_top_surface` replaces the array of rectangles, thus, the current one is kept without a copy
+        return self._rectangles, (start_x, start_y, end_x, end_y)
+
+    def _restore_top_surface(self, surface_state: tuple) -> None:
+        self._rectangles, area = surface_state
+
+        if self._surface_cache is not None:
+            # the cached surface is only changed in the area of the removed item, which is drawn from the rectangles
+            self.__draw(*self._surface_cache, *area)
+
+    def _pool_top_surface(
+        self, maxima: np.ndarray, blocksize: int, start_x: int, start_y: int, end_x: int, end_y: int
+    ) -> None:
+        first_x, first_y = start_x // blocksize, start_y // blocksize
+        last_x, last_y = -(-end_x // blocksize), -(-end_y // blocksize)
+        blocks = maxima[first_y:last_y, first_x:last_x]
+        blocks[:] = 0
+
+        # the rectangles cover the base area, hence, the maximum of a block is the maximum top of its rectangles
+        area = first_x * blocksize, first_y * blocksize, last_x * blocksize, last_y * blocksize
+        rectangles = self._rectangles[self.__intersects(*area)].tolist()
+        for rectangle_x, rectangle_y, rectangle_end_x, rectangle_end_y, top, _ in rectangles:
+            rectangle_blocks = blocks[
+                max(rectangle_y // blocksize - first_y, 0) : -(-rectangle_end_y // blocksize) - first_y,
+                max(rectangle_x // blocksize - first_x, 0) : -(-rectangle_end_x // blocksize) - first_x,
+            ]
+            np.maximum(rectangle_blocks, top, out=rectangle_blocks)
+
+    def getHeights(self) -> np.ndarray:
+        """Returns the heights in millimeters in each coordinate of the space."""
+        return self.__getSurface()[0]
+
+    def getUppermostItems(self) -> np.ndarray:
+        """Returns the counter of the uppermost item in each coordinate of the space, `0` represents the target."""
+        return self.__getSurface()[1]
+
+    def max_height_in_footprint(self, x: int, y: int, delta_x: int, delta_y: int) -> int:
+        rectangles = self._rectangles[self.__intersects(x, y, x + delta_x, y + delta_y)]
+        return int(rectangles[:, _TOP].max(initial=0))
+
+    def direct_support_area(self, x: int, y: int, delta_x: int, delta_y: int, flbz: int) -> int:
+        end_x, end_y = min(x + delta_x, self._size[0]), min(y + delta_y, self._size[1])
+        rectangles = self._rectangles[self.__intersects(x, y, end_x, end_y)]
+        rectangles = rectangles[rectangles[:, _TOP] >= flbz - HEIGHT_TOLERANCE_MM]
+
+        overlap_x = np.minimum(rectangles[:, _X_END], end_x) - np.maximum(rectangles[:, _X_START], x)
+        overlap_y = np.minimum(rectangles[:, _Y_END], end_y) - np.maximum(rectangles[:, _Y_START], y)
+        return int(np.sum(overlap_x * overlap_y))
+
+    def __intersects(self, start_x: int, start_y: int, end_x: int, end_y: int) -> np.ndarray:
+        """Returns a boolean mask of the rectangles that intersect the given area."""
+        rectangles = self._rectangles
+        return (
+            (rectangles[:, _X_START] < end_x)
+            & (rectangles[:, _X_END] > start_x)
+            & (rectangles[:, _Y_START] < end_y)
+            & (rectangles[:, _Y_END] > start_y)
+        )
+
+    @staticmethod
+    def __merge(rectangles: np.ndarray, counters: np.ndarray) -> np.ndarray:
+        """
+        Merges the rectangles of the items with the given counters, i.e., the items whose rectangles were partly
+        covered, as long as two rectangles of the same item and height share a complete edge.
+        """
+        related = (rectangles[:, _COUNTER, np.newaxis] == counters).any(axis=1)
+        group = rectangles[related].tolist()
+        n_related = len(group)
+
+        index = 0
+        while index < len(group):
+            x_start, y_start, x_end, y_end, top, counter = group[index]
+            for other_index in range(index + 1, len(group)):
+                other_x_start, other_y_start, other_x_end, other_y_end, other_top, other_counter = group[other_index]
+                if (top, counter) != (other_top, other_counter):
+                    continue
+                along_x = (y_start, y_end) == (other_y_start, other_y_end) and (
+                    x_end == other_x_start or other_x_end == x_start
+                )
+                along_y = (x_start, x_end) == (other_x_start, other_x_end) and (
+                    y_end == other_y_start or other_y_end == y_start
+                )
+                if along_x or along_y:
+                    group[index] = [
+                        min(x_start, other_x_start),
+                        min(y_start, other_y_start),
+                        max(x_end, other_x_end),
+                        max(y_end, other_y_end),
+                        top,
+                        counter,
+                    ]
+                    del group[other_index]
+                    # the merged rectangle is compared again, since it might share an edge with further rectangles
+                    break
+            else:
+                index += 1
+
+        if len(group) == n_related:
+            return rectangles
+        return np.concatenate([rectangles[~related], np.array(group, dtype=int)])
+
+    def __draw(
+        self, heights: np.ndarray, uppermost_items: np.ndarray, start_x: int, start_y: int, end_x: int, end_y: int
+    ) -> None:
+        """Draws the rectangles that intersect the given area into the given height map and uppermost items."""
+        rectangles = self._rectangles[self.__intersects(start_x, start_y, end_x, end_y)].tolist()
+        for rectangle_x, rectangle_y, rectangle_end_x, rectangle_end_y, top, counter in rectangles:
+            area = (
+                slice(max(rectangle_y, start_y), min(rectangle_end_y, end_y)),
+                slice(max(rectangle_x, start_x), min(rectangle_end_x, end_x)),
+            )
+            heights[area] = top
+            uppermost_items[area] = counter
+
+    def __getSurface(self) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the height map and the uppermost items, they are created from the rectangles if necessary."""
+        if self._surface_cache is None:
+            target_shape = self._size[1], self._size[0]
+            heights = np.zeros(target_shape, dtype=self._storage_mode.height_dtype)
+            uppermost_items = np.zeros(target_shape, dtype=self._storage_mode.item_dtype)
+            self.__draw(heights, uppermost_items, 0, 0, *self._size)
+            self._surface_cache = heights, uppermost_items
+
+        return self._surface_cache
@@ -2,20 +2,27 @@
 This module contains a class that represents a virtual, three-dimensional space.
 """
 
+import bisect
 import logging
+from typing import Optional
 
 import numpy as np
 
 from bed_bpp_env.data_model.position_3d import Position3D
 from bed_bpp_env.environment import HEIGHT_TOLERANCE_MM as HEIGHT_TOLERANCE_MM
-from bed_bpp_env.environment.cuboid import Cuboid
+from bed_bpp_env.environment.block_pooling import pooled_shape, update_block_pool
+from bed_bpp_env.environment.cuboid import Cuboid, closed_intervals_overlap
 from bed_bpp_env.environment.direction import Direction, opposite_direction
+from bed_bpp_env.environment.storage_mode import StorageMode
 
 logger = logging.getLogger(__name__)
 
 MAXHEIGHT = 3_000  # for corner points
 """The maximum height in millimeters for that corner points are determined. Needs to be greater than the maximum palletizing height."""
 
+ITEM_GRID_CELL_SIZE_MM = 100
+"""The edge length in millimeters of the square cells of the grid that indexes the placed items for the neighbor search."""
+
 
 class Space3D:
     """
@@ -26,37 +33,93 @@ class Space3D:
     -----------
     basesize: tuple (default = (1200, 800))
         The space's size of the base area in x- and y-direction given in millimeters.
+    storage_mode: StorageMode (default = StorageMode.DEFAULT)
+        Defines the data types of the heights and the uppermost items.
+    height_pyramid: tuple (default = ())
+        The edge lengths of the square blocks of the max-pooled height maps that are maintained, e.g., `(10, 50, 100)`,
+        in the same unit as the base area, i.e., in cells if the space is simulated at a coarser spatial resolution.
+        Each edge length must divide both sizes of the base area. No pyramid is maintained if empty.
 
     Attributes.
     -----------
+    _height_pyramid: dict
+        The max-pooled height maps, its keys are the edge lengths of the blocks in ascending order and its values the
+        maximum height in each block in millimeters.
     _heights: np.ndarray
         'This `np.ndarray` has the shape of the palletizing target and stores the height in each position in millimeters.
+    _item_grid: dict
+        The spatial index of the placed items. Its keys are the cells of a grid as `(cell_x, cell_y)` and its values the counters of the items whose base area overlaps the cell.
+    _journal: list
+        The changes that were made by each added item since the first open snapshot, `None` if no snapshot is open.
     _placed_items: dict
         This dictionary's keys are the chronological order of the placed items and its values are the items as `Cuboid` object.
     _size: tuple
        The space's size of the base area in x- and y-direction given in millimeters.
+    _storage_mode: StorageMode
+        Defines the data types of the heights and the uppermost items.
     _uppermost_items:  np.ndarray
         This `np.ndarray` has the same shape as the height map of the three-dimensional space and stores a counter that represents the counter of the uppermost item.
     """
 
-    def __init__(self, basesize: tuple = (1_200, 8_00)) -> None:
+    def __init__(
+        self,
+        basesize: tuple = (1_200, 8_00),
+        storage_mode: StorageMode = StorageMode.DEFAULT,
+        height_pyramid: tuple = (),
+    ) -> None:
         self._size = basesize
         """The space's size of the base area in x- and y-direction given in millimeters."""
 
+        self._storage_mode = StorageMode(storage_mode)
+        """Defines the data types of the heights and the uppermost items."""
+
         self._placed_items = {}
         """This dictionary's keys are the chronological order of the placed items and its values are the items as `Cuboid` object."""
 
-        target_shape = self._size[1], self._size[0]
-        self._heights = np.zeros(target_shape, dtype=int)
-        """This `np.ndarray` has the shape of the palletizing target and stores the height in each position in millimeters."""
+        self._item_grid: dict[tuple[int, int], list[int]] = {}
+        """The spatial index of the placed items. Its keys are the cells of a grid as `(cell_x, cell_y)` and its values the counters of the items whose base area overlaps the cell."""
 
-        self._uppermost_items = np.zeros(target_shape, dtype=int)
-        """This `np.ndarray` has the same shape as the height map of the three-dimensional space and stores a counter that represents the counter of the uppermost item."""
+        self._height_levels = [0]
+        """The sorted height levels of the space, i.e., `0` and the heights of the tops of all placed items."""
+        self._2d_corners_by_height_level: dict[int, tuple[list[tuple[int, int]], bool]] = {}
+        """The 2D corner points of the items above a height level before the infeasible corner points are removed, and whether there are items above this height level."""
+        self._corner_points_by_item_dimension: dict[tuple, list[tuple[int, int, int]]] = {}
+        """The 3D corner points that were determined for an item dimension since the last item was added."""
+
+        self._journal: Optional[list[tuple]] = None
+        """The changes that were made by each added item since the first open snapshot, `None` if no snapshot is open."""
+
+        self._reset_surface()
+
+        self._height_pyramid: dict[int, np.ndarray] = dict.fromkeys(sorted(set(height_pyramid)))
+        """The max-pooled height maps, its keys are the edge lengths of the blocks in ascending order and its values the maximum height in each block in millimeters."""
+        self.__resetHeightPyramid()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_journal"] = None
+        return state
 
     def getPlacedItems(self) -> list[Cuboid]:
         """Returns all placed items as list of `Cuboid`."""
         return list(self._placed_items.values())
 
+    def getNumberOfPlacedItems(self) -> int:
+        """Returns the amount of placed items without copying them."""
+        return len(self._placed_items)
+
+    def getPlacedItem(self, counter: int) -> Cuboid:
+        """Returns the placed item with the given counter, i.e., the `counter`-th item that was placed, starting at 1."""
+        return self._placed_items[counter]
+
+    def getSize(self) -> tuple:
+        """Returns the size of the base area of the space."""
+        return self._size
+
+    def getStorageMode(self) -> StorageMode:
+        """Returns the storage mode that defines the data types of the heights and the uppermost items."""
+        return self._storage_mode
+
     def addItem(self, item: Cuboid, orientation: int, flbcoordinates: list) -> None:
         """
         Adds an item to the virtual three-dimensional space and calculates the required attributes for the stability check evaluation.
@@ -72,18 +135,14 @@ class Space3D:
         """
         item.flb = Position3D(x=flbcoordinates[0], y=flbcoordinates[1], z=flbcoordinates[2])
 
-        item_as_array = item.array_representation
         # define the area where the item is located
         start_x, start_y = flbcoordinates[0], flbcoordinates[1]
-        delta_x, delta_y = item_as_array.shape[1], item_as_array.shape[0]
+        delta_y, delta_x = item.footprint_shape
         end_x, end_y = start_x + delta_x, start_y + delta_y
 
         # detect all items that directly support the current item
-        items_area_below = self._uppermost_items[start_y:end_y, start_x:end_x]
-        heights_area_below = self._heights[start_y:end_y, start_x:end_x]
         height_threshold = flbcoordinates[2] - HEIGHT_TOLERANCE_MM
-        items_with_direct_support = np.where(heights_area_below >= height_threshold, items_area_below, -1)
-        allItemsBelow = np.unique(items_with_direct_support)
+        allItemsBelow = self._get_uppermost_items_in_area(start_x, start_y, end_x, end_y, height_threshold)
         # remove item counter 0 <=> palletizing target
         # needed condition item <= len(placed items) because strange errors sometimes occured during dev
         counters_direct_items_below = [
@@ -94,47 +153,32 @@ class Space3D:
         item.store_items_directly_below(items_directly_below)
 
         # detect all neighbors of the current item
-        target_size_y, target_size_x = self._uppermost_items.shape
-        neighbor_start_x = start_x if start_x == 0 else start_x - 1
-        neighbor_end_x = end_x if end_x == target_size_x - 1 else end_x + 1
-        neighbor_start_y = start_y if start_y == 0 else start_y - 1
-        neighbor_end_y = end_y if end_y == target_size_y - 1 else end_y + 1
-        # create np.ndarray with items and heights
-        items_area_neighbor = self._uppermost_items[neighbor_start_y:neighbor_end_y, neighbor_start_x:neighbor_end_x]
-        heights_area_neighbor = self._heights[neighbor_start_y:neighbor_end_y, neighbor_start_x:neighbor_end_x]
-
-        height_threshold = flbcoordinates[2]  # -HEIGHT_TOLERANCE_MM
-        items_surround = np.where(heights_area_neighbor > height_threshold, items_area_neighbor, -1)
-        all_items_surround = np.unique(items_surround)
-        # # remove item counter 0 <=> palletizing target
-        counters_possible_neighbor_items = [
-            item for item in all_items_surround if item > 0 and (item not in items_directly_below)
-        ]
-        # # obtain the Cuboid objects and store it in the current item
-        possible_neighbors = [self._placed_items[countItem] for countItem in counters_possible_neighbor_items]
-        self.__identifyNeighbors(item, possible_neighbors)
+        self.__identifyNeighbors(item)
 
-        # update the heights attribute
-        crop = ""
-        if end_x - start_x > self._heights.shape[1] - start_x:
+        # update the heights and the uppermost items
+        if end_x - start_x > self._size[0] - start_x:
             logger.warning("crop item in X direction")
-            end_x = self._heights.shape[1]
-            crop += "x"
-        if end_y - start_y > self._heights.shape[0] - start_y:
+            end_x = self._size[0]
+        if end_y - start_y > self._size[1] - start_y:
             logger.warning("crop item in Y direction")
-            end_y = self._heights.shape[0]
-            crop += "y"
-        self._heights[start_y:end_y, start_x:end_x] = flbcoordinates[2] * np.ones(
-            (end_y - start_y, end_x - start_x), dtype=int
-        )
-        self._heights[start_y:end_y, start_x:end_x] += item_as_array[: end_y - start_y, : end_x - start_x]
-
-        # update the uppermost items attribute and the placed items
+            end_y = self._size[1]
         counter_item = len(self._placed_items) + 1
-        self._uppermost_items[start_y:end_y, start_x:end_x] = counter_item * np.ones(
-            (end_y - start_y, end_x - start_x), dtype=int
-        )
+        if self._journal is not None:
+            self._journal.append(
+                (
+                    counter_item,
+                    self._get_top_surface_state(start_x, start_y, end_x, end_y),
+                    self.__getHeightPyramidState(start_x, start_y, end_x, end_y),
+                    flbcoordinates[2] + item.height not in self._height_levels,
+                    self._2d_corners_by_height_level,
+                    self._corner_points_by_item_dimension,
+                )
+            )
+        self._set_top_surface(start_x, start_y, end_x, end_y, flbcoordinates[2] + item.height, counter_item)
+        self.__updateHeightPyramid(start_x, start_y, end_x, end_y, flbcoordinates[2] + item.height)
         self._placed_items[counter_item] = item
+        self.__addToItemGrid(item, counter_item)
+        self.__updateCornerPointCache(item)
 
     def reset(self, basesize: tuple) -> None:
         """
@@ -146,16 +190,353 @@ class Space3D:
             The shape of the base area given as `(shape_x, shape_y)`.
         """
         self._size = basesize
-        target_shape = self._size[1], self._size[0]
 
         self._placed_items = {}
-        self._heights = np.zeros(target_shape, dtype=int)
-        self._uppermost_items = np.zeros(target_shape, dtype=int)
+        self._item_grid = {}
+        self._height_levels = [0]
+        self._2d_corners_by_height_level = {}
+        self._corner_points_by_item_dimension = {}
+        self._journal = None
+        self._reset_surface()
+        self.__resetHeightPyramid()
+
+    def snapshot(self) -> int:
+        """
+        Opens a snapshot of the current state of the space and returns its token. Until the snapshot is released, each
+        added item records the changes it makes, i.e., the previous values of the heights and uppermost items in its
+        footprint and the cached values it replaces. No copy of the space is created.
+
+        Returns.
+        --------
+        token: int
+            The token that is passed to `restore` and `release`.
+        """
+        if self._journal is None:
+            self._journal = []
+
+        return len(self._journal)
+
+    def restore(self, token: int) -> None:
+        """
+        Removes all items that were added after the snapshot with the given token was opened. The snapshot stays open,
+        hence, it can be restored again.
+
+        Parameters.
+        -----------
+        token: int
+            The token that was returned by `snapshot`.
+        """
+        if self._journal is None or not (0 <= token <= len(self._journal)):
+            raise ValueError(f"snapshot {token} is not open")
+
+        while len(self._journal) > token:
+            self.__undoAddItem(*self._journal.pop())
+
+    def release(self, token: int) -> None:
+        """
+        Releases the snapshot with the given token without changing the space. The changes are no longer recorded after
+        the first snapshot is released.
+
+        Parameters.
+        -----------
+        token: int
+            The token that was returned by `snapshot`.
+        """
+        if self._journal is None or not (0 <= token <= len(self._journal)):
+            raise ValueError(f"snapshot {token} is not open")
+
+        if token == 0:
+            self._journal = None
+
+    def __undoAddItem(
+        self,
+        counter: int,
+        surface_state: tuple,
+        pyramid_state: list,
+        new_height_level: bool,
+        corners_by_height_level: dict,
+        corner_points_by_item_dimension: dict,
+    ) -> None:
+        """Reverts the changes that were made when the item with the given counter was added."""
+        item = self._placed_items.pop(counter)
+        self._restore_top_surface(surface_state)
+        for blocksize, area, maxima in pyramid_state:
+            self._height_pyramid[blocksize][area] = maxima
+
+        for cell in self.__getGridCells(item.x_interval, item.y_interval):
+            self._item_grid[cell].pop()
+            if self._item_grid[cell] == []:
+                del self._item_grid[cell]
+
+        if new_height_level:
+            self._height_levels.remove(item.flb.z + item.height)
+        self._2d_corners_by_height_level = corners_by_height_level
+        self._corner_points_by_item_dimension = corner_points_by_item_dimension
+
+        for edge, neighbors in item.neighbors.items():
+            for neighbor in neighbors:
+                neighbor.remove_neighbor(opposite_direction(edge), item)
+
+    def _reset_surface(self) -> None:
+        """Creates the empty top surface of the space, i.e., the heights and the uppermost items."""
+        target_shape = self._size[1], self._size[0]
+        self._heights = np.zeros(target_shape, dtype=self._storage_mode.height_dtype)
+        """This `np.ndarray` has the shape of the palletizing target and stores the height in each position in millimeters."""
+
+        self._uppermost_items = np.zeros(target_shape, dtype=self._storage_mode.item_dtype)
+        """This `np.ndarray` has the same shape as the height map of the three-dimensional space and stores a counter that represents the counter of the uppermost item."""
+
+    def _get_uppermost_items_in_area(
+        self, start_x: int, start_y: int, end_x: int, end_y: int, heightlevel: int
+    ) -> np.ndarray:
+        """
+        Returns the counters of the uppermost items in the given area whose top is located at or above the given height
+        level. The counter `0` represents the palletizing target.
+
+        Parameters.
+        -----------
+        start_x: int
+            The first x-coordinate of the area.
+        start_y: int
+            The first y-coordinate of the area.
+        end_x: int
+            The x-coordinate after the last x-coordinate of the area.
+        end_y: int
+            The y-coordinate after the last y-coordinate of the area.
+        heightlevel: int
+            The height level in millimeters.
+
+        Returns.
+        --------
+        counters: np.ndarray
+            The sorted, unique counters of the uppermost items.
+        """
+        items_area = self._uppermost_items[start_y:end_y, start_x:end_x]
+        heights_area = self._heights[start_y:end_y, start_x:end_x]
+        return np.unique(items_area[heights_area >= heightlevel])
+
+    def _set_top_surface(self, start_x: int, start_y: int, end_x: int, end_y: int, height: int, counter: int) -> None:
+        """
+        Sets the height and the uppermost item in the given area, which is located within the base area.
+
+        Parameters.
+        -----------
+        start_x: int
+            The first x-coordinate of the area.
+        start_y: int
+            The first y-coordinate of the area.
+        end_x: int
+            The x-coordinate after the last x-coordinate of the area.
+        end_y: int
+            The y-coordinate after the last y-coordinate of the area.
+        height: int
+            The new height of the area in millimeters.
+        counter: int
+            The counter of the new uppermost item of the area.
+        """
+        self._heights[start_y:end_y, start_x:end_x] = height
+        self._uppermost_items[start_y:end_y, start_x:end_x] = counter
+
+    def _get_top_surface_state(self, start_x: int, start_y: int, end_x: int, end_y: int) -> tuple:
+        """
+        Returns the state of the top surface in the given area that is needed to revert a call of `_set_top_surface`
+        with this area.
+
+        Parameters.
+        -----------
+        start_x: int
+            The first x-coordinate of the area.
+        start_y: int
+            The first y-coordinate of the area.
+        end_x: int
+            The x-coordinate after the last x-coordinate of the area.
+        end_y: int
+            The y-coordinate after the last y-coordinate of the area.
+
+        Returns.
+        --------
+        surface_state: tuple
+            The area and copies of the heights and uppermost items in this area.
+        """
+        return (
+            (slice(start_y, end_y), slice(start_x, end_x)),
+            self._heights[start_y:end_y, start_x:end_x].copy(),
+            self._uppermost_items[start_y:end_y, start_x:end_x].copy(),
+        )
+
+    def _restore_top_surface(self, surface_state: tuple) -> None:
+        """Reverts the top surface to the state that was returned by `_get_top_surface_state`."""
+        area, heights, uppermost_items = surface_state
+        self._heights[area] = heights
+        self._uppermost_items[area] = uppermost_items
+
+    def _pool_top_surface(
+        self, maxima: np.ndarray, blocksize: int, start_x: int, start_y: int, end_x: int, end_y: int
+    ) -> None:
+        """
+        Sets the blocks of a level of the height pyramid that overlap the given area to the maximum height in each block.
+
+        Parameters.
+        -----------
+        maxima: np.ndarray
+            The maximum height in each block of the level, which is updated.
+        blocksize: int
+            The edge length of the blocks of the level.
+        start_x: int
+            The first x-coordinate of the area.
+        start_y: int
+            The first y-coordinate of the area.
+        end_x: int
+            The x-coordinate after the last x-coordinate of the area.
+        end_y: int
+            The y-coordinate after the last y-coordinate of the area.
+        """
+        update_block_pool(maxima, self._heights, (start_x, start_y, end_x, end_y), (blocksize, blocksize))
 
     def getHeights(self) -> np.ndarray:
         """Returns the heights in millimeters in each coordinate of the space."""
         return self._heights
 
+    def getUppermostItems(self) -> np.ndarray:
+        """Returns the counter of the uppermost item in each coordinate of the space, `0` represents the target."""
+        return self._uppermost_items
+
+    def getHeightPyramid(self) -> dict[int, np.ndarray]:
+        """
+        Returns the max-pooled height maps, its keys are the edge lengths of the blocks in the unit of the base area in
+        ascending order and its values store the maximum height in each block, accessed in (y, x) order like the heights. The
+        height maps must not be changed.
+        """
+        return dict(self._height_pyramid)
+
+    def max_height_in_footprint(self, x: int, y: int, delta_x: int, delta_y: int) -> int:
+        """
+        Returns the maximum height in millimeters below the footprint of an item whose FLB corner is located in `(x, y)`.
+
+        The footprint is read as a view of the stored heights, i.e., no array is allocated. If a height pyramid is
+        maintained, the blocks that are completely inside the footprint are read from the coarsest possible level and
+        only the remaining strips at the edges of the footprint are read from finer levels. Parts of the footprint that
+        exceed the base area are cropped like in `addItem`.
+
+        Parameters.
+        -----------
+        x: int
+            The x-coordinate of the FLB corner of the footprint.
+        y: int
+            The y-coordinate of the FLB corner of the footprint.
+        delta_x: int
+            The size of the footprint in x-direction.
+        delta_y: int
+            The size of the footprint in y-direction.
+
+        Returns.
+        --------
+        max_height: int
+            The maximum height below the footprint in millimeters, `0` if the footprint is outside of the base area.
+        """
+        end_x, end_y = min(x + delta_x, self._size[0]), min(y + delta_y, self._size[1])
+        if x >= end_x or y >= end_y:
+            return 0
+
+        return int(self.__maxHeightInArea(x, y, end_x, end_y, len(self._height_pyramid)))
+
+    def __maxHeightInArea(self, start_x: int, start_y: int, end_x: int, end_y: int, n_levels: int) -> int:
+        """Returns the maximum height in the given non-empty area from the `n_levels` finest levels of the pyramid."""
+        if n_levels == 0:
+            return self._heights[start_y:end_y, start_x:end_x].max()
+
+        blocksize = list(self._height_pyramid)[n_levels - 1]
+        first_x, first_y = -(-start_x // blocksize), -(-start_y // blocksize)
+        last_x, last_y = end_x // blocksize, end_y // blocksize
+        if first_x >= last_x or first_y >= last_y:
+            return self.__maxHeightInArea(start_x, start_y, end_x, end_y, n_levels - 1)
+
+        max_height = self._height_pyramid[blocksize][first_y:last_y, first_x:last_x].max()
+        # the strips in front of and behind the blocks with full length, and the strips left and right of the blocks
+        inner_start_x, inner_start_y = first_x * blocksize, first_y * blocksize
+        inner_end_x, inner_end_y = last_x * blocksize, last_y * blocksize
+        strips = (
+            (start_x, start_y, end_x, inner_start_y),
+            (start_x, inner_end_y, end_x, end_y),
+            (start_x, inner_start_y, inner_start_x, inner_end_y),
+            (inner_end_x, inner_start_y, end_x, inner_end_y),
+        )
+        for strip in strips:
+            if strip[0] < strip[2] and strip[1] < strip[3]:
+                max_height = max(max_height, self.__maxHeightInArea(*strip, n_levels - 1))
+
+        return max_height
+
+    def __resetHeightPyramid(self) -> None:
+        """Creates the height maps of the pyramid for an empty space."""
+        for blocksize in self._height_pyramid:
+            if blocksize <= 0 or self._size[0] % blocksize != 0 or self._size[1] % blocksize != 0:
+                raise ValueError(f"the block size {blocksize} of the height pyramid does not divide {self._size}")
+
+            shape = pooled_shape((self._size[1], self._size[0]), (blocksize, blocksize))
+            self._height_pyramid[blocksize] = np.zeros(shape, dtype=self._storage_mode.height_dtype)
+
+    def __getHeightPyramidBlocks(self, blocksize: int, start_x: int, start_y: int, end_x: int, end_y: int) -> tuple:
+        """Returns the slices of the blocks of the given level that overlap the given area."""
+        return (
+            slice(start_y // blocksize, -(-end_y // blocksize)),
+            slice(start_x // blocksize, -(-end_x // blocksize)),
+        )
+
+    def __getHeightPyramidState(self, start_x: int, start_y: int, end_x: int, end_y: int) -> list:
+        """Returns copies of the blocks of each level that overlap the given area, they are restored by `restore`."""
+        pyramid_state = []
+        for blocksize, maxima in self._height_pyramid.items():
+            area = self.__getHeightPyramidBlocks(blocksize, start_x, start_y, end_x, end_y)
+            pyramid_state.append((blocksize, area, maxima[area].copy()))
+
+        return pyramid_state
+
+    def __updateHeightPyramid(self, start_x: int, start_y: int, end_x: int, end_y: int, height: int) -> None:
+        """
+        Updates the blocks of each level of the pyramid that overlap the given area, which was set to the given height.
+        """
+        if not self._height_pyramid or start_x >= end_x or start_y >= end_y:
+            return
+
+        finest_blocksize, finest_maxima = next(iter(self._height_pyramid.items()))
+        finest_blocks = finest_maxima[self.__getHeightPyramidBlocks(finest_blocksize, start_x, start_y, end_x, end_y)]
+        if height >= finest_blocks.max():
+            # the area was not higher before, thus, the maximum of a block cannot decrease
+            for blocksize, maxima in self._height_pyramid.items():
+                blocks = maxima[self.__getHeightPyramidBlocks(blocksize, start_x, start_y, end_x, end_y)]
+                np.maximum(blocks, height, out=blocks)
+        else:
+            for blocksize, maxima in self._height_pyramid.items():
+                self._pool_top_surface(maxima, blocksize, start_x, start_y, end_x, end_y)
+
+    def direct_support_area(self, x: int, y: int, delta_x: int, delta_y: int, flbz: int) -> int:
+        """
+        Returns the area in square millimeters below the footprint of an item whose FLB corner is located in
+        `(x, y, flbz)` that directly supports the item, i.e., whose height is at least `flbz - HEIGHT_TOLERANCE_MM`.
+        Parts of the footprint that exceed the base area are cropped like in `addItem`.
+
+        Parameters.
+        -----------
+        x: int
+            The x-coordinate of the FLB corner of the footprint.
+        y: int
+            The y-coordinate of the FLB corner of the footprint.
+        delta_x: int
+            The size of the footprint in x-direction.
+        delta_y: int
+            The size of the footprint in y-direction.
+        flbz: int
+            The z-coordinate of the FLB corner of the item.
+
+        Returns.
+        --------
+        support_area: int
+            The directly supported area in square millimeters.
+        """
+        footprint_heights = self._heights[y : y + delta_y, x : x + delta_x]
+        return int(np.count_nonzero(footprint_heights >= flbz - HEIGHT_TOLERANCE_MM))
+
     def getItemsAboveHeightLevel(self, heightlevel: int) -> int:
         """
         Returns the amount of items that are located above the given height.
@@ -172,7 +553,7 @@ class Space3D:
         """
         n_items_about_height_level = 0
         for item in self.getPlacedItems():
-            if min(item.coordinates_z_range) > heightlevel:
+            if item.z_interval[0] > heightlevel:
                 n_items_about_height_level += 1
 
         return n_items_about_height_level
@@ -193,74 +574,91 @@ class Space3D:
         """
         max_target_height = 0
         for item in self.getPlacedItems():
-            item_z_location = max(item.coordinates_z_range)
+            item_z_location = item.z_interval[1]
             if item_z_location > max_target_height and item_z_location <= heightlevel:
                 max_target_height = item_z_location
 
         return max_target_height
 
-    def __identifyNeighbors(self, item: Cuboid, possibleneighbors: list[Cuboid]) -> None:
+    def __identifyNeighbors(self, item: Cuboid) -> None:
         """
         Identifies the neighbors of the given item and stores the neighbors of item in the object.
 
-        This method checks
-        (1) whether the item is located next to an item in the possible neighbors.
-        (2) The top of a possible neighbor item has to be in the height range of given item.
-        (3) If (2) is satisfied, we have to check whether the items below the possible neighbor are neighbors as well.
-        (4) If (2) is not satisfied, we know that neither the possible neighbor, nor the items below are neighbors.
+        This method checks for each placed item that is located near the given item according to the item grid
+        (1) whether the z-coordinates of both items overlap, and
+        (2) whether an edge of the item touches the opposite edge of the placed item.
+        All checks compare closed intervals of coordinates, i.e., no sets of coordinates are created.
 
         Parameters.
         -----------
         item: Cuboid
             The item for which the neighbors are identified.
-        possibleneighbors: list (of Cuboid objects)
-            Items that could be neighbors of item.
         """
         # the combination of the edges that have to be compared, formatted as [edge_of_item, edge_of_possible_neighbor]
         edges_to_compare = [(direction, opposite_direction(direction)) for direction in Direction]
+        item_edges = {edge_item: item.edge_intervals(edge_item) for edge_item, _ in edges_to_compare}
+        item_z_interval = item.z_interval
 
         identified_neighbors = {Direction.NORTH: [], Direction.EAST: [], Direction.SOUTH: [], Direction.WEST: []}
 
-        all_items_investigated = possibleneighbors == []
-
-        while not all_items_investigated:
-            neighbor_to_investigate = possibleneighbors.pop(0)
+        for possible_neighbor in self.__getItemsNearItem(item):
+            if not closed_intervals_overlap(item_z_interval, possible_neighbor.z_interval):
+                continue
 
             for edge_item, edge_possible_neighbor in edges_to_compare:
-                item_edge = item.coordinates_ranges_of_edge(edge_item)
-                possible_neighbor_edge = neighbor_to_investigate.coordinates_ranges_of_edge(edge_possible_neighbor)
-
-                x_intersection, y_intersection = (
-                    set.intersection(item_edge["x"], possible_neighbor_edge["x"]),
-                    set.intersection(item_edge["y"], possible_neighbor_edge["y"]),
+                item_edge_x, item_edge_y = item_edges[edge_item]
+                possible_neighbor_edge_x, possible_neighbor_edge_y = possible_neighbor.edge_intervals(
+                    edge_possible_neighbor
                 )
 
-                if len(x_intersection) and len(y_intersection):
-                    # neighbors in x-y-direction
-                    # make height check
-                    item_occupied_height = item.coordinates_z_range
-                    possible_neighbor_occupied_height = neighbor_to_investigate.coordinates_z_range
+                if closed_intervals_overlap(item_edge_x, possible_neighbor_edge_x) and closed_intervals_overlap(
+                    item_edge_y, possible_neighbor_edge_y
+                ):
+                    identified_neighbors[edge_item].append(possible_neighbor)
 
-                    z_intersection = set.intersection(item_occupied_height, possible_neighbor_occupied_height)
-                    height_check_successful = len(z_intersection) > 0
-
-                    if height_check_successful:
-                        identified_neighbors[edge_item].append(neighbor_to_investigate)
+        item.store_neighbors(identified_neighbors)
 
-                    # investigate items below when min height of item less than highest point of possible neighbor
-                    if min(item_occupied_height) < max(possible_neighbor_occupied_height):
-                        possibleneighbors += neighbor_to_investigate.items_below
-                        # remove duplicates
-                        possibleneighbors = list(set(possibleneighbors))
+    def __getItemsNearItem(self, item: Cuboid) -> list[Cuboid]:
+        """
+        Returns the placed items whose base area is located in a cell of the item grid that could contain a neighbor of
+        the given item. The items are returned in the order of their placement.
 
-            all_items_investigated = possibleneighbors == []
+        Parameters.
+        -----------
+        item: Cuboid
+            The item for which the items nearby are returned.
 
-        item.store_neighbors(identified_neighbors)
+        Returns.
+        --------
+        items_nearby: list
+            The placed items that are located near the given item.
+        """
+        # the edges of neighbors are at most two millimeters away from the edges of the item
+        (first_x, last_x), (first_y, last_y) = item.x_interval, item.y_interval
+        counters_nearby = set()
+        for cell in self.__getGridCells((first_x - 2, last_x + 2), (first_y - 2, last_y + 2)):
+            counters_nearby.update(self._item_grid.get(cell, []))
+
+        return [self._placed_items[counter] for counter in sorted(counters_nearby)]
+
+    def __addToItemGrid(self, item: Cuboid, counter: int) -> None:
+        """Adds the counter of the given item to all cells of the item grid that overlap the item's base area."""
+        for cell in self.__getGridCells(item.x_interval, item.y_interval):
+            self._item_grid.setdefault(cell, []).append(counter)
+
+    @staticmethod
+    def __getGridCells(x_interval: tuple[int, int], y_interval: tuple[int, int]) -> list[tuple[int, int]]:
+        """Returns the cells of the item grid that overlap the area given by the closed intervals."""
+        cells_x = range(x_interval[0] // ITEM_GRID_CELL_SIZE_MM, x_interval[1] // ITEM_GRID_CELL_SIZE_MM + 1)
+        cells_y = range(y_interval[0] // ITEM_GRID_CELL_SIZE_MM, y_interval[1] // ITEM_GRID_CELL_SIZE_MM + 1)
+        return [(cell_x, cell_y) for cell_x in cells_x for cell_y in cells_y]
 
     def getCornerPointsIn3D(self, itemdimension: tuple = (0, 0, 0)) -> list:
         """
         Determines the corner points of the placed items and returns them. The corner points are calculated like described in the algorithms `2D-CORNERS` and `3D-CORNERS` in (Martello et al, 2000).
 
+        The 2D corner points of each height level are cached until an item is added whose top is above this height level. The 3D corner points are cached for each item dimension until the next item is added.
+
         Parameters.
         -----------
         itemdimensions: tuple
@@ -271,27 +669,23 @@ class Space3D:
         three_dim_corner_points: list
             The corner points for an item that has the given dimension.
         """
-        placed_items = self.getPlacedItems()
-        if placed_items == []:
+        if self._placed_items == {}:
             return [(0, 0, 0)]
 
-        # create a list of height levels
-        target_height_levels = [0] + list(set([item.flb.z + item.height for item in placed_items]))
-        target_height_levels.sort()
+        cached_corner_points = self._corner_points_by_item_dimension.get(tuple(itemdimension))
+        if cached_corner_points is not None:
+            return list(cached_corner_points)
 
         three_dim_corner_points = []
         prev_2d_corner_points = []
 
-        for height_value in target_height_levels:
+        for height_value in self._height_levels:
             # stop search if first time a placement would exceed the maximum height
             if height_value + itemdimension[2] > MAXHEIGHT:
                 break
 
-            # create a subset of placed items that are located above the height level
-            I_k = [item for item in placed_items if ((item.flb.z + item.height) > height_value)]
-
             # search for corner points in 2D
-            two_dim_corner_points = self.__get2DCorners(I_k, itemdimension[0:2])
+            two_dim_corner_points = self.__get2DCorners(height_value, itemdimension[0:2])
 
             # check for true corner points
             for corner_point in two_dim_corner_points:
@@ -303,9 +697,58 @@ class Space3D:
             # update prev_2d_corner_points
             prev_2d_corner_points = two_dim_corner_points
 
-        return three_dim_corner_points
+        self._corner_points_by_item_dimension[tuple(itemdimension)] = three_dim_corner_points
+        return list(three_dim_corner_points)
+
+    def __updateCornerPointCache(self, item: Cuboid) -> None:
+        """Adds the height level of the top of the given item and removes the cached corner points that have changed."""
+        item_top = item.flb.z + item.height
+        if item_top not in self._height_levels:
+            bisect.insort(self._height_levels, item_top)
+
+        # the item belongs to the items above all height levels below its top, the cache is replaced instead of changed
+        # since an open snapshot keeps the previous one
+        self._2d_corners_by_height_level = {
+            height_value: corners
+            for height_value, corners in self._2d_corners_by_height_level.items()
+            if height_value >= item_top
+        }
+        self._corner_points_by_item_dimension = {}
+
+    def __get2DCorners(self, heightlevel: int, itemdimension: tuple) -> list:
+        """
+        Determines the corner points of the items above the given height level and returns the feasible corner points for an item with the given dimension.
+
+        Parameters.
+        -----------
+        heightlevel: int
+            The height level in millimeters.
+        itemdimension: 2-tuple
+            The length and width of an item for which the corner points are calculated.
+
+        Returns.
+        --------
+        two_dim_corner_points: list
+            The corner points for an item that has the given dimension.
+        """
+        if heightlevel not in self._2d_corners_by_height_level:
+            # create a subset of placed items that are located above the height level
+            I_k = [item for item in self._placed_items.values() if ((item.flb.z + item.height) > heightlevel)]
+            self._2d_corners_by_height_level[heightlevel] = self.__determine2DCorners(I_k), I_k != []
+
+        two_dim_corner_points, items_above_height_level = self._2d_corners_by_height_level[heightlevel]
+        if not items_above_height_level:
+            return list(two_dim_corner_points)
 
-    def __get2DCorners(self, placeditems: list[Cuboid], itemdimension: tuple) -> list:
+        # remove infeasible corner points
+        return [
+            corner_point
+            for corner_point in two_dim_corner_points
+            if (corner_point[0] + itemdimension[0] <= self._size[0])
+            and (corner_point[1] + itemdimension[1] <= self._size[1])
+        ]
+
+    def __determine2DCorners(self, placeditems: list[Cuboid]) -> list:
         """
         Determines the corner points of the placed items and returns them. The corner points are calculated like described in the algorithm `2D-CORNERS` in (Martello et al, 2000).
 
@@ -313,18 +756,16 @@ class Space3D:
         -----------
         placeditems: list
             List of items that are placed in the 2D area.
-        itemdimension: 2-tuple
-            The length and width of an item for which the corner points are calculated.
 
         Returns.
         --------
         two_dim_corner_points: list
-            The corner points for an item that has the given dimension.
+            The corner points of the placed items, including the ones that are infeasible for an item.
         """
 
         def __getEndpointYthenX(item: Cuboid) -> tuple:
             """Returns the endpoint of the item as (y, x)."""
-            delta_y, delta_x = item.array_representation.shape
+            delta_y, delta_x = item.footprint_shape
             return (item.flb.y + delta_y, item.flb.x + delta_x)
 
         if placeditems == []:
@@ -337,7 +778,7 @@ class Space3D:
         items_for_extreme_points: list[Cuboid] = []
         max_x_xalue = 0
         for item in placeditems:
-            value_endpoint_x = item.flb.x + item.array_representation.shape[1]
+            value_endpoint_x = item.flb.x + item.footprint_shape[1]
             if (value_endpoint_x) > max_x_xalue:
                 items_for_extreme_points.append(item)
                 max_x_xalue = value_endpoint_x
@@ -346,17 +787,17 @@ class Space3D:
         n_extreme_points = len(items_for_extreme_points)
         two_dim_corner_points = []
         first_candidate = items_for_extreme_points.pop(0)
-        previous_x = first_candidate.flb.x + first_candidate.array_representation.shape[1]
-        previous_y = first_candidate.flb.y + first_candidate.array_representation.shape[0]
+        previous_x = first_candidate.flb.x + first_candidate.footprint_shape[1]
+        previous_y = first_candidate.flb.y + first_candidate.footprint_shape[0]
         two_dim_corner_points.append((0, previous_y))
 
         if n_extreme_points > 1:
             last_candidate = items_for_extreme_points.pop()
-            last_x = last_candidate.flb.x + last_candidate.array_representation.shape[1]
+            last_x = last_candidate.flb.x + last_candidate.footprint_shape[1]
 
             for candidate in items_for_extreme_points:
-                candidate_x = candidate.flb.x + candidate.array_representation.shape[1]
-                candidate_y = candidate.flb.y + candidate.array_representation.shape[0]
+                candidate_x = candidate.flb.x + candidate.footprint_shape[1]
+                candidate_y = candidate.flb.y + candidate.footprint_shape[0]
 
                 two_dim_corner_points.append((previous_x, candidate_y))
                 previous_x = candidate_x
@@ -364,11 +805,4 @@ class Space3D:
             last_x = previous_x
         two_dim_corner_points.append((last_x, 0))
 
-        # remove infeasible corner points
-        for corner_point in two_dim_corner_points.copy():
-            if (corner_point[0] + itemdimension[0] > self._size[0]) or (
-                corner_point[1] + itemdimension[1] > self._size[1]
-            ):
-                two_dim_corner_points.remove(corner_point)
-
         return two_dim_corner_points
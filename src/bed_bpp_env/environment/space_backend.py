@@ -0,0 +1,74 @@
+"""
+This module contains the backends of the virtual, three-dimensional spaces and a factory that creates a space with a
+given backend.
+"""
+
+from enum import StrEnum
+
+from bed_bpp_env.environment.skyline_space_3d import SkylineSpace3D
+from bed_bpp_env.environment.space_3d import Space3D
+from bed_bpp_env.environment.storage_mode import StorageMode
+
+
+class SpaceBackend(StrEnum):
+    """Represents the data structures that store the top surface of a `Space3D`."""
+
+    DENSE = "dense"
+    SKYLINE = "skyline"
+
+
+def parse_height_pyramid(value: str) -> tuple[int, ...]:
+    """
+    Parses the value of the configuration `height_pyramid`.
+
+    Parameters.
+    -----------
+    value: str
+        Either `"none"` or the comma-separated edge lengths of the blocks in millimeters, e.g., `"10,50,100"`.
+
+    Returns.
+    --------
+    height_pyramid: tuple
+        The edge lengths of the blocks, empty if no height pyramid is maintained.
+    """
+    if value.strip().lower() in ("", "none"):
+        return ()
+
+    return tuple(int(blocksize) for blocksize in value.split(",") if blocksize.strip() != "")
+
+
+def create_space_3d(
+    basesize: tuple,
+    backend: str = SpaceBackend.DENSE,
+    storage_mode: str = StorageMode.DEFAULT,
+    height_pyramid: tuple = (),
+) -> Space3D:
+    """
+    Creates a virtual three-dimensional space that uses the given backend.
+
+    Parameters.
+    -----------
+    basesize: tuple
+        The space's size of the base area in x- and y-direction given in millimeters.
+    backend: str (default = "dense")
+        The backend, either `"dense"` or `"skyline"`.
+    storage_mode: str (default = "default")
+        The storage mode, either `"default"` or `"compact"`.
+    height_pyramid: tuple (default = ())
+        The edge lengths of the blocks of the max-pooled height maps that the space maintains. No pyramid is maintained
+        if empty.
+
+    Returns.
+    --------
+    space: Space3D
+        The space, a `SkylineSpace3D` if the backend is `"skyline"`.
+    """
+    backend = SpaceBackend(backend)
+
+    if backend is SpaceBackend.DENSE:
+        return Space3D(basesize, storage_mode, height_pyramid)
+
+    elif backend is SpaceBackend.SKYLINE:
+        return SkylineSpace3D(basesize, storage_mode, height_pyramid)
+
+    raise ValueError(f"space backend {backend} is not supported")
@@ -0,0 +1,116 @@
+"""
+This module converts sizes and coordinates between millimeters and the cells of the grid in which the environments
+simulate the palletization. A cell covers the spatial resolution in x- and y-direction, the heights are always given in
+millimeters. The rounding is conservative, i.e., a placement that is feasible in the grid is also feasible in
+millimeters: the base area of the target is rounded down and the footprints of the items are rounded up.
+"""
+
+FULL_RESOLUTION = (1, 1)
+"""The spatial resolution in which a cell covers one millimeter in x- and y-direction."""
+
+
+def parse_spatial_resolution(value: str) -> tuple[int, int]:
+    """
+    Parses the value of the configuration `spatial_resolution`.
+
+    Parameters.
+    -----------
+    value: str
+        The size of a cell in x- and y-direction in millimeters, e.g., `"(10,10)"`.
+
+    Returns.
+    --------
+    resolution: tuple
+        The size of a cell in x- and y-direction in millimeters.
+    """
+    resolution = tuple(int(cellsize) for cellsize in value.strip().strip("()").split(","))
+    if len(resolution) != 2 or min(resolution) < 1:
+        raise ValueError(f"the spatial resolution must be two positive integers, but is {value}")
+
+    return resolution
+
+
+def size_in_cells(size_mm: tuple, resolution: tuple) -> tuple[int, int]:
+    """
+    Returns the size of the base area of a target in cells, i.e., the cells that are completely inside the target.
+
+    Parameters.
+    -----------
+    size_mm: tuple
+        The size of the base area in x- and y-direction in millimeters.
+    resolution: tuple
+        The size of a cell in x- and y-direction in millimeters.
+
+    Returns.
+    --------
+    size: tuple
+        The size of the base area in x- and y-direction in cells.
+    """
+    return int(size_mm[0]) // resolution[0], int(size_mm[1]) // resolution[1]
+
+
+def length_in_cells(length_mm: int, cellsize: int) -> int:
+    """Returns the amount of cells that are needed to cover the given length in millimeters."""
+    return -(-int(length_mm) // cellsize)
+
+
+def footprint_in_cells(length_mm: int, width_mm: int, orientation: int, resolution: tuple) -> tuple[int, int]:
+    """
+    Returns the size of the footprint of an item in x- and y-direction in cells, which covers the footprint in
+    millimeters.
+
+    Parameters.
+    -----------
+    length_mm: int
+        The length of the item in millimeters.
+    width_mm: int
+        The width of the item in millimeters.
+    orientation: int
+        The orientation of the item, the length is parallel to the x-axis in orientation `0` and to the y-axis in
+        orientation `1`.
+    resolution: tuple
+        The size of a cell in x- and y-direction in millimeters.
+
+    Returns.
+    --------
+    footprint: tuple
+        The size of the footprint as `(delta_x, delta_y)` in cells.
+    """
+    if orientation == 1:
+        length_mm, width_mm = width_mm, length_mm
+
+    return length_in_cells(length_mm, resolution[0]), length_in_cells(width_mm, resolution[1])
+
+
+def coordinates_in_mm(x: int, y: int, resolution: tuple) -> tuple[int, int]:
+    """Returns the coordinates in millimeters of the front left corner of the cell `(x, y)`."""
+    return x * resolution[0], y * resolution[1]
+
+
+def height_pyramid_in_cells(blocksizes_mm: tuple, resolution: tuple) -> tuple[int, ...]:
+    """
+    Returns the edge lengths of the square blocks of a height pyramid in cells.
+
+    Parameters.
+    -----------
+    blocksizes_mm: tuple
+        The edge lengths of the blocks in millimeters, e.g., `(10, 50, 100)`.
+    resolution: tuple
+        The size of a cell in x- and y-direction in millimeters.
+
+    Returns.
+    --------
+    blocksizes: tuple
+        The edge lengths of the blocks in cells.
+    """
+    if not blocksizes_mm:
+        return ()
+    if resolution[0] != resolution[1]:
+        raise ValueError(f"a height pyramid requires square cells, but the spatial resolution is {resolution}")
+
+    cellsize = resolution[0]
+    for blocksize in blocksizes_mm:
+        if blocksize % cellsize != 0:
+            raise ValueError(f"the block size {blocksize} of the height pyramid is not a multiple of {cellsize} mm")
+
+    return tuple(blocksize // cellsize for blocksize in blocksizes_mm)
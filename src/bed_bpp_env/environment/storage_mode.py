@@ -0,0 +1,37 @@
+"""
+This module contains the storage modes of the virtual, three-dimensional spaces, which define the data types of their
+arrays.
+"""
+
+from enum import StrEnum
+
+import numpy as np
+
+
+class StorageMode(StrEnum):
+    """
+    Represents the data types that are used for storing height maps, uppermost items and support masks. In the compact
+    mode, heights and item counters are stored as `np.uint16`, which is sufficient since heights never exceed
+    `MAXHEIGHT` and the amount of items per order is far below 65535. Masks are stored with one byte per cell.
+    """
+
+    DEFAULT = "default"
+    """All arrays are stored as `int`."""
+
+    COMPACT = "compact"
+    """The arrays are stored with the smallest data types that fit their values."""
+
+    @property
+    def height_dtype(self) -> type:
+        """The data type of heights in millimeters."""
+        return np.uint16 if self is StorageMode.COMPACT else int
+
+    @property
+    def item_dtype(self) -> type:
+        """The data type of item counters."""
+        return np.uint16 if self is StorageMode.COMPACT else int
+
+    @property
+    def mask_dtype(self) -> type:
+        """The data type of masks whose values are either `0` or `1`."""
+        return np.uint8 if self is StorageMode.COMPACT else int
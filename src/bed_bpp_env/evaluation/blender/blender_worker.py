@@ -0,0 +1,198 @@
+"""
+Contains a handle of a Blender process that runs `scene_creation.py` as a worker. The worker keeps Blender and the
+template open and evaluates the packing plans that are sent to it, hence, the startup of Blender is paid only once.
+"""
+
+import json
+import secrets
+import socket
+import subprocess
+from pathlib import Path
+from time import perf_counter
+from typing import Optional
+
+from bed_bpp_env.data_model.order import Order
+from bed_bpp_env.data_model.packing_plan import PackingPlan
+from bed_bpp_env.evaluation.blender.stability_check import SCENE_CREATION_SCRIPT_PATH, TEMPLATE_BLEND_PATH
+
+WORKER_SHUTDOWN = "shutdown"
+"""The request that stops a worker, see `scene_creation.run_worker`."""
+
+
+def _build_worker_cmd(
+    blender_path: Path,
+    blender_template: Path,
+    scene_generation_script: Path,
+    address: str,
+    token: str,
+    run_blender_in_background: bool = True,
+) -> list[str]:
+    """
+    Builds the command to run `scene_creation.py` as a worker.
+
+    Args:
+        blender_path (Path): The path to Blender.
+        blender_template (Path): The path to the template .blend file.
+        scene_generation_script (Path): The path to the .py file that is used to generate the scene.
+        address (str): The address of the local socket as `host:port`.
+        token (str): The token that identifies the worker at the socket.
+        run_blender_in_background (bool): Indicates whether Blender is run in background. Defaults to `True`.
+
+    Returns:
+        list[str]: The command that starts the worker.
+    """
+    cmd = [
+        blender_path.as_posix(),
+        blender_template.as_posix(),
+        "--python",
+        scene_generation_script.as_posix(),
+        "--python-use-system-env",
+        "--",
+        "worker_address",
+        address,
+        "worker_token",
+        token,
+    ]
+
+    if run_blender_in_background:
+        cmd.insert(1, "-b")
+
+    return cmd
+
+
+class BlenderWorker:
+    """
+    Starts Blender with `scene_creation.py` in worker mode and waits until it is connected. The packing plans are sent
+    as JSON lines over a local socket, and the worker replies the z-movements of each packing plan.
+
+    A worker whose check timed out or failed is in an unknown state, thus, it should be closed with `kill=True`.
+
+    Args:
+        blender_path (Path): The path to Blender.
+        run_blender_in_background (bool): Indicates whether Blender is run in background. Defaults to `True`.
+        startup_timeout (float): The seconds Blender has to connect to the socket. Defaults to `120`.
+
+    Raises:
+        ConnectionError: If Blender exited or did not connect within the startup timeout.
+    """
+
+    def __init__(self, blender_path: Path, run_blender_in_background: bool = True, startup_timeout: float = 120.0):
+        token = secrets.token_hex(16)
+        with socket.create_server(("127.0.0.1", 0)) as server:
+            host, port = server.getsockname()[:2]
+            cmd = _build_worker_cmd(
+                blender_path=blender_path,
+                blender_template=TEMPLATE_BLEND_PATH,
+                scene_generation_script=SCENE_CREATION_SCRIPT_PATH,
+                address=f"{host}:{port}",
+                token=token,
+                run_blender_in_background=run_blender_in_background,
+            )
+            self._process = subprocess.Popen(cmd, shell=False)
+            try:
+                self._connection = self._accept(server, token, perf_counter() + startup_timeout)
+            except BaseException:
+                self._process.kill()
+                self._process.wait()
+                raise
+        self._stream = self._connection.makefile("rw")
+
+    def _accept(self, server: socket.socket, token: str, deadline: float) -> socket.socket:
+        """Returns the connection of the started Blender process, which is identified by the token."""
+        server.settimeout(1.0)
+        while perf_counter() < deadline:
+            if self._process.poll() is not None:
+                raise ConnectionError(f"Blender worker exited with code {self._process.returncode} before connecting")
+            try:
+                connection, _ = server.accept()
+            except TimeoutError:
+                continue
+
+            connection.settimeout(max(deadline - perf_counter(), 1.0))
+            try:
+                with connection.makefile("r") as stream:
+                    hello = json.loads(stream.readline())
+            except (OSError, ValueError):
+                # another process connected to the port, thus, the worker is still awaited
+                hello = None
+            if hello == {"token": token}:
+                return connection
+            connection.close()
+
+        raise ConnectionError("Blender worker did not connect within the startup timeout")
+
+    def check(
+        self,
+        order: Order,
+        packing_plan: PackingPlan,
+        colors: dict,
+        output_dir: Path,
+        render_scene: bool = False,
+        timeout: Optional[float] = None,
+    ) -> dict[str, float]:
+        """
+        Evaluates the stability of the given packing plan in the worker.
+
+        Args:
+            order (Order): The order for that the packing plan was generated.
+            packing_plan (PackingPlan): The packing plan that is evaluated.
+            colors (dict): The colors that are used for coloring the items.
+            output_dir (Path): The directory the output is written to.
+            render_scene (bool): Indicates whether the scene is rendered. Defaults to `False`.
+            timeout (Optional[float]): The seconds to wait for the reply. Defaults to `None`, i.e., no timeout.
+
+        Returns:
+            dict[str, float]: The mean and the maximum z-movements in meters.
+
+        Raises:
+            TimeoutError: If the worker did not reply within the timeout.
+            ConnectionError: If the worker exited.
+            RuntimeError: If the evaluation failed in the worker.
+        """
+        request = {
+            "order_number": packing_plan.id,
+            "target": order.properties.target,
+            "order_packing_plan": [action.to_dict() for action in packing_plan.actions],
+            "order_colors": colors,
+            "output_dir": output_dir.as_posix(),
+            "render": render_scene,
+        }
+        self._connection.settimeout(timeout)
+        self._stream.write(json.dumps(request) + "\n")
+        self._stream.flush()
+
+        reply = self._stream.readline()
+        if not reply:
+            raise ConnectionError(f"Blender worker exited with code {self._process.poll()}")
+        reply = json.loads(reply)
+        if "error" in reply:
+            raise RuntimeError(f"Blender worker failed: {reply['error']}")
+
+        return reply["movements"]
+
+    def close(self, kill: bool = False) -> None:
+        """
+        Stops the worker.
+
+        Args:
+            kill (bool): Indicates whether the Blender process is killed instead of being asked to shut down. Defaults
+                to `False`.
+        """
+        if not kill:
+            try:
+                self._connection.settimeout(10.0)
+                self._stream.write(json.dumps(WORKER_SHUTDOWN) + "\n")
+                self._stream.flush()
+                self._process.wait(timeout=30.0)
+            except (OSError, subprocess.TimeoutExpired):
+                kill = True
+
+        if kill:
+            self._process.kill()
+            self._process.wait()
+
+        try:
+            self._stream.close()
+        except OSError:
+            pass
+        self._connection.close()
@@ -30,3 +30,12 @@ def cleanup_objects(objects_to_keep: Optional[list[str]] = None) -> None:
             continue
         else:
             bpy.data.objects.remove(object)
+
+
+def cleanup_orphan_meshes() -> None:
+    """
+    Removes the meshes in `bpy.data.meshes` that are not used by any object, e.g., the meshes of removed objects.
+    """
+    for mesh in bpy.data.meshes:
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
@@ -5,9 +5,16 @@ Run in combination with
 `blender -b template.blend --python scene_creation.py -- packing-plan <packing-plan>.json data <ben-data>.json order_number 00100021 outputdirectory output/default/evaluation`
 
 The above mentioned command runs Blender in the background (-b) and opens the file `template.blend`, and runs the Python script `scene_creation.py`. The arguments following the Python file are needed by the script.
+
+With the arguments `worker_address <host>:<port> worker_token <token>`, the script runs as a worker instead: it keeps Blender and the template open and evaluates the packing plans that are sent to the local socket, see `run_worker`.
 """
 
+import json
 import logging
+import math
+import os
+import socket
+import statistics
 from pathlib import Path
 from time import perf_counter
 from typing import Optional
@@ -17,10 +24,12 @@ import bpy  # type: ignore
 from bed_bpp_env.data_model.action import Action
 from bed_bpp_env.evaluation.blender.bpy_helpers.objects import get_name, get_objects
 from bed_bpp_env.evaluation.blender.bpy_helpers.position import get_position
+from bed_bpp_env.evaluation.blender.blender_worker import WORKER_SHUTDOWN
 from bed_bpp_env.evaluation.blender.bpy_helpers.scene import get_render_range, get_scene, set_frame
-from bed_bpp_env.evaluation.blender.coloring import create_item_rgb_color_map
+from bed_bpp_env.evaluation.blender.coloring import create_item_rgb_color_map, load_custom_hex_color_map
 from bed_bpp_env.evaluation.blender.scene_setup import initialize_scene
 from bed_bpp_env.evaluation.blender.target import Target
+from bed_bpp_env.evaluation.stability_results import STABILITY_FILE_NAME, StabilityResultStore
 
 logger = logging.getLogger(__name__)
 
@@ -129,24 +138,160 @@ def retrieve_item_positions(
     return item_locations
 
 
+def calculate_z_movements(
+    item_positions: dict[str, dict[int, tuple[float, float, float]]], first_and_last_frame: tuple[int, int]
+) -> dict[str, float]:
+    """
+    Calculates the mean and the maximum movement of the items in z-direction between the first and the last frame.
+
+    Args:
+        item_positions (dict[str, dict[int, tuple[float, float, float]]]): The positions of the items in the frames.
+        first_and_last_frame (tuple[int, int]): The frame number of the first frame and of the final frame.
+
+    Returns:
+        dict[str, float]: The mean and the maximum z-movements in meters.
+    """
+    start_time = perf_counter()
+    first_frame, last_frame = first_and_last_frame
+    item_movements = []
+    z_movements = []
+    for frame_and_positions in item_positions.values():
+        start_position = frame_and_positions.get(first_frame)
+        end_position = frame_and_positions.get(last_frame)
+
+        item_movements.append(math.dist(start_position, end_position))
+        z_movements.append(abs(start_position[-1] - end_position[-1]))
+
+    logger.debug(f"z movements calculation took \t{round(1000 * (perf_counter() - start_time))} ms")
+    return {"mean_z-movements/m": statistics.fmean(z_movements), "max_z-movements/m": max(z_movements)}
+
+
+def render_frames(frames: tuple[int, int], order_number: str, output_dir: Path) -> None:
+    """
+    Renders the given frames and stores them in the directory `render` of the output directory.
+
+    Args:
+        frames (tuple[int, int]): The frames that are rendered.
+        order_number (str): The id of the order, which is the prefix of the file names.
+        output_dir (Path): The directory where the results are stored.
+    """
+    render_directory = output_dir.joinpath("render/")
+    render_directory.mkdir(exist_ok=True)
+    scene = get_scene()
+    for frame in frames:
+        set_frame(scene, frame)
+
+        render_filepath = render_directory.joinpath(f"{order_number}_frame_{frame}")
+        bpy.context.scene.render.filepath = str(render_filepath)
+        bpy.ops.render.render(write_still=True)
+
+
+def evaluate_packing_plan(
+    order_number: str,
+    target_name: str,
+    serialized_actions: list[dict],
+    order_colors: dict[str, str],
+    output_dir: Path,
+    render_scene: bool = False,
+) -> dict[str, float]:
+    """
+    Sets the scene up for the given packing plan, runs the rigid body simulation and returns the z-movements of the
+    items. The objects of a previous packing plan are removed, hence, a Blender process can evaluate many packing plans.
+
+    Args:
+        order_number (str): The id of the order.
+        target_name (str): The palletizing target of the order.
+        serialized_actions (list[dict]): The serialized actions of the packing plan.
+        order_colors (dict[str, str]): The colors for the visualization of the packing plan.
+        output_dir (Path): The directory where the results are stored.
+        render_scene (bool): Indicates whether the first and the last frame are rendered. Defaults to `False`.
+
+    Returns:
+        dict[str, float]: The mean and the maximum z-movements in meters.
+    """
+    first_and_last_frame = get_render_range()
+    # the rigid body simulation restarts in the first frame, as in a newly opened template
+    set_frame(get_scene(), first_and_last_frame[0])
+
+    prepare_blender_file(
+        target=Target(target_name),
+        actions=deserialize_actions(serialized_actions),
+        item_custom_color_name_map=order_colors,
+        objects_to_keep=FIXED_OBJECTS,
+    )
+
+    run_simulation()
+
+    # retrieve positions of items and compare them
+    item_positions = retrieve_item_positions(first_and_last_frame, FIXED_OBJECTS)
+    movement_values = calculate_z_movements(item_positions, first_and_last_frame)
+
+    if not output_dir.exists():
+        output_dir.mkdir(exist_ok=True)
+    if render_scene:
+        render_frames(first_and_last_frame, order_number, output_dir)
+
+    return movement_values
+
+
+def run_worker(address: str, token: str) -> None:
+    """
+    Evaluates packing plans until the shutdown request is received. The worker connects to the given address of a
+    local socket, sends the token, and then reads one request per line in JSON. For each request, it replies the
+    z-movements or the error in a line in JSON.
+
+    Args:
+        address (str): The address of the socket as `host:port`.
+        token (str): The token that identifies the worker at the socket.
+    """
+    host, port = address.rsplit(":", maxsplit=1)
+    with socket.create_connection((host, int(port))) as connection, connection.makefile("rw") as stream:
+        stream.write(json.dumps({"token": token}) + "\n")
+        stream.flush()
+
+        for line in stream:
+            request = json.loads(line)
+            if request == WORKER_SHUTDOWN:
+                break
+
+            start_time = perf_counter()
+            try:
+                movements = evaluate_packing_plan(
+                    order_number=request["order_number"],
+                    target_name=request["target"],
+                    serialized_actions=request["order_packing_plan"],
+                    order_colors=request["order_colors"],
+                    output_dir=Path(request["output_dir"]),
+                    render_scene=request.get("render", False),
+                )
+                reply = {"order_number": request["order_number"], "movements": movements}
+            except Exception as exception:
+                logger.exception(exception)
+                reply = {"order_number": request.get("order_number"), "error": repr(exception)}
+
+            stream.write(json.dumps(reply) + "\n")
+            stream.flush()
+            logger.debug(f"worker evaluated the packing plan in {round(perf_counter() - start_time, 3)} seconds")
+
+
 # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
 if __name__ == "__main__":
     import ast
-    import math
-    import statistics
     import sys
-    import time
-
-    from bed_bpp_env.evaluation.blender.coloring import load_custom_hex_color_map
 
-    blenderMainStart = time.time()
+    blenderMainStart = perf_counter()
     # get all arguments after "--"
     argsCommandLine = sys.argv[sys.argv.index("--") + 1 :]
     commands = {}
     for i in range(int(len(argsCommandLine) / 2)):
         commands[argsCommandLine[2 * i]] = argsCommandLine[2 * i + 1]
 
+    if "worker_address" in commands:
+        # keep Blender and the template open and evaluate the packing plans that are sent to the socket
+        run_worker(commands["worker_address"], commands.get("worker_token", ""))
+        sys.exit(0)
+
     # check whether the needed arguments were given
     for required_args in ["order_number", "target", "order_colors", "order_packing_plan", "output_dir"]:
         if required_args not in commands:
@@ -165,56 +310,28 @@ if __name__ == "__main__":
     """This bool indicates whether to render the scene and store it on disk."""
     OUTPUT_DIR = Path(commands.get("output_dir"))
     """The directore where the results are stored (Path)."""
+    RESULT_FILE = commands.get("result_file")
+    """The file to which the z-movements are written as JSON instead of appending them to `stability.txt` (str)."""
 
     # # #
-    action_plan = deserialize_actions(ORDER_PP)
-    target = Target(TARGET)
-
-    prepare_blender_file(
-        target=target, actions=action_plan, item_custom_color_name_map=ORDER_COLORS, objects_to_keep=FIXED_OBJECTS
+    movementValues = evaluate_packing_plan(
+        order_number=ORDER_NUMBER,
+        target_name=TARGET,
+        serialized_actions=ORDER_PP,
+        order_colors=ORDER_COLORS,
+        output_dir=OUTPUT_DIR,
+        render_scene=RENDER_SCENE,
     )
 
-    run_simulation()
-
-    first_and_last_frame = get_render_range()
-
-    # retrieve positions of items
-    item_positions = retrieve_item_positions(first_and_last_frame, FIXED_OBJECTS)
-
-    # compare the previously stored item locations
-    startTime = time.time()
-    first_frame, last_frame = first_and_last_frame
-    itemMovements = []
-    zMovements = []
-    for itemName, frameAndPositions in item_positions.items():
-        startPos = frameAndPositions.get(first_frame)
-        endPos = frameAndPositions.get(last_frame)
-
-        itemDelta = math.dist(startPos, endPos)
-        itemMovements.append(itemDelta)
-
-        zMovements.append(abs(startPos[-1] - endPos[-1]))
-
-    logger.debug(f"z movements calculation took \t{round(1000 * (time.time() - startTime))} ms")
     # append the KPIs to a file
-    movementValues = {"mean_z-movements/m": statistics.fmean(zMovements), "max_z-movements/m": max(zMovements)}
-    evalFile = OUTPUT_DIR.joinpath("stability.txt")
-
-    if not OUTPUT_DIR.exists():
-        OUTPUT_DIR.mkdir(exist_ok=True)
-    with open(evalFile, "a") as file:
-        file.write(f"{ORDER_NUMBER}:{str(movementValues)}\n")
-
-    # render and store the currently set frames
-    if RENDER_SCENE:
-        RENDERDIRECTORY = OUTPUT_DIR.joinpath("render/")
-        RENDERDIRECTORY.mkdir(exist_ok=True)
-        scene = get_scene()
-        for frame in first_and_last_frame:
-            set_frame(scene, frame)
-
-            renderFilepath = RENDERDIRECTORY.joinpath(f"{ORDER_NUMBER}_frame_{frame}")
-            bpy.context.scene.render.filepath = str(renderFilepath)
-            bpy.ops.render.render(write_still=True)
-
-    logger.debug(f"scene_creation.py finished after {round(time.time() - blenderMainStart, 3)} seconds")
+    if RESULT_FILE is None:
+        StabilityResultStore(OUTPUT_DIR.joinpath(STABILITY_FILE_NAME)).append(ORDER_NUMBER, movementValues)
+    else:
+        # the file is replaced atomically, hence, a crashed run never leaves a partial result
+        resultFile = Path(RESULT_FILE)
+        temporaryFile = resultFile.with_suffix(".tmp")
+        with open(temporaryFile, "w") as file:
+            json.dump(movementValues, file)
+        os.replace(temporaryFile, resultFile)
+
+    logger.debug(f"scene_creation.py finished after {round(perf_counter() - blenderMainStart, 3)} seconds")
@@ -5,7 +5,11 @@ from typing import Optional
 
 from bed_bpp_env.data_model.action import Action
 from bed_bpp_env.data_model.type_alias import RGBColor
-from bed_bpp_env.evaluation.blender.bpy_helpers.cleanup import cleanup_materials, cleanup_objects
+from bed_bpp_env.evaluation.blender.bpy_helpers.cleanup import (
+    cleanup_materials,
+    cleanup_objects,
+    cleanup_orphan_meshes,
+)
 from bed_bpp_env.evaluation.blender.bpy_helpers.populators.box import place_box
 from bed_bpp_env.evaluation.blender.bpy_helpers.populators.camera import place_camera
 from bed_bpp_env.evaluation.blender.bpy_helpers.populators.floor import place_floor
@@ -27,6 +31,8 @@ def _cleanup_scene(objects_to_keep: Optional[list[str]] = None) -> None:
     """
     cleanup_materials()
     cleanup_objects(objects_to_keep)
+    # the meshes of the removed objects would accumulate in a Blender process that evaluates many packing plans
+    cleanup_orphan_meshes()
 
 
 def _carry_out_actions(actions: list[Action], item_rgb_color_map: dict[str, RGBColor]) -> None:
@@ -2,6 +2,7 @@
 
 from pathlib import Path
 import subprocess
+from typing import Optional
 
 from bed_bpp_env.data_model.order import Order
 from bed_bpp_env.data_model.packing_plan import PackingPlan
@@ -23,6 +24,7 @@ def _build_stability_check_cmd(
     colors: dict,
     run_blender_in_background: bool = True,
     render_scene: bool = False,
+    result_file: Optional[Path] = None,
 ) -> list[str]:
     """
     Builds the command to run a stability check with Blender.
@@ -37,6 +39,8 @@ def _build_stability_check_cmd(
         colors (dict): The colors that are used for coloring the items.
         run_blender_in_background (bool): Indicates whether Blender is run in background. Defaults to `True`.
         render_scene (bool): Indicates whether the scene is rendered. Defaults to `False`.
+        result_file (Optional[Path]): The file to which the z-movements are written as JSON. Defaults to `None`,
+            i.e., they are appended to `stability.txt` in the output directory.
 
     Returns:
         list[str]: The command that is used to run the Blender stability check.
@@ -67,6 +71,9 @@ def _build_stability_check_cmd(
         str(colors),
     ]
 
+    if result_file is not None:
+        cmd += ["result_file", result_file.as_posix()]
+
     if run_blender_in_background:
         cmd.insert(1, "-b")
 
@@ -81,7 +88,9 @@ def run_blender_stability_check_in_subprocess(
     colors: dict,
     run_blender_in_background: bool = True,
     render_scene: bool = False,
-) -> None:
+    result_file: Optional[Path] = None,
+    timeout: Optional[float] = None,
+) -> int:
     """
     Runs a Blender stability check in a subprocess.
 
@@ -93,6 +102,15 @@ def run_blender_stability_check_in_subprocess(
         colors (dict): The colors that are used for coloring the items.
         run_blender_in_background (bool): Indicates whether Blender is run in background. Defaults to `True`.
         render_scene (bool): Indicates whether the scene is rendered. Defaults to `False`.
+        result_file (Optional[Path]): The file to which the z-movements are written as JSON. Defaults to `None`,
+            i.e., they are appended to `stability.txt` in the output directory.
+        timeout (Optional[float]): The seconds after which Blender is killed. Defaults to `None`, i.e., no timeout.
+
+    Returns:
+        int: The return code of Blender.
+
+    Raises:
+        subprocess.TimeoutExpired: If Blender did not finish within the timeout.
     """
     cmd = _build_stability_check_cmd(
         blender_path=blender_path,
@@ -104,5 +122,6 @@ def run_blender_stability_check_in_subprocess(
         colors=colors,
         run_blender_in_background=run_blender_in_background,
         render_scene=render_scene,
+        result_file=result_file,
     )
-    subprocess.run(cmd, shell=False)
+    return subprocess.run(cmd, shell=False, timeout=timeout).returncode
@@ -0,0 +1,216 @@
+"""
+Contains a pool that runs several Blender stability checks concurrently. Each run writes its z-movements to a result
+file of its own, which the pool reads, hence, the Blender processes never append to the same file. Alternatively, each
+thread of the pool keeps a Blender worker that evaluates many packing plans.
+"""
+
+import itertools
+import json
+import logging
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Optional
+
+from bed_bpp_env.data_model.order import Order
+from bed_bpp_env.data_model.packing_plan import PackingPlan
+from bed_bpp_env.evaluation.blender.blender_worker import BlenderWorker
+from bed_bpp_env.evaluation.blender.stability_check import run_blender_stability_check_in_subprocess
+from bed_bpp_env.evaluation.stability_results import STABILITY_FILE_NAME, StabilityResultStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StabilityCheckResult:
+    """The result of the Blender stability check of a packing plan."""
+
+    order_id: str
+    """The identifier of the order of the checked packing plan."""
+    movements: Optional[dict[str, float]]
+    """The mean and the maximum z-movements of the items in meters, `None` if every attempt failed."""
+    attempts: int
+    """The amount of times the packing plan was sent to Blender."""
+    duration: float
+    """The seconds from the start of the first attempt until the result was available."""
+    error: Optional[str] = None
+    """The reason why the last attempt failed."""
+
+
+def append_stability_result(output_dir: Path, result: StabilityCheckResult) -> None:
+    """
+    Appends the z-movements of the given result to the stability file in the output directory, in the format that is
+    written by `scene_creation.py`. Use `StabilityResultStore.append` instead if the results are also looked up.
+
+    Args:
+        output_dir (Path): The directory that contains the stability file.
+        result (StabilityCheckResult): The successful result of a stability check.
+    """
+    StabilityResultStore(output_dir / STABILITY_FILE_NAME).append(result.order_id, result.movements)
+
+
+class StabilityCheckPool:
+    """
+    Runs up to `n_workers` Blender stability checks at the same time. The threads of the pool only wait for the Blender
+    processes, hence, the calling thread can evaluate the KPIs of finished checks in the meantime.
+
+    A Blender process that exceeds the timeout is killed. A check that timed out, crashed, or did not write a result is
+    started again until the maximum amount of attempts is reached.
+
+    With `persistent_workers`, each thread starts a `BlenderWorker` once and sends all its packing plans to it, thus,
+    Blender and the template are not loaded for each packing plan. A worker whose check failed is killed and replaced.
+
+    Args:
+        blender_path (Path): The path to Blender.
+        output_dir (Path): The directory the output is written to.
+        n_workers (int): The maximum amount of Blender processes that run at the same time. Defaults to `1`.
+        timeout (Optional[float]): The seconds after which a Blender process is killed. Defaults to `None`, i.e., no
+            timeout.
+        max_attempts (int): The maximum amount of times Blender is started for a packing plan. Defaults to `2`.
+        run_blender_in_background (bool): Indicates whether Blender is run in background. Defaults to `True`.
+        render_scene (bool): Indicates whether the scene is rendered. Defaults to `False`.
+        persistent_workers (bool): Indicates whether the packing plans are sent to long-running Blender workers.
+            Defaults to `False`.
+    """
+
+    def __init__(
+        self,
+        blender_path: Path,
+        output_dir: Path,
+        n_workers: int = 1,
+        timeout: Optional[float] = None,
+        max_attempts: int = 2,
+        run_blender_in_background: bool = True,
+        render_scene: bool = False,
+        persistent_workers: bool = False,
+    ) -> None:
+        if n_workers < 1 or max_attempts < 1:
+            raise ValueError("the amount of workers and the maximum amount of attempts must be positive")
+
+        self._blender_path = blender_path
+        self._output_dir = output_dir
+        self._results_dir = output_dir / "stability_results"
+        self._timeout = timeout
+        self._max_attempts = max_attempts
+        self._run_blender_in_background = run_blender_in_background
+        self._render_scene = render_scene
+        self._persistent_workers = persistent_workers
+        self._local = threading.local()
+        self._workers: list[BlenderWorker] = []
+        self._workers_lock = threading.Lock()
+        self._counter = itertools.count()
+        self._executor = ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="blender")
+
+    def __enter__(self) -> "StabilityCheckPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def submit(self, order: Order, packing_plan: PackingPlan, colors: dict) -> Future:
+        """
+        Schedules the stability check of the given packing plan.
+
+        Args:
+            order (Order): The order for that the packing plan was generated.
+            packing_plan (PackingPlan): The packing plan that is checked.
+            colors (dict): The colors that are used for coloring the items.
+
+        Returns:
+            Future: The future of the `StabilityCheckResult`.
+        """
+        self._results_dir.mkdir(parents=True, exist_ok=True)
+        result_file = self._results_dir / f"{next(self._counter)}_{packing_plan.id}.json"
+        return self._executor.submit(self._check, order, packing_plan, colors, result_file)
+
+    def close(self) -> None:
+        """Waits for the scheduled checks and shuts the pool and its workers down."""
+        self._executor.shutdown(wait=True)
+        with self._workers_lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.close()
+
+    def _check(self, order: Order, packing_plan: PackingPlan, colors: dict, result_file: Path) -> StabilityCheckResult:
+        """Runs the stability check of a packing plan until it succeeds or the maximum amount of attempts is reached."""
+        start_time = perf_counter()
+
+        for attempt in range(1, self._max_attempts + 1):
+            if self._persistent_workers:
+                movements, error = self._attempt_in_worker(order, packing_plan, colors)
+            else:
+                movements, error = self._attempt_in_subprocess(order, packing_plan, colors, result_file)
+            if movements is not None:
+                return StabilityCheckResult(packing_plan.id, movements, attempt, perf_counter() - start_time)
+
+            logger.warning(f"stability check of order {packing_plan.id} failed in attempt {attempt}: {error}")
+
+        return StabilityCheckResult(packing_plan.id, None, self._max_attempts, perf_counter() - start_time, error)
+
+    def _attempt_in_subprocess(
+        self, order: Order, packing_plan: PackingPlan, colors: dict, result_file: Path
+    ) -> tuple[Optional[dict[str, float]], Optional[str]]:
+        """Runs a new Blender process and returns either the z-movements or the reason why the attempt failed."""
+        result_file.unlink(missing_ok=True)
+        try:
+            returncode = run_blender_stability_check_in_subprocess(
+                blender_path=self._blender_path,
+                order=order,
+                packing_plan=packing_plan,
+                output_dir=self._output_dir,
+                colors=colors,
+                run_blender_in_background=self._run_blender_in_background,
+                render_scene=self._render_scene,
+                result_file=result_file,
+                timeout=self._timeout,
+            )
+        except subprocess.TimeoutExpired:
+            return None, f"Blender timed out after {self._timeout} seconds"
+
+        if not result_file.exists():
+            return None, f"Blender exited with code {returncode} without a result"
+        with open(result_file) as file:
+            movements = json.load(file)
+        result_file.unlink()
+        return movements, None
+
+    def _attempt_in_worker(
+        self, order: Order, packing_plan: PackingPlan, colors: dict
+    ) -> tuple[Optional[dict[str, float]], Optional[str]]:
+        """
+        Sends the packing plan to the worker of the current thread, which is started if necessary, and returns either
+        the z-movements or the reason why the attempt failed.
+        """
+        worker: Optional[BlenderWorker] = getattr(self._local, "worker", None)
+        try:
+            if worker is None:
+                worker = BlenderWorker(self._blender_path, self._run_blender_in_background)
+                self._local.worker = worker
+                with self._workers_lock:
+                    self._workers.append(worker)
+
+            movements = worker.check(
+                order=order,
+                packing_plan=packing_plan,
+                colors=colors,
+                output_dir=self._output_dir,
+                render_scene=self._render_scene,
+                timeout=self._timeout,
+            )
+            return movements, None
+        except TimeoutError:
+            error = f"Blender timed out after {self._timeout} seconds"
+        except (OSError, RuntimeError, ValueError) as exception:
+            error = str(exception)
+
+        # the state of the worker is unknown, hence, it is replaced for the next attempt
+        if worker is not None:
+            worker.close(kill=True)
+            with self._workers_lock:
+                if worker in self._workers:
+                    self._workers.remove(worker)
+        self._local.worker = None
+        return None, error
@@ -2,13 +2,14 @@
 This module gathers the KPIs in a single class.
 """
 
+import math
 from pathlib import Path
-import statistics
 
 import numpy as np
 import yaml
 
 from bed_bpp_env.data_model.order import Order
+from bed_bpp_env.environment.cuboid import Cuboid
 from bed_bpp_env.environment.space_3d import Space3D
 
 FILE_KPI_DEFINITION = Path(__file__).parent.resolve().joinpath("kpi_definition.yaml")
@@ -20,12 +21,19 @@ class KPIs:
     """
     Collects the KPIs in a single class.
 
+    The KPIs are maintained incrementally: each call of `update` only considers the items that were placed since the
+    previous call, whose support area is accumulated with Welford's algorithm. If items were removed from the target
+    space in the meantime without restoring the state with `setState`, the accumulators are rebuilt from all placed
+    items.
+
     Attributes.
     -----------
     __DataSources: dict
         Contains the targetspace and the order that is evaluated.
     __Values: dict
         'The values of the defined KPIs.
+    __Accumulators: dict
+        The running statistics of the placed items from which the values are derived.
     """
 
     def __init__(self) -> None:
@@ -41,33 +49,70 @@ class KPIs:
         }
         """The values of the defined KPIs."""
 
+        self.__Accumulators = self.__initialAccumulators()
+        """The running statistics of the placed items from which the values are derived."""
+
     def __str__(self) -> str:
         return str(self.__Values)
 
+    @staticmethod
+    def __initialAccumulators() -> dict:
+        return {
+            "n_items": 0,
+            "last": None,
+            "current": None,
+            "mean": 0.0,
+            "m2": 0.0,
+            "min": None,
+            "volume": 0,
+            "max_height": 0,
+        }
+
+    def __accumulate(self, item: Cuboid) -> None:
+        """Adds the given item to the running statistics."""
+        acc = self.__Accumulators
+        percentage = item.percentage_direct_support_surface
+
+        acc["n_items"] += 1
+        delta = percentage - acc["mean"]
+        acc["mean"] += delta / acc["n_items"]
+        acc["m2"] += delta * (percentage - acc["mean"])
+        acc["min"] = percentage if acc["min"] is None else min(acc["min"], percentage)
+        acc["volume"] += item.volume / 1000.0
+        acc["max_height"] = max(acc["max_height"], item.flb.z + item.height)
+        acc["current"] = percentage
+        acc["last"] = item
+
     def update(self) -> dict:
         targetSpace: Space3D = self.__DataSources.get("target")
         currentOrder: Order = self.__DataSources.get("order")
 
-        palHeightMap = targetSpace.getHeights()
-
-        placedItems = targetSpace.getPlacedItems()
-        percentage_supporting_areas = [item.percentage_direct_support_surface for item in placedItems]
-
-        itemVolumeOnPallet = sum([item.volume / 1000.0 for item in placedItems])
-
-        self.__Values["unpalletized_items"] = len(currentOrder.item_sequence) - len(placedItems)
-        self.__Values["maximum_palletizing_height/mm"] = np.amax(palHeightMap)
-        self.__Values["vol_items/cm^3"] = itemVolumeOnPallet
+        nPlacedItems = targetSpace.getNumberOfPlacedItems()
+        nAccumulated = self.__Accumulators["n_items"]
+        if nAccumulated > 0 and (
+            nPlacedItems < nAccumulated or targetSpace.getPlacedItem(nAccumulated) is not self.__Accumulators["last"]
+        ):
+            # items were removed, hence, the statistics are rebuilt
+            self.__Accumulators = self.__initialAccumulators()
+        for counter in range(self.__Accumulators["n_items"] + 1, nPlacedItems + 1):
+            self.__accumulate(targetSpace.getPlacedItem(counter))
+
+        acc = self.__Accumulators
+        # the values keep the numpy scalar types of the height map, which are rounded differently than Python floats
+        maxHeight = np.dtype(targetSpace.getStorageMode().height_dtype).type(acc["max_height"])
+        self.__Values["unpalletized_items"] = len(currentOrder.item_sequence) - nPlacedItems
+        self.__Values["maximum_palletizing_height/mm"] = maxHeight
+        self.__Values["vol_items/cm^3"] = acc["volume"]
         self.__Values["packing_stability"] = {
             "support_area": {
-                "current": percentage_supporting_areas[-1],
-                "min": min(percentage_supporting_areas),
-                "mean": statistics.fmean(percentage_supporting_areas),
-                "stdev": statistics.stdev(percentage_supporting_areas) if len(percentage_supporting_areas) > 1 else 0,
+                "current": acc["current"],
+                "min": acc["min"],
+                "mean": acc["mean"],
+                "stdev": math.sqrt(acc["m2"] / (acc["n_items"] - 1)) if acc["n_items"] > 1 else 0,
             }
         }
-        targetBaseArea = palHeightMap.shape[0] * palHeightMap.shape[1]
-        volumeCircumscribedCuboidCM3 = (1e-3) * targetBaseArea * np.amax(palHeightMap)
+        targetBaseArea = targetSpace.getSize()[0] * targetSpace.getSize()[1]
+        volumeCircumscribedCuboidCM3 = (1e-3) * targetBaseArea * maxHeight
         self.__Values["volume_utilization"] = self.__Values["vol_items/cm^3"] / volumeCircumscribedCuboidCM3
 
         return self.__Values.copy()
@@ -93,6 +138,25 @@ class KPIs:
     def reset(self, targetspace: Space3D, order: Order) -> None:
         self.__DataSources["target"] = targetspace
         self.__DataSources["order"] = order
+        self.__Accumulators = self.__initialAccumulators()
+
+    def getValues(self) -> dict:
+        """Returns a copy of the values of the KPIs, which can be restored with `setValues`."""
+        return self.__Values.copy()
+
+    def setValues(self, values: dict) -> None:
+        """Sets the values of the KPIs to the given values, which were returned by `getValues`."""
+        self.__Values = values.copy()
+
+    def getState(self) -> tuple:
+        """Returns a copy of the values and of the running statistics, which can be restored with `setState`."""
+        return self.__Values.copy(), self.__Accumulators.copy()
+
+    def setState(self, state: tuple) -> None:
+        """Sets the values and the running statistics to the given state, which was returned by `getState`."""
+        values, accumulators = state
+        self.__Values = values.copy()
+        self.__Accumulators = accumulators.copy()
 
     def getVolumeUtilization(self) -> float:
         return self.__Values["volume_utilization"]
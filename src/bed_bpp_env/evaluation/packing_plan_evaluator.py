@@ -2,10 +2,9 @@
 This module contains a packing plan evaluator class.
 """
 
-import ast
 import logging
 import shutil
-from typing import Literal
+from typing import Literal, Optional
 
 import pandas as pd
 
@@ -15,6 +14,14 @@ from bed_bpp_env.environment.cuboid import Cuboid
 from bed_bpp_env.environment.space_3d import Space3D
 from bed_bpp_env.evaluation import EVALOUTPUTDIR
 from bed_bpp_env.evaluation.kpis import FILE_KPI_DEFINITION, KPI_DEFINITION, KPIs
+from bed_bpp_env.evaluation.result_cache import STABILITY_SOURCE_SIMULATION, EvaluationResultCache
+from bed_bpp_env.evaluation.stability_results import STABILITY_FILE_NAME, StabilityResultStore
+from bed_bpp_env.evaluation.static_stability import (
+    STABLE_MARGIN,
+    UNSTABLE_MARGIN,
+    StaticStability,
+    check_static_stability,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +29,8 @@ EVALUATION_HEIGHT = 1000 * KPI_DEFINITION["eval_score_pal_ratio"].get("threshold
 """The threshold of the height for which items count as unpalletized in the score evaluation in millimeters."""
 STABILITY_Z_THRESHOLD = KPI_DEFINITION["stability"].get("threshold")
 """Indicates at which value of the z-movements in meters of any item the target counts as unstable."""
+STABILITY_SOURCE_STATIC = f"static:{STABLE_MARGIN}:{UNSTABLE_MARGIN}"
+"""The source of the stability verdict of KPIs whose pile is clear-cut according to the static stability check."""
 
 
 class PackingPlanEvaluator:
@@ -30,6 +39,8 @@ class PackingPlanEvaluator:
 
     Attributes.
     -----------
+    _cached_kpis: dict
+        The cached values of the KPIs that were looked up with `lookupCachedKPIs` before the evaluation.
     _evaluation_kpis: list
         The values of the KPIs for each order that are stored in a file.
     _kpis: KPIs
@@ -40,11 +51,23 @@ class PackingPlanEvaluator:
         The ID of the order for which the currently investigated packing plan was created.
     _packing_plan: list
         The packing plan that is currently investigated. It is a list of actions.
+    _result_cache: EvaluationResultCache
+        The cache of the values of the KPIs of packing plans that have been evaluated before, if any.
+    _stability: dict
+        The memoized stability of the evaluated orders.
+    _stability_results: StabilityResultStore
+        The z-movements of the Blender stability checks.
+    _static_stability: dict
+        The stability of the orders whose piles are clear-cut according to the static stability check.
     _target_space: Space3D
         The target that represents the rebuilt packing plan.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        result_cache: Optional[EvaluationResultCache] = None,
+        stability_results: Optional[StabilityResultStore] = None,
+    ) -> None:
         self._evaluation_kpis = []
         """The values of the KPIs for each order that are stored in a file."""
         self._order_id = ""
@@ -57,12 +80,55 @@ class PackingPlanEvaluator:
         """An instance of this class is responsible for the calculation of the KPIs. It is coupled with the target space."""
         self._target_space = Space3D()
         """The target that represents the rebuilt packing plan."""
+        self._static_stability: dict[str, StaticStability] = {}
+        """The stability of the orders whose piles are clear-cut according to the static stability check."""
+        self._precheck_space = Space3D()
+        """The target in which the packing plans are rebuilt for the static stability check."""
+        self._result_cache = result_cache
+        """The cache of the values of the KPIs of packing plans that have been evaluated before, if any."""
+        if stability_results is None:
+            stability_results = StabilityResultStore(EVALOUTPUTDIR / STABILITY_FILE_NAME)
+        self._stability_results = stability_results
+        """The z-movements of the Blender stability checks."""
+        self._stability: dict[str, int] = {}
+        """The memoized stability of the evaluated orders."""
+        self._cached_kpis: dict[str, Optional[dict]] = {}
+        """The cached values of the KPIs that were looked up with `lookupCachedKPIs` before the evaluation."""
+
+    def __stabilitySource(self, order_id: str) -> str:
+        """Returns whether the stability verdict of the given order stems from the static check or from Blender."""
+        return STABILITY_SOURCE_STATIC if order_id in self._static_stability else STABILITY_SOURCE_SIMULATION
+
+    def lookupCachedKPIs(self, packing_plan: PackingPlan, order: Order) -> Optional[dict]:
+        """
+        This method looks up the cached values of the KPIs of a packing plan, e.g., to decide whether its pile has to be
+        simulated in Blender. Call `precheckStability` before, if the static stability check is used. The outcome is
+        reused by the following call of `evaluate` for the packing plan.
+
+        Parameters.
+        -----------
+        packing_plan: PackingPlan
+            The packing plan whose KPIs are looked up.
+        order: Order
+            The order of the packing plan.
+
+        Returns.
+        --------
+        cached_kpis: Optional[dict]
+            The cached values of the KPIs, or `None` if there is no cache or the KPIs are not cached.
+        """
+        if self._result_cache is None:
+            return None
+
+        cached_kpis = self._result_cache.get_kpis(order, packing_plan, self.__stabilitySource(packing_plan.id))
+        self._cached_kpis[packing_plan.id] = cached_kpis
+        return cached_kpis
 
     def evalStability(self) -> Literal[0, 1]:
         """
         This method evaluates the results of the Blender rigid body simulation and decides whether a packing plan prodcues a stable outcome.
 
-        It is checked whether the maximum movement of an item in z-direction is bigger than a given threshold in the stability file that is produced by the rigid body simulation.
+        It is checked whether the maximum movement of an item in z-direction is bigger than a given threshold in the stability file that is produced by the rigid body simulation. The outcome is memoized per order until the order is evaluated again.
 
         Returns.
         --------
@@ -70,22 +136,70 @@ class PackingPlanEvaluator:
         """
         VAL_STABLE, VAL_UNSTABLE = 1, 0
 
-        with open(EVALOUTPUTDIR.joinpath("stability.txt")) as file:
-            stability_information = file.readlines()
+        static_stability = self._static_stability.get(self._order_id)
+        if static_stability is not None:
+            return int(static_stability)
 
-        # the last line from the file should be the correct
-        for line in reversed(stability_information):
-            order_in_line, value = line.split(":", maxsplit=1)
+        stability = self._stability.get(self._order_id)
+        if stability is None:
+            movements = self._stability_results.get(self._order_id)
+            if movements is None:
+                raise ValueError("order ids do not match")
 
-            if order_in_line == self._order_id:
-                # found correct line
-                value_dict = ast.literal_eval(value)
-                if value_dict.get("max_z-movements/m") > STABILITY_Z_THRESHOLD:
-                    return VAL_UNSTABLE
-                else:
-                    return VAL_STABLE
+            stability = VAL_UNSTABLE if movements.get("max_z-movements/m") > STABILITY_Z_THRESHOLD else VAL_STABLE
+            self._stability[self._order_id] = stability
+
+        return stability
 
-        raise ValueError("order ids do not match")
+    def precheckStability(self, packing_plan: PackingPlan, order: Order) -> StaticStability:
+        """
+        This method checks the static equilibrium of the pile of a packing plan. If the pile is clearly stable or
+        clearly unstable, the outcome is used by `evalStability` and the rigid body simulation can be skipped.
+
+        Parameters.
+        -----------
+        packing_plan: PackingPlan
+            The packing plan whose pile is checked.
+        order: Order
+            The order of the packing plan.
+
+        Returns.
+        --------
+        static_stability: StaticStability
+            Whether the pile is stable, unstable, or has to be simulated in Blender.
+        """
+        target_size = self.__getTargetSize(order)
+        self._precheck_space.reset(target_size)
+        self.__rebuildPile(self._precheck_space, packing_plan)
+
+        static_stability = check_static_stability(self._precheck_space.getPlacedItems(), target_size)
+        if static_stability is StaticStability.UNCERTAIN:
+            self._static_stability.pop(packing_plan.id, None)
+        else:
+            self._static_stability[packing_plan.id] = static_stability
+
+        logger.info(f"static stability check of order {packing_plan.id}: {static_stability.name}")
+        return static_stability
+
+    @staticmethod
+    def __getTargetSize(order: Order) -> tuple[int, int]:
+        """Returns the size of the base area of the target of the given order in millimeters."""
+        target = order.properties.target
+        if target == "euro-pallet":
+            return (1200, 800)
+        elif target == "rollcontainer":
+            return (800, 700)
+        raise ValueError(f"target {target} unknown")
+
+    @staticmethod
+    def __rebuildPile(space: Space3D, packing_plan: PackingPlan, kpis: KPIs = None) -> None:
+        """Places the items of the packing plan in the given space and updates the KPIs after each action."""
+        for action in packing_plan.actions:
+            cuboid = Cuboid(action.item)
+            cuboid.set_orientation(action.orientation)
+            space.addItem(cuboid, action.orientation, action.flb_coordinates.xyz)
+            if kpis is not None:
+                kpis.update()
 
     def evalSupportArea(self) -> float:
         """
@@ -283,32 +397,35 @@ class PackingPlanEvaluator:
         """
         order_id = packing_plan.id
         self._order_id = order_id
+        # a new stability check might have been run for this order
+        self._stability.pop(order_id, None)
 
         self._order = order
         self._packing_plan = packing_plan.actions
 
         logger.info(f"evaluate order {order_id}")
 
-        # rebuild target space
-        target = self._order.properties.target
-        if target == "euro-pallet":
-            target_size = (1200, 800)
-        elif target == "rollcontainer":
-            target_size = (800, 700)
+        if order_id in self._cached_kpis:
+            cached_kpis = self._cached_kpis.pop(order_id)
         else:
-            raise ValueError(f"target {target} unknown")
+            cached_kpis = self.lookupCachedKPIs(packing_plan, order)
+            self._cached_kpis.pop(order_id, None)
+        if cached_kpis is not None:
+            kpis_dict = {"order_id": order_id}
+            kpis_dict.update({name: pd.NA if value is None else value for name, value in cached_kpis.items()})
+            self._evaluation_kpis.append(kpis_dict)
+            return kpis_dict
+
+        # rebuild target space
+        target_size = self.__getTargetSize(self._order)
         self._target_space.reset(target_size)
 
         self._kpis.reset(self._target_space, self._order)
-
-        for action in self._packing_plan:
-            cuboid = Cuboid(action.item)
-            cuboid.set_orientation(action.orientation)
-            self._target_space.addItem(cuboid, action.orientation, action.flb_coordinates.xyz)
-            self._kpis.update()
+        self.__rebuildPile(self._target_space, packing_plan, self._kpis)
 
         # obtain the values of the KPIs
         kpis_dict = {"order_id": self._order_id}
+        all_kpis_evaluated = True
         for kpi_def_dict in KPI_DEFINITION.values():
             logger.info(kpi_def_dict)
             try:
@@ -322,6 +439,11 @@ class PackingPlanEvaluator:
                 logger.warning(msg)
                 logger.exception(e)
                 kpis_dict[f"kpi_{kpi_def_dict.get('num')}"] = msg
+                all_kpis_evaluated = False
+
+        if self._result_cache is not None and all_kpis_evaluated:
+            cached_kpis = {name: value for name, value in kpis_dict.items() if name != "order_id"}
+            self._result_cache.put_kpis(order, packing_plan, cached_kpis, self.__stabilitySource(order_id))
 
         self._evaluation_kpis.append(kpis_dict)
         return kpis_dict
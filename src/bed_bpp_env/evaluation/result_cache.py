@@ -0,0 +1,141 @@
+"""
+This module contains a persistent cache of evaluation results in an SQLite database. The results are addressed by the
+content of a packing plan, i.e., a hash of the items of the order, the target, and the actions, hence, an identical
+packing plan of another solver or of another run is neither simulated nor evaluated again.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from bed_bpp_env.data_model.order import Order
+from bed_bpp_env.data_model.packing_plan import PackingPlan
+from bed_bpp_env.evaluation.kpis import FILE_KPI_DEFINITION
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESULT_CACHE_PATH = Path(__file__).parents[3] / "output" / "evaluation_cache.sqlite"
+"""The default path of the cache, which is shared by all runs."""
+STABILITY_SOURCE_SIMULATION = "blender"
+"""The source of the stability verdict of KPIs whose pile was simulated in Blender."""
+
+
+def _hash(serialized: object) -> str:
+    """Returns the SHA-256 of the canonical JSON representation of the given object."""
+    canonical = json.dumps(serialized, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _serializable(value: object) -> Optional[int | float | str]:
+    """Returns the given value of a KPI as built-in type, or `None` if it is not a number or a string, e.g., `pd.NA`."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    return value if isinstance(value, (int, float, str)) else None
+
+
+def kpi_definition_version(file_path: Path = FILE_KPI_DEFINITION) -> str:
+    """Returns the hash of the given KPI definition, which changes whenever a KPI or a threshold is changed."""
+    return hashlib.sha256(file_path.read_bytes()).hexdigest()
+
+
+def stability_key(order: Order, packing_plan: PackingPlan) -> str:
+    """
+    Returns the key of the stability result of the given packing plan, i.e., the hash of the items of the order, the
+    target, and the actions. The identifiers of the order and the packing plan are not part of the key.
+
+    Args:
+        order (Order): The order for that the packing plan was generated.
+        packing_plan (PackingPlan): The packing plan.
+
+    Returns:
+        str: The key.
+    """
+    return _hash(
+        {
+            "items": [item.to_dict() for item in order.item_sequence],
+            "target": order.properties.target,
+            "actions": [action.to_dict() for action in packing_plan.actions],
+        }
+    )
+
+
+class EvaluationResultCache:
+    """
+    A cache of the z-movements of the Blender stability checks and of the values of the KPIs. The KPIs are additionally
+    addressed by the version of the KPI definition, thus, they are evaluated again if the definition changes, while the
+    stability results remain valid. They are also addressed by the source of the stability verdict, hence, KPIs whose
+    verdict stems from the static stability check are not returned to a run that simulates every pile.
+
+    Args:
+        file_path (Path): The path to the SQLite database, which is created if necessary. Defaults to
+            `DEFAULT_RESULT_CACHE_PATH`.
+    """
+
+    def __init__(self, file_path: Path = DEFAULT_RESULT_CACHE_PATH) -> None:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(file_path)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS stability (key TEXT PRIMARY KEY, movements TEXT NOT NULL)")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS kpis (key TEXT PRIMARY KEY, kpis TEXT NOT NULL)")
+        self._connection.commit()
+        self._kpi_definition_version = kpi_definition_version()
+        self._statistics = {"stability": {"hits": 0, "misses": 0}, "kpis": {"hits": 0, "misses": 0}}
+
+    def __enter__(self) -> "EvaluationResultCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def statistics(self) -> dict[str, dict[str, int]]:
+        """The amount of hits and misses of the stability results and the KPIs."""
+        return {table: dict(counts) for table, counts in self._statistics.items()}
+
+    def get_stability(self, order: Order, packing_plan: PackingPlan) -> Optional[dict[str, float]]:
+        """Returns the cached z-movements of the given packing plan, or `None` if they are not cached."""
+        return self._get("stability", stability_key(order, packing_plan))
+
+    def put_stability(self, order: Order, packing_plan: PackingPlan, movements: dict[str, float]) -> None:
+        """Caches the z-movements of the given packing plan."""
+        self._put("stability", stability_key(order, packing_plan), movements)
+
+    def get_kpis(
+        self, order: Order, packing_plan: PackingPlan, stability_source: str = STABILITY_SOURCE_SIMULATION
+    ) -> Optional[dict]:
+        """Returns the cached values of the KPIs of the given packing plan whose stability verdict stems from the given
+        source, or `None` if they are not cached. The values of KPIs that are not defined are `None`."""
+        return self._get("kpis", self._kpis_key(order, packing_plan, stability_source))
+
+    def put_kpis(
+        self, order: Order, packing_plan: PackingPlan, kpis: dict, stability_source: str = STABILITY_SOURCE_SIMULATION
+    ) -> None:
+        """Caches the values of the KPIs of the given packing plan whose stability verdict stems from the given source,
+        values that cannot be serialized are stored as `None`."""
+        kpis = {name: _serializable(value) for name, value in kpis.items()}
+        self._put("kpis", self._kpis_key(order, packing_plan, stability_source), kpis)
+
+    def log_statistics(self) -> None:
+        """Logs the amount of hits and misses."""
+        for table, counts in self._statistics.items():
+            logger.info(f"result cache {table}: {counts['hits']} hits, {counts['misses']} misses")
+
+    def close(self) -> None:
+        """Closes the database."""
+        self._connection.close()
+
+    def _kpis_key(self, order: Order, packing_plan: PackingPlan, stability_source: str) -> str:
+        return _hash([stability_key(order, packing_plan), self._kpi_definition_version, stability_source])
+
+    def _get(self, table: str, key: str) -> Optional[dict]:
+        row = self._connection.execute(f"SELECT * FROM {table} WHERE key = ?", (key,)).fetchone()
+        self._statistics[table]["hits" if row is not None else "misses"] += 1
+        return None if row is None else json.loads(row[1])
+
+    def _put(self, table: str, key: str, value: dict) -> None:
+        self._connection.execute(f"INSERT OR REPLACE INTO {table} VALUES (?, ?)", (key, json.dumps(value)))
+        self._connection.commit()
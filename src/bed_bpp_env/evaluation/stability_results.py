@@ -0,0 +1,96 @@
+"""
+This module contains a store of the results of the Blender stability checks. The results are kept in the stability file
+in the output directory, one line `<order id>:<z-movements>` per check, and are indexed by the identifier of the order,
+hence, the file is read only once, no matter how often a result is looked up.
+"""
+
+import ast
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+STABILITY_FILE_NAME = "stability.txt"
+"""The name of the file in the output directory that contains the z-movements of the checked packing plans."""
+
+
+class StabilityResultStore:
+    """
+    The z-movements of the checked packing plans, indexed by the identifier of the order. If an order was checked more
+    than once, the last result counts.
+
+    The results that are added with `append` are written to the stability file and indexed right away. Lines that other
+    processes, e.g., `scene_creation.py`, append to the file are read on each lookup, starting after the last line that
+    was read, hence, a lookup only reads the lines that are new. Each line is written with a single append, thus, several
+    threads and processes can add results to the same file at the same time.
+
+    Args:
+        file_path (Path): The path to the stability file, which is created when the first result is appended.
+    """
+
+    def __init__(self, file_path: Path) -> None:
+        self._file_path = file_path
+        self._movements: dict[str, dict[str, float]] = {}
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, order_id: str) -> bool:
+        return self.get(order_id) is not None
+
+    def get(self, order_id: str) -> Optional[dict[str, float]]:
+        """
+        Returns the z-movements of the given order.
+
+        Args:
+            order_id (str): The identifier of the order.
+
+        Returns:
+            Optional[dict[str, float]]: The mean and the maximum z-movements in meters, or `None` if the order was not
+                checked.
+        """
+        with self._lock:
+            self._read_new_lines()
+            return self._movements.get(order_id)
+
+    def append(self, order_id: str, movements: dict[str, float]) -> None:
+        """
+        Adds the z-movements of the given order to the store and to the stability file.
+
+        Args:
+            order_id (str): The identifier of the order.
+            movements (dict[str, float]): The mean and the maximum z-movements in meters.
+        """
+        line = f"{order_id}:{str(movements)}\n".encode()
+        with self._lock:
+            # the lines of other writers are indexed first, such that they do not replace the newer result later
+            self._read_new_lines()
+            self._file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_descriptor = os.open(self._file_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND)
+            try:
+                os.write(file_descriptor, line)
+                file_size = os.fstat(file_descriptor).st_size
+            finally:
+                os.close(file_descriptor)
+            self._movements[order_id] = movements
+            # the own line is skipped if no other writer appended to the file in the meantime
+            if file_size == self._offset + len(line):
+                self._offset = file_size
+
+    def _read_new_lines(self) -> None:
+        """Indexes the complete lines that were appended to the stability file since it was read the last time."""
+        try:
+            if self._file_path.stat().st_size <= self._offset:
+                return
+        except FileNotFoundError:
+            return
+        with open(self._file_path, "rb") as file:
+            file.seek(self._offset)
+            content = file.read()
+
+        # a line that is still being written is read the next time
+        content = content[: content.rfind(b"\n") + 1]
+        self._offset += len(content)
+        for line in content.decode().splitlines():
+            if line:
+                order_id, value = line.split(":", maxsplit=1)
+                self._movements[order_id] = ast.literal_eval(value)
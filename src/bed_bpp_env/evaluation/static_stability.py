@@ -0,0 +1,227 @@
+"""
+This module contains a static equilibrium check of a pile, which decides without a rigid body simulation whether a pile
+is clearly stable or clearly unstable.
+
+The items are processed from the top to the bottom. The weight of an item and the loads it carries are combined to a
+resultant force, whose point of application has to be inside the support polygon of the item, i.e., the convex hull of
+the areas where it touches the items below. An item that rests on a single item passes its resultant on to that item.
+An item that rests on several items splits its resultant in a statically indeterminate way, hence, each item below
+carries a load between zero and the whole resultant anywhere in the contact area. A pile is only stable if each
+resultant keeps the margin for the worst of these admissible loads, and only an item that carries no load can be
+definitely unstable.
+"""
+
+from enum import IntEnum
+from typing import Optional
+
+from bed_bpp_env.environment.cuboid import Cuboid
+
+STABLE_MARGIN = 20
+"""The minimum distance in cells of each resultant to the boundary of its support polygon in a stable pile."""
+UNSTABLE_MARGIN = 20
+"""The minimum distance in cells of the center of mass of an unloaded item outside its support polygon for a pile to
+count as unstable."""
+
+
+class StaticStability(IntEnum):
+    """The outcome of the static stability check, the values equal the values of the stability KPI."""
+
+    UNSTABLE = 0
+    """An item tips over or has no support."""
+
+    STABLE = 1
+    """All items are in equilibrium with a margin."""
+
+    UNCERTAIN = 2
+    """The pile has to be simulated."""
+
+
+def _cross(origin: tuple, a: tuple, b: tuple) -> float:
+    return (a[0] - origin[0]) * (b[1] - origin[1]) - (a[1] - origin[1]) * (b[0] - origin[0])
+
+
+def convex_hull(points: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    """
+    Returns the convex hull of the given points in counterclockwise order, computed with the monotone chain algorithm.
+
+    Args:
+        points (list[tuple[float, float]]): The points as `(x, y)`.
+
+    Returns:
+        list[tuple[float, float]]: The vertices of the convex hull.
+    """
+    points = sorted(set(points))
+    if len(points) <= 2:
+        return points
+
+    lower, upper = [], []
+    for point in points:
+        while len(lower) >= 2 and _cross(lower[-2], lower[-1], point) <= 0:
+            lower.pop()
+        lower.append(point)
+    for point in reversed(points):
+        while len(upper) >= 2 and _cross(upper[-2], upper[-1], point) <= 0:
+            upper.pop()
+        upper.append(point)
+
+    return lower[:-1] + upper[:-1]
+
+
+def _distance_to_segment(point: tuple, start: tuple, end: tuple) -> float:
+    delta_x, delta_y = end[0] - start[0], end[1] - start[1]
+    squared_length = delta_x * delta_x + delta_y * delta_y
+    if squared_length == 0:
+        t = 0.0
+    else:
+        t = ((point[0] - start[0]) * delta_x + (point[1] - start[1]) * delta_y) / squared_length
+        t = min(max(t, 0.0), 1.0)
+    return ((point[0] - start[0] - t * delta_x) ** 2 + (point[1] - start[1] - t * delta_y) ** 2) ** 0.5
+
+
+def signed_distance_to_polygon(point: tuple[float, float], polygon: list[tuple[float, float]]) -> float:
+    """
+    Returns the distance of the point to the boundary of the convex polygon, which is positive if the point is inside.
+
+    Args:
+        point (tuple[float, float]): The point as `(x, y)`.
+        polygon (list[tuple[float, float]]): The vertices of a convex polygon in counterclockwise order.
+
+    Returns:
+        float: The signed distance to the boundary.
+    """
+    if not polygon:
+        return float("-inf")
+    if len(polygon) == 1:
+        return -_distance_to_segment(point, polygon[0], polygon[0])
+
+    edges = list(zip(polygon, polygon[1:] + polygon[:1]))
+    distance = min(_distance_to_segment(point, start, end) for start, end in edges)
+    inside = len(polygon) >= 3 and all(_cross(start, end, point) >= 0 for start, end in edges)
+    return distance if inside else -distance
+
+
+def _clip_rectangle(rectangle: tuple, size: tuple) -> Optional[tuple]:
+    """Returns the part of the rectangle inside the base area of the given size, or `None` if there is none."""
+    start_x, start_y, end_x, end_y = rectangle
+    start_x, start_y = max(start_x, 0), max(start_y, 0)
+    end_x, end_y = min(end_x, size[0]), min(end_y, size[1])
+    if start_x >= end_x or start_y >= end_y:
+        return None
+    return start_x, start_y, end_x, end_y
+
+
+def _worst_margin(
+    polygon: list[tuple[float, float]],
+    weight: float,
+    center: tuple[float, float],
+    loads: list[tuple[float, float, tuple[float, float, float, float]]],
+) -> float:
+    """
+    Returns the smallest distance of the resultant inside the convex polygon over all admissible loads, which is
+    negative if the resultant may be outside. Since the resultant is a weighted mean, each edge is checked with the
+    corner of each load area that is closest to the edge and with the magnitudes that move the mean the furthest.
+    """
+    if len(polygon) < 3:
+        return float("-inf")
+
+    margin = float("inf")
+    for start, end in zip(polygon, polygon[1:] + polygon[:1]):
+        length = ((end[0] - start[0]) ** 2 + (end[1] - start[1]) ** 2) ** 0.5
+        # the inward normal of the edge of a counterclockwise polygon
+        normal_x, normal_y = (start[1] - end[1]) / length, (end[0] - start[0]) / length
+
+        def distance(x: float, y: float) -> float:
+            return normal_x * (x - start[0]) + normal_y * (y - start[1])
+
+        moment, force = weight * distance(*center), weight
+        optional = []
+        for min_force, max_force, (start_x, start_y, end_x, end_y) in loads:
+            closest = min(distance(x, y) for x in (start_x, end_x) for y in (start_y, end_y))
+            moment += min_force * closest
+            force += min_force
+            optional.append((closest, max_force - min_force))
+        # adding the loads closest to the edge as long as they pull the mean towards the edge
+        for closest, extra_force in sorted(optional):
+            if extra_force > 0 and (force <= 0 or closest < moment / force):
+                moment += extra_force * closest
+                force += extra_force
+        margin = min(margin, moment / force if force > 0 else distance(*center))
+    return margin
+
+
+def check_static_stability(
+    items: list[Cuboid],
+    target_size: Optional[tuple[int, int]] = None,
+    stable_margin: float = STABLE_MARGIN,
+    unstable_margin: float = UNSTABLE_MARGIN,
+) -> StaticStability:
+    """
+    Checks the static equilibrium of the given pile.
+
+    Args:
+        items (list[Cuboid]): The items of the pile in the sequence they were placed, e.g., from
+            `Space3D.getPlacedItems`.
+        target_size (Optional[tuple[int, int]]): The size of the base area of the target in cells, which limits the
+            support of the items on the target. Defaults to `None`, i.e., the items are fully supported by the target.
+        stable_margin (float): The minimum distance of each resultant inside its support polygon for a stable pile.
+        unstable_margin (float): The minimum distance of the center of mass of an unloaded item outside its support
+            polygon for an unstable pile.
+
+    Returns:
+        StaticStability: Whether the pile is stable, unstable, or has to be simulated.
+    """
+    index_of_item = {id(item): i_item for i_item, item in enumerate(items)}
+    # the loads that are carried by each item as `(min_force, max_force, (start_x, start_y, end_x, end_y))`, i.e., the
+    # bounds of the force and the area of its point of application
+    loads: list[list[tuple[float, float, tuple[float, float, float, float]]]] = [[] for _ in items]
+    verdict = StaticStability.STABLE
+
+    for i_item in reversed(range(len(items))):
+        item = items[i_item]
+        delta_y, delta_x = item.footprint_shape
+        flb_x, flb_y = item.flb.x, item.flb.y
+        center = (flb_x + delta_x / 2, flb_y + delta_y / 2)
+
+        contacts = [
+            (flb_x + start_x, flb_y + start_y, flb_x + end_x, flb_y + end_y)
+            for start_x, start_y, end_x, end_y in item.support_rectangles
+        ]
+        if not item.items_below:
+            if item.flb.z > 0:
+                # the item floats
+                return StaticStability.UNSTABLE
+            if target_size is not None:
+                contacts = [contact for contact in (_clip_rectangle(c, target_size) for c in contacts) if contact]
+        if not contacts:
+            return StaticStability.UNSTABLE
+
+        corners = [
+            (x, y) for start_x, start_y, end_x, end_y in contacts for x in (start_x, end_x) for y in (start_y, end_y)
+        ]
+        hull = convex_hull(corners)
+        weight = float(item.weight)
+        if not loads[i_item] and signed_distance_to_polygon(center, hull) < -unstable_margin:
+            return StaticStability.UNSTABLE
+        if _worst_margin(hull, weight, center, loads[i_item]) < stable_margin:
+            verdict = StaticStability.UNCERTAIN
+
+        # pass the resultant on to the items below
+        min_force = weight + sum(load[0] for load in loads[i_item])
+        max_force = weight + sum(load[1] for load in loads[i_item])
+        if len(contacts) == 1:
+            if all(min_load == max_load and area[:2] == area[2:] for min_load, max_load, area in loads[i_item]):
+                # the resultant is determined
+                moment_x = weight * center[0] + sum(load * area[0] for load, _, area in loads[i_item])
+                moment_y = weight * center[1] + sum(load * area[1] for load, _, area in loads[i_item])
+                resultant = (moment_x / max_force, moment_y / max_force) if max_force > 0 else center
+                areas = [resultant + resultant]
+            else:
+                areas = contacts
+        else:
+            min_force, areas = 0.0, contacts
+        for item_below, area in zip(item.items_below, areas):
+            i_below = index_of_item.get(id(item_below))
+            if i_below is not None:
+                loads[i_below].append((min_force, max_force, area))
+
+    return verdict
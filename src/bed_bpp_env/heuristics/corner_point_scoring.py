@@ -0,0 +1,157 @@
+"""
+This module scores the corner points of the heuristic `O3DBP_3_2` in a single batch. The maxima of the heights below the
+footprints are read from a sliding-window maximum of the height map, which is determined once for each footprint, and
+the supported areas are counted in a single pass over the window below each footprint.
+"""
+
+import numpy as np
+
+SUPPORT_TOLERANCE_MM = 10
+"""The tolerance in millimeters for heights that count as support of an item, relative to the maximum height below it."""
+
+MAXIMUM_DISTANCE_HEIGHT_MM = 2_000
+"""The height in millimeters that is used to norm the distance of a corner point to the origin."""
+
+
+def score_corner_points(
+    observation: np.ndarray, cornerpoints: np.ndarray, itemsizes: np.ndarray, weights: list
+) -> np.ndarray:
+    """
+    Returns the scores of the given corner points. The score of a corner point is the dot product of the weights and
+    the components (a) estimated support area, (b) estimated z-coordinate relative to the maximum height, (c) item
+    orientation, and (d) normed distance of the corner point to the origin in 3D.
+
+    Parameters.
+    -----------
+    observation: np.ndarray
+        The heights in each coordinate of the palletizing target in millimeters.
+    cornerpoints: np.ndarray
+        The corner points as array of shape `(n, 4)`, where each row is `[x, y, z, item_orientation]`.
+    itemsizes: np.ndarray
+        The `[length, width, height]` of the item that is placed in each corner point as array of shape `(n, 3)`.
+    weights: list
+        The weights of the four components of the score.
+
+    Returns.
+    --------
+    scores: np.ndarray
+        The score of each corner point.
+    """
+    cornerpoints = np.asarray(cornerpoints, dtype=int).reshape(-1, 4)
+    itemsizes = np.asarray(itemsizes).reshape(-1, 3)
+    if len(cornerpoints) == 0:
+        return np.zeros(0)
+
+    x, y, orientation = cornerpoints[:, 0], cornerpoints[:, 1], cornerpoints[:, 3]
+    lengths, widths = itemsizes[:, 0].astype(int), itemsizes[:, 1].astype(int)
+    delta_x = np.where(orientation == 1, widths, lengths)
+    delta_y = np.where(orientation == 1, lengths, widths)
+
+    footprint_maxima = _footprint_maxima(observation, x, y, delta_x, delta_y)
+    support_counts = _support_counts(observation, footprint_maxima, x, y, delta_x, delta_y)
+    estimated_support_area = support_counts / _footprint_areas(observation, x, y, delta_x, delta_y)
+
+    estimated_z = footprint_maxima + itemsizes[:, 2]
+    normed_z = estimated_z / np.maximum(np.amax(observation), estimated_z)
+
+    maximum_distance = np.sqrt(
+        np.square(observation.shape[0]) + np.square(observation.shape[1]) + np.square(MAXIMUM_DISTANCE_HEIGHT_MM)
+    )
+    normed_distance = np.sqrt(np.square(x) + np.square(y) + np.square(estimated_z)) / maximum_distance
+
+    values = np.column_stack([estimated_support_area, normed_z, orientation, normed_distance])
+    return values @ np.asarray(weights, dtype=float)
+
+
+def _footprint_maxima(
+    observation: np.ndarray, x: np.ndarray, y: np.ndarray, delta_x: np.ndarray, delta_y: np.ndarray
+) -> np.ndarray:
+    """Returns the maximum height below each footprint, the footprints are cropped at the edges of the height map."""
+    maxima = np.zeros(len(x), dtype=observation.dtype)
+
+    for footprint in set(zip(delta_x.tolist(), delta_y.tolist())):
+        in_footprint = (delta_x == footprint[0]) & (delta_y == footprint[1])
+        # the maximum in x-direction is needed for all rows, but in y-direction only for the columns of the corners
+        maxima_x = _sliding_maximum(observation, footprint[0])
+        columns, column_indices = np.unique(x[in_footprint], return_inverse=True)
+        maxima_xy = _sliding_maximum(maxima_x[:, columns].T, footprint[1])
+        maxima[in_footprint] = maxima_xy[column_indices, y[in_footprint]]
+
+    return maxima
+
+
+def _sliding_maximum(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Returns the maximum of the next `window` values along the last axis for each position, where the window is cropped
+    at the end of the axis. The maximum is determined by doubling the window size in each step, thus, the amount of
+    passes over the array grows logarithmically with the window.
+    """
+    n_values = values.shape[-1]
+    padding = np.zeros(values.shape[:-1] + (window - 1,), dtype=values.dtype)
+    maxima = np.concatenate([values, padding], axis=-1)
+
+    width = 1
+    while 2 * width <= window:
+        maxima = np.maximum(maxima[..., :-width], maxima[..., width:])
+        width *= 2
+
+    # now maxima[..., i] is the maximum of values[..., i : i + width]
+    return np.maximum(maxima[..., :n_values], maxima[..., window - width : window - width + n_values])
+
+
+def _support_counts(
+    observation: np.ndarray,
+    footprint_maxima: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    delta_x: np.ndarray,
+    delta_y: np.ndarray,
+) -> np.ndarray:
+    """
+    Returns the amount of coordinates in each footprint whose height is within the tolerance of the maximum. The
+    footprints with the same maximum share a summed-area table, which is restricted to their bounding box, hence, the
+    effort does not depend on the amount of corner points with this maximum.
+    """
+    counts = np.zeros(len(x), dtype=int)
+    end_x = np.minimum(x + delta_x, observation.shape[1])
+    end_y = np.minimum(y + delta_y, observation.shape[0])
+
+    for maximum in np.unique(footprint_maxima).tolist():
+        with_maximum = footprint_maxima == maximum
+        start_x, start_y = x[with_maximum], y[with_maximum]
+        box_x, box_y = start_x.min(), start_y.min()
+        box = observation[box_y : end_y[with_maximum].max(), box_x : end_x[with_maximum].max()]
+        # no height in a footprint exceeds its maximum, hence, only the lower bound of the tolerance is checked
+        supporting = box > int(maximum) - SUPPORT_TOLERANCE_MM
+        counts[with_maximum] = _rectangle_sums(
+            supporting,
+            start_x - box_x,
+            start_y - box_y,
+            end_x[with_maximum] - box_x,
+            end_y[with_maximum] - box_y,
+        )
+
+    return counts
+
+
+def _footprint_areas(
+    observation: np.ndarray, x: np.ndarray, y: np.ndarray, delta_x: np.ndarray, delta_y: np.ndarray
+) -> np.ndarray:
+    """Returns the area of each footprint after it is cropped at the edges of the height map."""
+    end_x = np.minimum(x + delta_x, observation.shape[1])
+    end_y = np.minimum(y + delta_y, observation.shape[0])
+    return (end_x - x) * (end_y - y)
+
+
+def _rectangle_sums(
+    mask: np.ndarray, start_x: np.ndarray, start_y: np.ndarray, end_x: np.ndarray, end_y: np.ndarray
+) -> np.ndarray:
+    """Returns the sum of the mask in each rectangle by means of a summed-area table."""
+    summed_area_table = np.zeros((mask.shape[0] + 1, mask.shape[1] + 1), dtype=int)
+    np.cumsum(np.cumsum(mask, axis=0), axis=1, out=summed_area_table[1:, 1:])
+    return (
+        summed_area_table[end_y, end_x]
+        - summed_area_table[start_y, end_x]
+        - summed_area_table[end_y, start_x]
+        + summed_area_table[start_y, start_x]
+    )
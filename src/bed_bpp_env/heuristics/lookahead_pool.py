@@ -0,0 +1,204 @@
+"""
+This module contains a pool of worker processes that simulate action sequences in copies of a simulation environment.
+The processes are kept alive between the decisions of a heuristic.
+"""
+
+import logging
+import multiprocessing
+from multiprocessing.connection import Connection, wait
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_SET_STATE = "set_state"
+_SIMULATE = "simulate"
+_CLOSE = "close"
+
+SIMULATION_ERRORS = (ValueError, KeyError, IndexError, ArithmeticError)
+"""The errors that the simulation of an infeasible action sequence raises, which are reported to the caller of `map`.
+Other errors terminate the worker."""
+
+
+def _runWorker(connection: Connection) -> None:
+    """
+    The loop of a worker process. The worker stores the simulation environment that it receives with the command
+    `_SET_STATE` and opens a snapshot of it. For each chunk of action sequences, it simulates every action sequence
+    with the received function and restores the snapshot afterwards. It replies the results of the chunk and the error
+    that stopped the simulation of the chunk, if any.
+    """
+    simulate, simenv, snapshot = None, None, None
+
+    while True:
+        command, payload = connection.recv()
+
+        if command == _SET_STATE:
+            simulate, simenv = payload
+            snapshot = simenv.snapshot()
+
+        elif command == _SIMULATE:
+            chunkIndex, actionSequences = payload
+            results, error = [], None
+            try:
+                for actions in actionSequences:
+                    results.append(simulate(simenv, actions))
+                    simenv.restore(snapshot)
+            except SIMULATION_ERRORS as exception:
+                simenv.restore(snapshot)
+                error = exception
+            connection.send((chunkIndex, results, error))
+
+        elif command == _CLOSE:
+            break
+
+    connection.close()
+
+
+class LookaheadPool:
+    """
+    A pool of worker processes that simulate action sequences for the lookahead of a heuristic.
+
+    The state of the simulation environment is sent to each worker once per decision with `set_state`. Afterwards,
+    `map` only sends the action sequences in chunks to the workers, which start each action sequence from the sent
+    state. The results are returned in the order of the action sequences, thus, they equal the results of a serial
+    simulation.
+
+    Parameters.
+    -----------
+    workers: int
+        The amount of worker processes.
+    chunksize: int
+        The amount of action sequences that are sent to a worker at once.
+
+    Attributes.
+    -----------
+    __Chunksize: int
+        The amount of action sequences that are sent to a worker at once.
+    __Connections: list
+        The connections to the worker processes.
+    __NWorkers: int
+        The amount of worker processes.
+    __Processes: list
+        The worker processes, which are started in the first call of `set_state`.
+    """
+
+    def __init__(self, workers: int, chunksize: int) -> None:
+        if workers < 1:
+            raise ValueError(f"the amount of workers must be positive, but is {workers}")
+        if chunksize < 1:
+            raise ValueError(f"the chunksize must be positive, but is {chunksize}")
+
+        self.__NWorkers = workers
+        """The amount of worker processes."""
+        self.__Chunksize = chunksize
+        """The amount of action sequences that are sent to a worker at once."""
+
+        self.__Processes: list[multiprocessing.Process] = []
+        """The worker processes, which are started in the first call of `set_state`."""
+        self.__Connections: list[Connection] = []
+        """The connections to the worker processes."""
+
+    def __getstate__(self) -> dict:
+        raise TypeError("a LookaheadPool cannot be copied or pickled")
+
+    def set_state(self, simulate: Callable, simenv: object) -> None:
+        """
+        Sends the function that simulates an action sequence and the state of the simulation environment to each
+        worker.
+
+        Parameters.
+        -----------
+        simulate: Callable
+            A picklable function with the parameters `simenv` and `stepactions` that returns the result of the
+            simulation of the action sequence `stepactions`.
+        simenv: object
+            The simulation environment in the state from which all action sequences start. It must provide the methods
+            `snapshot` and `restore` like `SimPalEnv`.
+        """
+        if self.__Processes == []:
+            self.__start()
+
+        for connection in self.__Connections:
+            connection.send((_SET_STATE, (simulate, simenv)))
+
+    def map(self, actionsequences: list) -> list:
+        """
+        Simulates the given action sequences in the workers and returns the results in the order of the action
+        sequences.
+
+        Parameters.
+        -----------
+        actionsequences: list
+            The action sequences, each of them is a list of actions.
+
+        Returns.
+        --------
+        results: list
+            The results of the simulations.
+        """
+        chunks = [
+            actionsequences[start : start + self.__Chunksize]
+            for start in range(0, len(actionsequences), self.__Chunksize)
+        ]
+        resultsOfChunks: list[Optional[list]] = [None] * len(chunks)
+
+        # each worker gets a chunk, afterwards, the next chunk is sent to the worker that has finished first
+        nextChunk = 0
+        chunkOfConnection: dict[Connection, int] = {}
+        for connection in self.__Connections:
+            if nextChunk == len(chunks):
+                break
+            connection.send((_SIMULATE, (nextChunk, chunks[nextChunk])))
+            chunkOfConnection[connection] = nextChunk
+            nextChunk += 1
+
+        # after a failed simulation, no further chunks are sent, but the results of the busy workers are received
+        failure = None
+        while chunkOfConnection:
+            for connection in wait(list(chunkOfConnection)):
+                try:
+                    chunkIndex, results, error = connection.recv()
+                except EOFError:
+                    raise RuntimeError(
+                        f"a lookahead worker exited while simulating chunk {chunkOfConnection[connection]}"
+                    ) from None
+
+                if error is not None and failure is None:
+                    failure = chunkIndex, chunkIndex * self.__Chunksize + len(results), error
+                resultsOfChunks[chunkIndex] = results
+
+                if nextChunk < len(chunks) and failure is None:
+                    connection.send((_SIMULATE, (nextChunk, chunks[nextChunk])))
+                    chunkOfConnection[connection] = nextChunk
+                    nextChunk += 1
+                else:
+                    del chunkOfConnection[connection]
+
+        if failure is not None:
+            chunkIndex, sequenceIndex, error = failure
+            raise RuntimeError(
+                f"the simulation of action sequence {sequenceIndex} in chunk {chunkIndex} failed in a lookahead worker"
+            ) from error
+
+        return [result for results in resultsOfChunks for result in results]
+
+    def close(self) -> None:
+        """Stops the worker processes."""
+        for connection, process in zip(self.__Connections, self.__Processes):
+            connection.send((_CLOSE, None))
+            process.join()
+            connection.close()
+
+        self.__Processes = []
+        self.__Connections = []
+
+    def __start(self) -> None:
+        """Starts the worker processes."""
+        for _ in range(self.__NWorkers):
+            parentConnection, childConnection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_runWorker, args=(childConnection,), daemon=True)
+            process.start()
+            childConnection.close()
+
+            self.__Processes.append(process)
+            self.__Connections.append(parentConnection)
+        logger.info(f"started {self.__NWorkers} lookahead workers")
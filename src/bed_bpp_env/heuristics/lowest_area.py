@@ -83,7 +83,7 @@ class LowestArea:
         """
         allowedActions = []
         for orientation, arrayAllowedArea in self.__Info["allowed_area"].items():
-            allowedCoordinates = list(np.argwhere(arrayAllowedArea == 1))
+            allowedCoordinates = list(np.argwhere(np.asarray(arrayAllowedArea) == 1))
             allowedActions += [{"coordinates": coord, "orientation": orientation} for coord in allowedCoordinates]
 
         return allowedActions
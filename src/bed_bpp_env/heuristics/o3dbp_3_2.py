@@ -2,22 +2,27 @@
 This heuristic demonstrates the task O3DBP-3-2, i.e., it can choose one of the two next items to palletize and knows the dimensions of another item in advance. In every call of `getAction`, the heuristic selects the action with the highest score.
 """
 
+import configparser
 import copy
-import gc
 import logging
-import multiprocessing
-import time
-from typing import Tuple
+from typing import Optional, Tuple
 
 import numpy as np
 
 from bed_bpp_env.environment.sim_pal_env import SimPalEnv
+from bed_bpp_env.heuristics.corner_point_scoring import score_corner_points
+from bed_bpp_env.heuristics.lookahead_pool import LookaheadPool
+from bed_bpp_env.utils.configuration import USEDCONFIGURATIONFILE
 
 logger = logging.getLogger(__name__)
 
+conf = configparser.ConfigParser()
+conf.read(USEDCONFIGURATIONFILE)
+
 LIMIT_COMBINATIONS_AMOUNT = True
 N_LIMIT_COMBINATIONS = 25
-MULTI_PROCESSING_CHUNKSIZE = 1000
+MULTI_PROCESSING_WORKERS = conf.getint("heuristics", "lookahead_workers", fallback=0)
+MULTI_PROCESSING_CHUNKSIZE = conf.getint("heuristics", "lookahead_chunksize", fallback=5)
 
 
 class O3DBP_3_2:
@@ -30,13 +35,17 @@ class O3DBP_3_2:
         The amount of known items.
     selection: int (default = 2)
         The amount of items that can be seleceted for the next palletizing step.
+    workers: int (default = MULTI_PROCESSING_WORKERS)
+        The amount of worker processes that simulate the upcoming items. If it is `0`, the simulations run serially.
+    chunksize: int (default = MULTI_PROCESSING_CHUNKSIZE)
+        The amount of action sequences that are sent to a worker at once.
 
     Attributes.
     -----------
     __Info: dict
         The additional info that is provided by the palletizing environment.
-    FUNC_VECTORSCOREEVAL: np.vectorize function
-        Vectorized function to make the dot product of weights and components of score.
+    __LookaheadPool: LookaheadPool
+        The worker processes that simulate the upcoming items, `None` if the simulations run serially.
     __NPreview: int
         The amount of known items in advance.
     __NSelection: int
@@ -44,12 +53,18 @@ class O3DBP_3_2:
     __SCORE_WEIGHTS: list
         The weights that are used to determine the score of an action.
     __SimEnvironment: SimPalEnv
-        A deepcopy of the palletizing environment for which an action is determined. This deepcopy is needed for estimating the scores of the possible actions.
+        A simulation of the palletizing environment for which an action is determined. Its snapshots are needed for estimating the scores of the possible actions.
     """
 
-    def __init__(self, preview: int = 3, selection: int = 2) -> None:
+    def __init__(
+        self,
+        preview: int = 3,
+        selection: int = 2,
+        workers: int = MULTI_PROCESSING_WORKERS,
+        chunksize: int = MULTI_PROCESSING_CHUNKSIZE,
+    ) -> None:
         self.__SimEnvironment = None
-        """A deepcopy of the palletizing environment for which an action is determined. This deepcopy is needed for estimating the scores of the possible actions."""
+        """A simulation of the palletizing environment for which an action is determined. Its snapshots are needed for estimating the scores of the possible actions."""
 
         self.__NPreview = preview
         """The amount of known items in advance."""
@@ -61,8 +76,21 @@ class O3DBP_3_2:
         """The weights that are used to determine the score of an action."""
         logger.info(f"used the scores {self.__SCORE_WEIGHTS} for rating of corner points.")
 
-        self.FUNC_VECTORSCOREEVAL = np.vectorize(self.multiplyWeightScore, excluded=[1], signature="(n)->()")
-        """Vectorized function to make the dot product of weights and components of score."""
+        self.__LookaheadPool: Optional[LookaheadPool] = LookaheadPool(workers, chunksize) if workers > 0 else None
+        """The worker processes that simulate the upcoming items, `None` if the simulations run serially."""
+        logger.info(f"simulate the upcoming items with {workers} workers and chunksize {chunksize}")
+
+    def __getstate__(self) -> dict:
+        # the workers receive the heuristic together with the state of the simulation environment
+        state = self.__dict__.copy()
+        state["_O3DBP_3_2__SimEnvironment"] = None
+        state["_O3DBP_3_2__LookaheadPool"] = None
+        return state
+
+    def close(self) -> None:
+        """Stops the worker processes of the heuristic."""
+        if self.__LookaheadPool is not None:
+            self.__LookaheadPool.close()
 
     def setSimEnv(self, environment: SimPalEnv) -> None:
         """
@@ -120,7 +148,7 @@ class O3DBP_3_2:
 
                 estimatedHeightInCP = self.__estimatePlacementZCoordinate(observation, tempCornerPoint, itemSize)
 
-                heightOrigin = observation[0, 0]
+                heightOrigin = int(observation[0, 0])
                 if heightOrigin - estimatedHeightInCP < -20:
                     logger.info(f"HEIGHT IN CORNER POINT IS TOO BIG -> SET CP to ORIGIN")
                     firstCornerPointAction = {"x": 0, "y": 0, "orientation": 0, "item": actionItem}
@@ -135,61 +163,6 @@ class O3DBP_3_2:
 
         return firstCornerPointAction, successful
 
-    def __getScoreWeightsOfCornerPoint(self, observation: np.ndarray, cornerpoint: list, itemsize: list) -> float:
-        """
-        Returns the components of the score of the action.
-
-        Parameters.
-        -----------
-        observation: np.ndarray
-            The observation of the environment.
-        cornerpoint: list
-            The corner point for which the score is calculated. The corner point looks like `[x, y, z, item_orientation]`.
-        itemsize: list
-            The size of the item.
-
-        Returns.
-        --------
-        score: float
-            The score of the given corner point.
-
-        Notes.
-        ------
-        The heuristic is desgined that it takes the action with the maximum score. Hence, this method must define that the best action has the highest score.
-        """
-        itemOrientation = cornerpoint[-1]
-
-        estimatedSupportArea = self.__estimateSupportArea(observation, cornerpoint, itemsize)
-        estimatedZCoordinate = self.__estimatePlacementZCoordinate(observation, cornerpoint, itemsize)
-
-        distanceOrigin3D = self.__getDistanceToOrigin(cornerpoint, zcoordinate=estimatedZCoordinate, dimensions=3)
-        # distanceOrigin2D = self.__getDistanceToOrigin(cornerpoint, dimensions=2)
-
-        normedDistOrig3D = distanceOrigin3D / np.sqrt(
-            np.square(observation.shape[0]) + np.square(observation.shape[1]) + np.square(2000)
-        )
-        values = [
-            estimatedSupportArea,
-            estimatedZCoordinate / np.amax(observation, initial=estimatedZCoordinate),
-            itemOrientation,
-            normedDistOrig3D,
-        ]
-        return values
-
-    def multiplyWeightScore(self, values: list, weights: list) -> float:
-        """
-        Returns the dot product of values and weights.
-
-        Note.
-        -----
-        Must be public when multiprocessing is used.
-        """
-        if values.shape == (0,):
-            # no values given
-            values = [0] * len(weights)
-
-        return np.dot(values, weights)
-
     def __estimatePlacementZCoordinate(self, observation: np.ndarray, cornerpoint: list, itemsize: list) -> int:
         """
         Estimates the z-coordinate when an item is placed in the given cornerpoint.
@@ -217,80 +190,10 @@ class O3DBP_3_2:
             deltaX, deltaY = int(itemsize[1]), int(itemsize[0])
 
         estimatedHeight = (
-            np.amax(observation[cpYCoord : cpYCoord + deltaY, cpXCoord : cpXCoord + deltaX]) + itemsize[-1]
+            int(np.amax(observation[cpYCoord : cpYCoord + deltaY, cpXCoord : cpXCoord + deltaX])) + itemsize[-1]
         )
         return estimatedHeight
 
-    def __estimateSupportArea(self, observation: np.ndarray, cornerpoint: list, itemsize: list) -> float:
-        """
-        Estimates the direct support area of an item that is placed in the given cornerpoint. A height tolerance of 10 mm is used.
-
-        Parameters.
-        -----------
-        observation: np.ndarray
-            The heights on each point of the target.
-        cornerpoint: list (of length 4)
-            The coordinates of the cornerpoint and the item orientation for which the support area is estimated.
-        itemsize: list
-            The size of the item.
-
-        Returns.
-        --------
-        estimatedSuppArea: float
-            The estimated support area of the item.
-        """
-        cpXCoord, cpYCoord = cornerpoint[0], cornerpoint[1]
-        itemOrientation = cornerpoint[-1]
-
-        if itemOrientation == 0:
-            deltaX, deltaY = int(itemsize[0]), int(itemsize[1])
-        elif itemOrientation == 1:
-            deltaX, deltaY = int(itemsize[1]), int(itemsize[0])
-
-        placementArea = observation[cpYCoord : cpYCoord + deltaY, cpXCoord : cpXCoord + deltaX]
-        maxHeightPlacementArea = np.amax(placementArea)
-
-        # use tolerance of 10 mm
-        tolerance = 10
-        estimatedSuppArea = (
-            np.count_nonzero(
-                (placementArea > maxHeightPlacementArea - tolerance)
-                & (placementArea < maxHeightPlacementArea + tolerance)
-            )
-            / placementArea.size
-        )
-        return estimatedSuppArea
-
-    def __getDistanceToOrigin(self, cornerpoint: list, zcoordinate: float = None, dimensions: int = 2) -> float:
-        """
-        Returns the distance of the corner point to the origin in $\mathbb{R}^d$, where $d \in \{2, 3 \}$. For $d=2$ the distance to (0,0) is determined, for $d=3$ the distance to (0,0,0).
-
-        Parameters.
-        -----------
-        cornerpoint: list
-            The corner point for which the distance to origin is determined.
-        zcoordiante: float=None
-            The z-coordinate of the corner point.
-        dimensions: int=2
-            The dimension for which the distance is returned (either 2 or 3).
-
-        Returns.
-        --------
-        distance: float
-            The distance to the origin in millimeters.
-        """
-        if dimensions == 3:
-            if zcoordinate is None:
-                raise ValueError("no z-coordinate given")
-            else:
-                return np.sqrt(np.square(cornerpoint[0]) + np.square(cornerpoint[1]) + np.square(zcoordinate))
-
-        elif dimensions == 2:
-            return np.sqrt(np.square(cornerpoint[0]) + np.square(cornerpoint[1]))
-
-        else:
-            raise ValueError("dimensions must be in {2,3}!")
-
     def __extractCornerPointsFromEnvironmentInfo(self, cornerpointinfo: dict) -> list:
         """
         This method extracts the corner points from the corner point information the environment returns in step.
@@ -358,8 +261,8 @@ class O3DBP_3_2:
         >>> estimatedScores
         [{'initial_action': {...}, 'max_score': -0.8483328405274684, 'max_score_corner_point': [...]}, {'initial_action': {...}, 'max_score': -0.8483328405274684, 'max_score_corner_point': [...]}]
         """
-        # prepare actions depending on items that can be selected
-        collectionActionAndScore = []
+        # prepare actions depending on items that can be selected, the corner points of all items are scored at once
+        candidateCP, candidateItems, candidateItemSizes = [], [], []
         for item in info.get("next_items_selection", []):
             itemArticle = item.get("article")
             itemSize = item.get("length/mm"), item.get("width/mm"), item.get("height/mm")
@@ -371,57 +274,53 @@ class O3DBP_3_2:
                     possibleCP = self.__checkWhetherCornerPointsHaveToMoveOutwards(
                         possibleCP, itemSize, observation.shape
                     )
-                    weightScoresCornerPoints = [
-                        self.__getScoreWeightsOfCornerPoint(observation, cp, itemSize) for cp in possibleCP
-                    ]
-                    scoresCornerPoints = self.FUNC_VECTORSCOREEVAL(weightScoresCornerPoints, self.__SCORE_WEIGHTS)
-                    collectionActionAndScore += [
-                        {
-                            "actions": [{"x": cp[0], "y": cp[1], "orientation": cp[-1], "item": item}],
-                            "scores": [cpScore],
-                        }
-                        for cp, cpScore in zip(possibleCP, list(scoresCornerPoints))
-                    ]
+                    candidateCP += possibleCP
+                    candidateItems += [item] * len(possibleCP)
+                    candidateItemSizes += [itemSize] * len(possibleCP)
+
+        scoresCornerPoints = score_corner_points(observation, candidateCP, candidateItemSizes, self.__SCORE_WEIGHTS)
+        collectionActionAndScore = [
+            {
+                "actions": [{"x": cp[0], "y": cp[1], "orientation": cp[-1], "item": item}],
+                "scores": [cpScore],
+            }
+            for cp, item, cpScore in zip(candidateCP, candidateItems, list(scoresCornerPoints))
+        ]
 
         # HERE STARTS THE SCORE ESTIMATION
+        self.__MPStepInfo = {
+            "next_items_selection": info.get("next_items_selection"),
+            "next_items_preview": info.get("next_items_preview"),
+        }
+        if self.__LookaheadPool is None:
+            # the actions are simulated in the simulation environment, which is restored to this snapshot afterwards
+            simEnvironmentSnapshot = self.__SimEnvironment.snapshot()
+        else:
+            # the workers receive the state once per decision, the stored orders are not needed for the simulation
+            templateSimEnv = copy.copy(self.__SimEnvironment)
+            templateSimEnv.remStoredOrder()
+            self.__LookaheadPool.set_state(self.mpStepSimulation, templateSimEnv)
+
         for nPreviewStep in range(self.__NPreview - 1):
             if LIMIT_COMBINATIONS_AMOUNT:
                 collectionActionAndScore.sort(key=lambda el: np.sum(el["scores"]), reverse=True)
                 collectionActionAndScore = collectionActionAndScore[:N_LIMIT_COMBINATIONS]
                 actionsForEstimation = [collEntry["actions"] for collEntry in collectionActionAndScore]
-                templateSimEnv = copy.deepcopy(self.__SimEnvironment)
-                templateSimEnv.remStoredOrder()
-                mpEnvs = [copy.deepcopy(templateSimEnv) for _ in actionsForEstimation]
-                actionsForEstimation = [(env, action) for env, action in zip(mpEnvs, actionsForEstimation)]
 
             else:
                 # we need all actions that should be estimated
                 actionsForEstimation = [collEntry["actions"] for collEntry in collectionActionAndScore]
-                templateSimEnv = copy.deepcopy(self.__SimEnvironment)
-                templateSimEnv.remStoredOrder()
-                mpEnvs = [copy.deepcopy(templateSimEnv) for _ in actionsForEstimation]
-                actionsForEstimation = [(env, action) for env, action in zip(mpEnvs, actionsForEstimation)]
-
-            self.__MPStepInfo = {
-                "next_items_selection": info.get("next_items_selection"),
-                "next_items_preview": info.get("next_items_preview"),
-            }
 
-            # startTime = time.time()
-            # # ==================================================
-            # with multiprocessing.Pool(processes=4) as pool:
-            #     startMap = time.time()
-            #     resultingCornerPointsForEstimation = pool.starmap(self.mpStepSimulation, actionsForEstimation, MULTI_PROCESSING_CHUNKSIZE)
-            #     print(f"\tpool.map | finished {round((time.time()-startMap)*1000)} ms")
-            # # ==================================================
-            # print(f"mp.pool CALL & Return | mp finished {round((time.time()-startTime)*1000)} ms\n==========")
-            # startTime = time.time()
-            resultingCornerPointsForEstimation = [self.mpStepSimulation(*entry) for entry in actionsForEstimation]
-            # logger.info(f"est. for {len(collectionActionAndScore)} combinations took {round((time.time()-startTime)*1000)} ms")
+            if self.__LookaheadPool is None:
+                resultingCornerPointsForEstimation = []
+                for actions in actionsForEstimation:
+                    resultingCornerPointsForEstimation.append(self.mpStepSimulation(self.__SimEnvironment, actions))
+                    self.__SimEnvironment.restore(simEnvironmentSnapshot)
+            else:
+                resultingCornerPointsForEstimation = self.__LookaheadPool.map(actionsForEstimation)
 
             # free memory
             del actionsForEstimation
-            del mpEnvs
 
             tempCollectionActionsAndScores = []
             for i_cp, cpResults in enumerate(resultingCornerPointsForEstimation):
@@ -441,27 +340,26 @@ class O3DBP_3_2:
             if tempCollectionActionsAndScores == []:
                 break
             collectionActionAndScore = tempCollectionActionsAndScores
+        if self.__LookaheadPool is None:
+            self.__SimEnvironment.release(simEnvironmentSnapshot)
 
         # TAKE THE ACTION WITH THE HIGHEST SCORE!
         collectionScores = [np.sum(collEntry["scores"]) for collEntry in collectionActionAndScore]
         maxScoreIndex = np.argmax(collectionScores)
 
         maxScoreAction = collectionActionAndScore[maxScoreIndex]["actions"][0]
-        print(f"use {maxScoreIndex}.-action: \n==========\n{maxScoreAction}\n==========\n")
+        logger.debug(f"use {maxScoreIndex}.-action: {maxScoreAction}")
 
-        # free memory
-        del tempCollectionActionsAndScores
-        gc.collect()
         return maxScoreAction
 
-    def mpStepSimulation(self, dcSimEnv: SimPalEnv, stepactions: list) -> dict:
+    def mpStepSimulation(self, simenv: SimPalEnv, stepactions: list) -> dict:
         """
         We make the steps that are given. After doing these actions, we return a dictionary that holds the information about each step.
 
         Parameters.
         -----------
-        dcSimEnv: SimPalEnv
-            A deepcopy of the template self.__SimEnvironment.
+        simenv: SimPalEnv
+            The simulation environment in the state from which the actions start. The caller restores its state afterwards.
         stepactions: list
             All step actions that are required to create the actual state of the environment, starting from the stored template state.
 
@@ -471,11 +369,11 @@ class O3DBP_3_2:
             Holds information about the resulting corner points and their scores.
         """
         returnInformation = {"n_resulting_corner_points": 0, "resulting_corner_points": None, "scores": None}
-        dcSimEnv.setItems(
+        simenv.setItems(
             preview=self.__MPStepInfo.get("next_items_preview"), selection=self.__MPStepInfo.get("next_items_selection")
         )
         for action in stepactions:
-            newObservation, _, done, nextInfo = dcSimEnv.step(action)
+            newObservation, _, done, nextInfo = simenv.step(action)
             if done:
                 break
 
@@ -493,10 +391,9 @@ class O3DBP_3_2:
             possibleCP = self.__checkWhetherCornerPointsHaveToMoveOutwards(
                 possibleCP, nextItemSize, newObservation.shape
             )
-            weightScoresCornerPoints = [
-                self.__getScoreWeightsOfCornerPoint(newObservation, cp, nextItemSize) for cp in possibleCP
-            ]
-            scoresCornerPoints = self.FUNC_VECTORSCOREEVAL(weightScoresCornerPoints, self.__SCORE_WEIGHTS)
+            scoresCornerPoints = score_corner_points(
+                newObservation, possibleCP, [nextItemSize] * len(possibleCP), self.__SCORE_WEIGHTS
+            )
 
             returnInformation["n_resulting_corner_points"] = len(possibleCP)
             returnInformation["resulting_corner_points"] = possibleCP
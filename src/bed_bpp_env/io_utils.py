@@ -1,11 +1,25 @@
 """Contains io utils for this package."""
 
 import json
+import os
+import re
+from collections.abc import Iterator
 from pathlib import Path
+from typing import Any, Optional, Self, TextIO
 
 from bed_bpp_env.data_model.order import Order
 from bed_bpp_env.data_model.packing_plan import PackingPlan
 
+STREAM_CHUNK_SIZE = 1 << 16
+"""The amount of characters that are read at once when a JSON file is streamed."""
+
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"\s*")
+_UNNESTED_TEXT = re.compile(r'[^"\[\]{}]*+(?:"[^"\\]*+(?:\\.[^"\\]*+)*+"[^"\[\]{}]*+)*+')
+"""The text up to the next bracket that is not part of a string, it ends before a string that is not complete."""
+_NUMBER_CONTINUATION = ".eE+-0123456789"
+"""The characters that continue a number, the empty string represents the end of the buffer."""
+
 
 def load_order_sequence(file_path: Path) -> list[Order]:
     """Loads an order sequence that is stored in the given file path.
@@ -16,22 +30,40 @@ def load_order_sequence(file_path: Path) -> list[Order]:
     Returns:
         list[Order]: The deserialized order sequence.
     """
-    with open(file_path) as file:
-        serialized_order_sequence: dict = json.load(file, parse_int=False)
+    return list(iter_order_sequence(file_path))
 
-    order_sequence = []
 
-    for order_key, order_value in serialized_order_sequence.items():
+def iter_order_sequence(file_path: Path) -> Iterator[Order]:
+    """Yields the orders of the order sequence that is stored in the given file path one after another. Only the
+    current order is kept in memory.
+
+    Args:
+        file_path (Path): The path to the file that contains the order sequence.
+
+    Yields:
+        Order: The deserialized orders.
+    """
+    for order_key, order_value in iter_json_object_items(file_path):
         serialized_with_id: dict = order_value
         serialized_with_id.update({"id": order_key})
-        order_i = Order.from_dict(order_value)
-        order_sequence.append(order_i)
+        yield Order.from_dict(serialized_with_id)
+
 
-    return order_sequence
+def iter_order_ids(file_path: Path) -> Iterator[str]:
+    """Yields the identifiers of the orders that are stored in the given file path without creating the orders.
+
+    Args:
+        file_path (Path): The path to the file that contains the order sequence.
+
+    Yields:
+        str: The identifiers of the orders.
+    """
+    yield from iter_json_object_keys(file_path)
 
 
 def load_packing_plan_sequence(file_path: Path) -> list[PackingPlan]:
-    """Loads a packing plan sequence that is stored in the given file path.
+    """Loads a packing plan sequence that is stored in the given file path. Files with the suffix `.jsonl` are read as
+    written by `PackingPlanStreamWriter`.
 
     Args:
         file_path (Path): The path to the file that contains the packing plans.
@@ -39,14 +71,304 @@ def load_packing_plan_sequence(file_path: Path) -> list[PackingPlan]:
     Returns:
         list[PackingPlan]: The deserialized packing plan sequence.
     """
-    with open(file_path) as file:
-        serialized_packing_plan_sequence: dict = json.load(file, parse_int=False)
+    return list(iter_packing_plan_sequence(file_path))
 
-    packing_plan_sequence = []
 
-    for packing_plan_id, actions in serialized_packing_plan_sequence.items():
+def iter_packing_plan_sequence(file_path: Path) -> Iterator[PackingPlan]:
+    """Yields the packing plans that are stored in the given file path one after another. Only the current packing plan
+    is kept in memory. Files with the suffix `.jsonl` are read as written by `PackingPlanStreamWriter`.
+
+    Args:
+        file_path (Path): The path to the file that contains the packing plans.
+
+    Yields:
+        PackingPlan: The deserialized packing plans.
+    """
+    if Path(file_path).suffix == ".jsonl":
+        serialized_packing_plans = iter_packing_plan_stream(file_path)
+    else:
+        serialized_packing_plans = iter_json_object_items(file_path)
+
+    for packing_plan_id, actions in serialized_packing_plans:
         serialized = {"id": packing_plan_id, "actions": actions}
-        packing_plan_i = PackingPlan.from_dict(serialized)
-        packing_plan_sequence.append(packing_plan_i)
+        yield PackingPlan.from_dict(serialized)
+
+
+def iter_json_object_items(file_path: Path, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[tuple[str, Any]]:
+    """Yields the keys and the values of the JSON object that is stored in the given file path one after another. The
+    file is read in chunks, hence, only the current value is kept in memory instead of the entire object.
+
+    Args:
+        file_path (Path): The path to the file that contains a JSON object.
+        chunk_size (int, optional): The amount of characters that are read at once. Defaults to `STREAM_CHUNK_SIZE`.
+
+    Yields:
+        tuple[str, Any]: The key and the decoded value of each member of the object.
+    """
+    with open(file_path) as file:
+        stream = _JsonStream(file, chunk_size)
+        for key in _iter_object_keys(stream, file_path):
+            yield key, stream.decode()
+
+
+def iter_json_object_keys(file_path: Path, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    """Yields the keys of the JSON object that is stored in the given file path one after another. The values are
+    skipped without decoding them, i.e., only the nesting of arrays and objects and the bounds of strings are tracked.
+
+    Args:
+        file_path (Path): The path to the file that contains a JSON object.
+        chunk_size (int, optional): The amount of characters that are read at once. Defaults to `STREAM_CHUNK_SIZE`.
+
+    Yields:
+        str: The key of each member of the object.
+    """
+    with open(file_path) as file:
+        stream = _JsonStream(file, chunk_size)
+        for key in _iter_object_keys(stream, file_path):
+            stream.skip()
+            yield key
+
+
+def _iter_object_keys(stream: "_JsonStream", file_path: Path) -> Iterator[str]:
+    """Yields the keys of the JSON object at the current position of the stream. The value of each key has to be
+    consumed before the next key is requested."""
+    stream.consume("{")
+    if stream.peek() == "}":
+        return
+
+    while True:
+        key = stream.decode()
+        if not isinstance(key, str):
+            raise ValueError(f"expected a key in {file_path}, but got {key!r}")
+        stream.consume(":")
+        yield key
+
+        if stream.peek() != ",":
+            stream.consume("}")
+            return
+        stream.consume(",")
+
+
+class _JsonStream:
+    """Decodes JSON values one after another from a file that is read in chunks."""
+
+    def __init__(self, file: TextIO, chunk_size: int) -> None:
+        self._file = file
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def peek(self) -> str:
+        """Returns the next character that is not a whitespace without consuming it, `""` at the end of the file."""
+        while True:
+            self._position = _WHITESPACE.match(self._buffer, self._position).end()
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._read():
+                return ""
+
+    def consume(self, expected: str) -> None:
+        """Consumes the next character that is not a whitespace, which must be the expected one."""
+        character = self.peek()
+        if character != expected:
+            raise ValueError(f"expected {expected!r} in the JSON stream, but got {character!r}")
+        self._position += 1
+
+    def decode(self) -> Any:
+        """Decodes and consumes the next value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _JSON_DECODER.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                # the value might be incomplete
+                if not self._read():
+                    raise
+                continue
+
+            # a number at the end of the buffer might continue in the next chunk, e.g., `-2` or `-2.` of `-2.5`, which is
+            # detected by the characters that may continue a number but may not follow a complete value
+            if self._buffer[end : end + 1] in _NUMBER_CONTINUATION and self._read():
+                continue
 
-    return packing_plan_sequence
+            self._position = end
+            return value
+
+    def skip(self) -> None:
+        """Consumes the next value without decoding it. The brackets of arrays and objects are counted outside of
+        strings until the value is closed, and the text is consumed chunk by chunk, thus, neither the value nor its
+        text are kept in memory. The skipped value is not validated."""
+        if self.peek() not in ("[", "{"):
+            # strings, numbers, and literals are not nested
+            self.decode()
+            return
+
+        depth = 0
+        while True:
+            end = _UNNESTED_TEXT.match(self._buffer, self._position).end()
+            if end == len(self._buffer) or self._buffer[end] == '"':
+                # the text or a string continues in the next chunk
+                self._position = end
+                self._read_or_raise()
+                continue
+
+            self._position = end + 1
+            depth += 1 if self._buffer[end] in "[{" else -1
+            if depth == 0:
+                return
+
+    def _read_or_raise(self) -> None:
+        """Reads the next chunk, the file must have characters left."""
+        if not self._read():
+            raise ValueError("the JSON stream ended within a value")
+
+    def _read(self) -> bool:
+        """Reads the next chunk and returns whether the file had characters left. The consumed characters are dropped
+        and at least as many characters as are buffered are read, thus, a long value is decoded a few times at most."""
+        if self._eof:
+            return False
+
+        self._buffer = self._buffer[self._position :]
+        self._position = 0
+        chunk = self._file.read(max(self._chunk_size, len(self._buffer)))
+        if chunk == "":
+            self._eof = True
+            return False
+
+        self._buffer += chunk
+        return True
+
+
+class StreamedLookup:
+    """Looks up the values of streamed key-value pairs by their keys. If the keys are requested in the order of the
+    stream, only the current value is kept in memory. Otherwise, the values that are skipped are kept until they are
+    requested.
+
+    Args:
+        items (Iterator[tuple[str, Any]]): The key-value pairs, e.g., from `iter_json_object_items`.
+    """
+
+    def __init__(self, items: Iterator[tuple[str, Any]]) -> None:
+        self._items = iter(items)
+        self._skipped: dict[str, Any] = {}
+
+    def pop(self, key: str) -> Any:
+        """Returns the value of the given key and removes it.
+
+        Args:
+            key (str): The key of the value.
+
+        Returns:
+            Any: The value of the key.
+        """
+        if key in self._skipped:
+            return self._skipped.pop(key)
+
+        for item_key, value in self._items:
+            if item_key == key:
+                return value
+            self._skipped[item_key] = value
+
+        raise KeyError(key)
+
+
+class PackingPlanStreamWriter:
+    """Writes packing plans as JSON Lines, i.e., each packing plan is appended as a line `{"<order id>": [actions]}`
+    when its order is finished and it is not kept in memory afterwards. The file is created when the first packing plan
+    is written, an existing file is overwritten. After the writer is closed, further packing plans are appended.
+
+    Args:
+        file_path (Path): The path to the `.jsonl` file.
+        fsync_interval (int, optional): The amount of packing plans after which the written lines are flushed and
+            synchronized to the disk. Defaults to `0`, i.e., only when the writer is closed.
+    """
+
+    def __init__(self, file_path: Path, fsync_interval: int = 0) -> None:
+        if fsync_interval < 0:
+            raise ValueError(f"the fsync interval must not be negative, but is {fsync_interval}")
+
+        self.file_path = Path(file_path)
+        """The path to the `.jsonl` file."""
+        self.fsync_interval = fsync_interval
+        """The amount of packing plans after which the written lines are synchronized, `0` if only when closing."""
+
+        self._file: Optional[TextIO] = None
+        """The opened file, `None` before the first packing plan is written and after the writer is closed."""
+        self._n_unsynchronized = 0
+        """The amount of packing plans that were written since the last synchronization."""
+        self._created = False
+        """Indicates whether the file was created by this writer."""
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, order_id: str, actions: list[dict]) -> None:
+        """Appends the packing plan of an order.
+
+        Args:
+            order_id (str): The identifier of the order.
+            actions (list[dict]): The serializable actions of the packing plan.
+        """
+        if self._file is None:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.file_path, "a" if self._created else "w")
+            self._created = True
+
+        self._file.write(json.dumps({order_id: actions}) + "\n")
+
+        self._n_unsynchronized += 1
+        if self.fsync_interval > 0 and self._n_unsynchronized >= self.fsync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """Flushes the written lines and synchronizes them to the disk."""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._n_unsynchronized = 0
+
+    def close(self) -> None:
+        """Synchronizes the written lines and closes the file."""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+
+def iter_packing_plan_stream(file_path: Path) -> Iterator[tuple[str, list]]:
+    """Yields the packing plans of a file that was written by `PackingPlanStreamWriter` one after another.
+
+    Args:
+        file_path (Path): The path to the `.jsonl` file.
+
+    Yields:
+        tuple[str, list]: The identifier of the order and the serialized actions of its packing plan.
+    """
+    with open(file_path) as file:
+        for line in file:
+            if line.strip() == "":
+                continue
+            serialized_packing_plan: dict = json.loads(line, parse_int=False)
+            yield from serialized_packing_plan.items()
+
+
+def compact_packing_plan_stream(stream_path: Path, output_path: Path) -> None:
+    """Converts a file that was written by `PackingPlanStreamWriter` to a single JSON object whose keys are the order
+    identifiers and whose values are the actions, i.e., the format that is read by `load_packing_plan_sequence`. The
+    packing plans are converted one after another, hence, the stream is not loaded completely.
+
+    Args:
+        stream_path (Path): The path to the `.jsonl` file.
+        output_path (Path): The path to the created `.json` file.
+    """
+    with open(output_path, "w") as output_file:
+        output_file.write("{")
+        for i_packing_plan, (order_id, actions) in enumerate(iter_packing_plan_stream(stream_path)):
+            if i_packing_plan > 0:
+                output_file.write(", ")
+            output_file.write(f"{json.dumps(order_id)}: {json.dumps(actions)}")
+        output_file.write("}")
@@ -26,6 +26,12 @@ parser.add_argument(
     default=utils.getPathToExampleData().joinpath("5_bed-bpp.json"),
     help="Defines which data is used.",
 )
+parser.add_argument(
+    "--workers",
+    type=int,
+    default=None,
+    help="Defines the amount of worker processes for the lookahead, defaults to the value in the configuration.",
+)
 utils.arguments_parser.parse()
 
 
@@ -48,7 +54,11 @@ if __name__ == "__main__":
 
     # init heuristic
     _, nPreview, nSelection = utils.PARSEDARGUMENTS.get("task").split("-")
-    heuristic = O3DBP_3_2(preview=int(nPreview), selection=int(nSelection))
+    nWorkers = utils.PARSEDARGUMENTS.get("workers")
+    if nWorkers is None:
+        heuristic = O3DBP_3_2(preview=int(nPreview), selection=int(nSelection))
+    else:
+        heuristic = O3DBP_3_2(preview=int(nPreview), selection=int(nSelection), workers=nWorkers)
 
     dirOutputfile = utils.PARSEDARGUMENTS["data"]
     with open(dirOutputfile) as f:
@@ -80,6 +90,7 @@ if __name__ == "__main__":
                 simDone = True
 
     env.close()
+    heuristic.close()
 
     # run evaluation
     EVALUATION_SCRIPT_PATH = Path(__file__).parent / "script_evaluate_packing_plan.py"
@@ -5,10 +5,12 @@ are calculated.
 
 import gc
 import logging
+from collections import deque
+from collections.abc import Iterable
 from pathlib import Path
 
 from bed_bpp_env.data_model.order import Order
-from bed_bpp_env.io_utils import load_order_sequence
+from bed_bpp_env.io_utils import StreamedLookup, iter_json_object_items
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +18,7 @@ ARG_NAME_ORDER_PATH = "data"
 ARG_NAME_PACKING_PLAN_PATH = "packing_plan"
 ARG_NAME_BLENDER_BACKGROUND = "background"
 ARG_NAME_RENDER_SCENE = "render"
+ARG_NAME_NO_CACHE = "no_cache"
 
 COLORS_DIR = Path(__file__).parent / "visualization" / "colors"
 """The directory that contains the colors."""
@@ -49,11 +52,12 @@ def run_garbage_collector() -> None:
     gc.collect()
 
 
-def get_number_of_items_in_order_sequence(order_sequence: list[Order]) -> int:
+def get_number_of_items_in_order_sequence(order_sequence: Iterable[Order]) -> int:
     """Returns the total number of items in the given order sequence.
 
     Args:
-        order_sequence (list[Order]): The order sequence for that the items are counted.
+        order_sequence (Iterable[Order]): The order sequence for that the items are counted, e.g., a list or a
+            streamed order sequence.
 
     Returns:
         int: The number of items in the order sequence.
@@ -64,34 +68,35 @@ def get_number_of_items_in_order_sequence(order_sequence: list[Order]) -> int:
     return count
 
 
-def load_color_database_for_order_sequence(file_path: Path) -> dict[str, dict[str, str]]:
+def load_color_database_for_order_sequence(file_path: Path) -> StreamedLookup:
     """
-    Loads the color database that is stored in the given file path.
+    Loads the color database that is stored in the given file path. The colors of an order are read when they are
+    popped, i.e., the entire color database is not loaded at once.
 
     Args:
         file_path (Path): The path to the file.
 
     Returns:
-        dict[str, dict[str, str]]: The color data for the order sequence.
+        StreamedLookup: The color data for the order sequence, the keys are the identifiers of the orders.
     """
-    with open(file_path) as file:
-        color_db = json.load(file, parse_int=False)
-
-    return color_db
+    return StreamedLookup(iter_json_object_items(file_path))
 
 
 # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
 if __name__ == "__main__":
-    import json
+    from concurrent.futures import Future
     from time import perf_counter
 
     import bed_bpp_env.utils as utils
     from bed_bpp_env.evaluation import EVALOUTPUTDIR
     from bed_bpp_env.evaluation.blender.configuration import retrieve_blender_path
-    from bed_bpp_env.evaluation.blender.stability_check import run_blender_stability_check_in_subprocess
+    from bed_bpp_env.evaluation.blender.stability_check_pool import StabilityCheckPool, StabilityCheckResult
     from bed_bpp_env.evaluation.packing_plan_evaluator import PackingPlanEvaluator
-    from bed_bpp_env.io_utils import load_packing_plan_sequence
+    from bed_bpp_env.evaluation.result_cache import DEFAULT_RESULT_CACHE_PATH, EvaluationResultCache
+    from bed_bpp_env.evaluation.stability_results import STABILITY_FILE_NAME, StabilityResultStore
+    from bed_bpp_env.evaluation.static_stability import StaticStability
+    from bed_bpp_env.io_utils import iter_order_sequence, iter_packing_plan_sequence
     from bed_bpp_env.utils import ENTIRECONFIG, PARSEDARGUMENTS, getPathToExampleData
 
     # configure the parser of the given arguments
@@ -122,56 +127,112 @@ if __name__ == "__main__":
         default=False,
         help="Indicates whether the created scenes are written to disk.",
     )
+    parser.add_argument(
+        f"--{ARG_NAME_NO_CACHE}",
+        action="store_true",
+        default=False,
+        help="Indicates whether the cached results of previous evaluations are ignored.",
+    )
     utils.arguments_parser.parse()
     args = PARSEDARGUMENTS
     logger.info(f"got arguments: {args}")
 
     order_sequence_path, packing_plans_path, run_blender_in_background, render_scene = unpack_parsed_arguments(args)
 
-    PACKING_PLANS = load_packing_plan_sequence(packing_plans_path)
-    order_sequence = load_order_sequence(order_sequence_path)
-
-    with open(order_sequence_path) as file:
-        BENDATA: dict[str, dict[str, str | float | int]] = json.load(file, parse_int=False)
-
-    number_of_items_in_order_sequence = get_number_of_items_in_order_sequence(order_sequence)
+    # the files are streamed, i.e., only the current order and packing plan are kept in memory
+    number_of_items_in_order_sequence = get_number_of_items_in_order_sequence(iter_order_sequence(order_sequence_path))
+    orders = StreamedLookup((order.id, order) for order in iter_order_sequence(order_sequence_path))
     logger.info(f"have {number_of_items_in_order_sequence} items in {order_sequence_path}")
 
     file_color_db = COLORS_DIR / f"colordb_{order_sequence_path.name}"
     color_database_for_order_sequence = load_color_database_for_order_sequence(file_color_db)
 
-    packing_plan_evaluator = PackingPlanEvaluator()
     evaluation_configuration = ENTIRECONFIG["evaluation"]
+    result_cache = None
+    if not args.get(ARG_NAME_NO_CACHE):
+        result_cache_path = evaluation_configuration.get("result_cache", fallback="")
+        result_cache = EvaluationResultCache(
+            Path(result_cache_path) if result_cache_path else DEFAULT_RESULT_CACHE_PATH
+        )
+    # the results of the stability checks are indexed in memory, hence, the stability file is read at most once
+    stability_results = StabilityResultStore(EVALOUTPUTDIR / STABILITY_FILE_NAME)
+    packing_plan_evaluator = PackingPlanEvaluator(result_cache, stability_results)
 
     blender_path = retrieve_blender_path(evaluation_configuration)
-
-    # Start Evaluation
-    while len(PACKING_PLANS):
-        packing_plan = PACKING_PLANS.pop(0)
-
-        order_dict = BENDATA.pop(packing_plan.id)
-        order_init_kwargs = order_dict.copy()
-        order_init_kwargs.update({"id": packing_plan.id})
-        order = Order.from_dict(order_init_kwargs)
-        # TODO (florian): Add a check that tests whether the packing plan contains the same items as the order.
-
-        start_time = perf_counter()
-        run_blender_stability_check_in_subprocess(
-            blender_path=blender_path,
-            order=order,
-            packing_plan=packing_plan,
-            output_dir=EVALOUTPUTDIR,
-            colors=color_database_for_order_sequence.pop(packing_plan.id),
-            run_blender_in_background=run_blender_in_background,
-            render_scene=render_scene,
-        )
-        logger.info(f"blender stability check took {round(perf_counter() - start_time, 3)} seconds")
-        # Check whether to collect garbage
-        if not (len(PACKING_PLANS) % 10):
-            run_garbage_collector()
+    n_workers = evaluation_configuration.getint("stability_check_workers", fallback=1)
+    timeout = evaluation_configuration.getfloat("stability_check_timeout", fallback=0) or None
+    max_attempts = 1 + evaluation_configuration.getint("stability_check_retries", fallback=1)
+    persistent_workers = evaluation_configuration.getboolean("stability_check_persistent_workers", fallback=False)
+    static_precheck = evaluation_configuration.getboolean("static_stability_precheck", fallback=False)
+
+    # the checks are evaluated in the sequence of the packing plans, while the next ones are simulated; at most
+    # `2 * n_workers` checks are pending, such that the streamed files are not loaded entirely
+    pending_checks = deque()
+    max_pending_checks = 2 * n_workers
+
+    def evaluate_oldest_check() -> None:
+        packing_plan, order, future, skip_reason = pending_checks.popleft()
+        if future is None:
+            logger.info(f"skipped blender stability check of order {packing_plan.id}, {skip_reason}")
+        else:
+            result = future.result()
+            if result.movements is None:
+                logger.error(f"blender stability check of order {result.order_id} failed: {result.error}")
+            else:
+                stability_results.append(result.order_id, result.movements)
+                if result_cache is not None and result.attempts > 0:
+                    result_cache.put_stability(order, packing_plan, result.movements)
+            duration, attempts = round(result.duration, 3), result.attempts
+            logger.info(f"blender stability check took {duration} seconds in {attempts} attempts")
 
         # evaluate packing plan with evaluator
+        start_time = perf_counter()
         packing_plan_evaluator.evaluate(packing_plan, order)
-        logger.info(f"complete evaluation of order/packing plan took {round(perf_counter() - start_time, 3)} seconds")
+        logger.info(f"evaluation of order/packing plan took {round(perf_counter() - start_time, 3)} seconds")
+
+    # Start Evaluation
+    with StabilityCheckPool(
+        blender_path=blender_path,
+        output_dir=EVALOUTPUTDIR,
+        n_workers=n_workers,
+        timeout=timeout,
+        max_attempts=max_attempts,
+        run_blender_in_background=run_blender_in_background,
+        render_scene=render_scene,
+        persistent_workers=persistent_workers,
+    ) as stability_check_pool:
+        for i_packing_plan, packing_plan in enumerate(iter_packing_plan_sequence(packing_plans_path)):
+            order: Order = orders.pop(packing_plan.id)
+            # TODO (florian): Add a check that tests whether the packing plan contains the same items as the order.
+
+            colors = color_database_for_order_sequence.pop(packing_plan.id)
+            # only the piles that are neither clear-cut in the static stability check nor cached are simulated
+            future, skip_reason = None, None
+            if static_precheck and (
+                packing_plan_evaluator.precheckStability(packing_plan, order) is not StaticStability.UNCERTAIN
+            ):
+                skip_reason = "the static check is clear-cut"
+            elif packing_plan_evaluator.lookupCachedKPIs(packing_plan, order) is not None:
+                skip_reason = "the KPIs are cached"
+            else:
+                cached_movements = None if result_cache is None else result_cache.get_stability(order, packing_plan)
+                if cached_movements is not None:
+                    future = Future()
+                    future.set_result(StabilityCheckResult(packing_plan.id, cached_movements, attempts=0, duration=0.0))
+                else:
+                    future = stability_check_pool.submit(order, packing_plan, colors)
+            pending_checks.append((packing_plan, order, future, skip_reason))
+            if len(pending_checks) > max_pending_checks:
+                evaluate_oldest_check()
+
+            # Check whether to collect garbage
+            if not ((i_packing_plan + 1) % 10):
+                run_garbage_collector()
+
+        while pending_checks:
+            evaluate_oldest_check()
 
     packing_plan_evaluator.writeToFile(number_of_items_in_order_sequence)
+    if result_cache is not None:
+        result_cache.log_statistics()
+        result_cache.close()
@@ -15,6 +15,9 @@ import numpy as np
 
 from bed_bpp_env.data_model.item import Item
 from bed_bpp_env.data_model.order import Order
+from bed_bpp_env.environment.allowed_area import AllowedArea
+from bed_bpp_env.environment.block_pooling import block_pool, pooled_shape, update_block_pool
+from bed_bpp_env.environment.lazy_info import LazyInfo
 
 
 class RescaleWrapper(gym.Wrapper):
@@ -25,18 +28,24 @@ class RescaleWrapper(gym.Wrapper):
     -----------
     size_divisor: tuple (default = `(10, 10)`)
         Defines by which number the size of the original observation is divided. The first number is for the `x`-coordinates, the second for the `y`-coordinates.
+    incremental: bool (default = False)
+        Indicates whether the rescaled observation is updated in `step` only in the blocks that are covered by the footprint of the placed item, instead of rescaling the entire observation.
 
     Attributes.
     -----------
     __ACTION_MULTIPLICATOR: dict
         Defines by which number the size of the original observation is divided. Its format is optimized for the transo
+    __Incremental: bool
+        Indicates whether the rescaled observation is updated only in the footprint of the placed item.
+    __RescaledObservation: np.ndarray
+        The last rescaled observation, which is updated in the incremental mode.
     __SIZE_DIVISOR: tuple
         Defines by which number the size of the original observation is divided. Its format is optimized for np.arrays, i.e., it is stored in the way of `(divisor_for_y, divisor_for_x)`.
 
     Note that the original environment can be accessed by `self.env`.
     """
 
-    def __init__(self, env, size_divisor: tuple = (10, 10)) -> None:
+    def __init__(self, env, size_divisor: tuple = (10, 10), incremental: bool = False) -> None:
         super().__init__(env)
 
         self.__SIZE_DIVISOR = (size_divisor[1], size_divisor[0])
@@ -45,6 +54,11 @@ class RescaleWrapper(gym.Wrapper):
         self.__ACTION_MULTIPLICATOR = {"x": self.__SIZE_DIVISOR[1], "y": self.__SIZE_DIVISOR[0]}
         """This dictionary contains the values that are multiplied by the FBB coordinates of a given action."""
 
+        self.__Incremental = incremental
+        """Indicates whether the rescaled observation is updated only in the footprint of the placed item."""
+        self.__RescaledObservation: Optional[np.ndarray] = None
+        """The last rescaled observation, which is updated in the incremental mode."""
+
         self.env.setSizeMultiplicator(size_divisor)
 
     def reset(self, order_sequence: Optional[list[Order]] = None) -> tuple:
@@ -66,9 +80,7 @@ class RescaleWrapper(gym.Wrapper):
         """
         observation, info = self.env.reset(order_sequence)
         rescaledObservation = self.__generateRescaledObservation(observation)
-        info["allowed_area"] = self.__rescaleAllowedArea(info["allowed_area"])
-        info["next_items_selection"] = self.__rescaleSizeOfNextItems(info["next_items_selection"])
-        info["next_items_preview"] = self.__rescaleSizeOfNextItems(info["next_items_preview"])
+        self.__rescaleInfo(info)
         return rescaledObservation, info
 
     def step(self, action: dict) -> tuple:
@@ -93,10 +105,11 @@ class RescaleWrapper(gym.Wrapper):
         """
         rescaledAction = self.action(action)
         observation, reward, done, info = self.env.step(rescaledAction)
-        rescaledObservation = self.__generateRescaledObservation(observation)
-        info["allowed_area"] = self.__rescaleAllowedArea(info["allowed_area"])
-        info["next_items_selection"] = self.__rescaleSizeOfNextItems(info["next_items_selection"])
-        info["next_items_preview"] = self.__rescaleSizeOfNextItems(info["next_items_preview"])
+        if self.__Incremental:
+            rescaledObservation = self.__updateRescaledObservation(observation, rescaledAction)
+        else:
+            rescaledObservation = self.__generateRescaledObservation(observation)
+        self.__rescaleInfo(info)
         return rescaledObservation, reward, done, info
 
     def action(self, originalAction: dict) -> dict:
@@ -122,9 +135,20 @@ class RescaleWrapper(gym.Wrapper):
 
         return rescaledAction
 
+    def __rescaleInfo(self, info: dict) -> None:
+        """Rescales the allowed areas and the sizes of the next items in the information of the base environment. The allowed areas of a `LazyInfo` are rescaled on their first access."""
+        if "allowed_area" in info:
+            if isinstance(info, LazyInfo):
+                info.map_lazy("allowed_area", self.__rescaleAllowedArea)
+            else:
+                info["allowed_area"] = self.__rescaleAllowedArea(info["allowed_area"])
+        for key in ("next_items_selection", "next_items_preview"):
+            if key in info:
+                info[key] = self.__rescaleSizeOfNextItems(info[key])
+
     def __rescaleAllowedArea(self, allowedArea: dict) -> dict:
         """
-        This method rescales the `np.ndarrays` that contain the allowed areas for an item placement. Since the size of the rescaled observation is smaller than the original size, the values are gathered, i.e., a value in the new observation is the minimum of the values in the old observation.
+        This method rescales the allowed areas for an item placement. Since the size of the rescaled observation is smaller than the original size, the values are gathered, i.e., a value in the new observation is the minimum of the values in the old observation. For an `AllowedArea`, the rescaled mask is obtained from its rectangle.
 
         Parameters.
         -----------
@@ -140,28 +164,21 @@ class RescaleWrapper(gym.Wrapper):
         ---------
         >>> allowedArea = {
                 # orientation: arrayAllowedAray
-                0: np.ndarray,
+                0: AllowedArea,
                 1: np.ndarray,
                 ...
             }
         """
         rescaledAllowedArea = {}
-        for orientation, arrayAllowedArea in allowedArea.items():
-            # get the shape
-            originalShape = arrayAllowedArea.shape
-            rescaledShape = tuple(orShape // divisor for orShape, divisor in zip(originalShape, self.__SIZE_DIVISOR))
-
-            rescaledObs = np.zeros(rescaledShape, dtype=int)
-            it = np.nditer(rescaledObs, flags=["multi_index"])
-            for _ in it:
-                rescaledIdx = it.multi_index
-                valRescaledIdx = np.amin(
-                    arrayAllowedArea[
-                        rescaledIdx[0] * self.__SIZE_DIVISOR[0] : (rescaledIdx[0] + 1) * self.__SIZE_DIVISOR[0],
-                        rescaledIdx[1] * self.__SIZE_DIVISOR[1] : (rescaledIdx[1] + 1) * self.__SIZE_DIVISOR[1],
-                    ]
-                )
-                rescaledObs[rescaledIdx] = valRescaledIdx
+        for orientation, allowedAreaOfOrientation in allowedArea.items():
+            if isinstance(allowedAreaOfOrientation, AllowedArea):
+                # a block is allowed if and only if it is completely inside the rectangle
+                _, _, endX, endY = allowedAreaOfOrientation.bounds
+                rescaledObs = np.zeros(pooled_shape(allowedAreaOfOrientation.shape, self.__SIZE_DIVISOR), dtype=int)
+                rescaledObs[: endY // self.__SIZE_DIVISOR[0], : endX // self.__SIZE_DIVISOR[1]] = 1
+            else:
+                arrayAllowedArea = np.asarray(allowedAreaOfOrientation)
+                rescaledObs = block_pool(arrayAllowedArea, self.__SIZE_DIVISOR, np.minimum).astype(int)
 
             # set the rescaled allowed area in the return dict
             rescaledAllowedArea[orientation] = rescaledObs
@@ -182,23 +199,37 @@ class RescaleWrapper(gym.Wrapper):
         rescaledObs: np.ndarray
             The observation rescaled to the specified size.
         """
-        # get the new shape of the observation
-        originalShape = observation.shape
-        rescaledShape = tuple(orShape // divisor for orShape, divisor in zip(originalShape, self.__SIZE_DIVISOR))
-
-        rescaledObs = np.zeros(rescaledShape, dtype=int)
-        it = np.nditer(rescaledObs, flags=["multi_index"])
-        for _ in it:
-            rescaledIdx = it.multi_index
-            valRescaledIdx = np.amax(
-                observation[
-                    rescaledIdx[0] * self.__SIZE_DIVISOR[0] : (rescaledIdx[0] + 1) * self.__SIZE_DIVISOR[0],
-                    rescaledIdx[1] * self.__SIZE_DIVISOR[1] : (rescaledIdx[1] + 1) * self.__SIZE_DIVISOR[1],
-                ]
-            )
-            rescaledObs[rescaledIdx] = valRescaledIdx
+        self.__RescaledObservation = block_pool(observation, self.__SIZE_DIVISOR, np.maximum).astype(int)
+        return self.__RescaledObservation.copy()
+
+    def __updateRescaledObservation(self, observation: np.ndarray, action: dict) -> np.ndarray:
+        """
+        Updates the last rescaled observation only in the blocks that are covered by the footprint of the placed item, since the heights of the other blocks have not changed.
+
+        Parameters.
+        -----------
+        observation: np.ndarray
+            The original observation of the base environment after the item was placed.
+        action: dict
+            The action that was applied to the base environment, i.e., with the coordinates in its size.
 
-        return rescaledObs
+        Returns.
+        --------
+        rescaledObs: np.ndarray
+            The observation rescaled to the specified size.
+        """
+        if self.__RescaledObservation is None:
+            return self.__generateRescaledObservation(observation)
+
+        item: Item = action["item"]
+        if action["orientation"] == 0:
+            deltaX, deltaY = int(item.length_mm), int(item.width_mm)
+        else:
+            deltaX, deltaY = int(item.width_mm), int(item.length_mm)
+
+        area = (action["x"], action["y"], action["x"] + deltaX, action["y"] + deltaY)
+        update_block_pool(self.__RescaledObservation, observation, area, self.__SIZE_DIVISOR, np.maximum)
+        return self.__RescaledObservation.copy()
 
     def __rescaleSizeOfNextItems(self, next_items: list[Item]) -> list[Item]:
         """
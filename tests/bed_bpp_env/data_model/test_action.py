@@ -0,0 +1,36 @@
+"""Tests the module `action`."""
+
+from bed_bpp_env.data_model.action import Action
+from bed_bpp_env.data_model.item import Item
+from bed_bpp_env.data_model.position_3d import Position3D
+
+
+def test_action_round_trip() -> None:
+    """Tests that a serialized action is deserialized to an equal action and that the data model is slotted."""
+    serialized_action = {
+        "item": {
+            "article": "article",
+            "id": "id",
+            "product_group": "pg",
+            "length/mm": 300,
+            "width/mm": 200,
+            "height/mm": 100,
+            "weight/kg": 3.14,
+            "sequence": 1,
+        },
+        "orientation": 1,
+        "flb_coordinates": [10, 20, 30],
+    }
+
+    action = Action.from_dict(serialized_action)
+    assert action.flb_coordinates == Position3D(10, 20, 30)
+    assert action.to_dict() == serialized_action
+    assert Action.from_dict(action.to_dict()) == action
+
+    for instance in [action, action.item, action.flb_coordinates]:
+        assert not hasattr(instance, "__dict__")
+
+    # the original field names are accepted as well
+    serialized_item = dict(serialized_action["item"], length_mm=300)
+    del serialized_item["length/mm"]
+    assert Item.from_dict(serialized_item) == action.item
@@ -0,0 +1,42 @@
+"""Tests the module `dataclass_base`."""
+
+from dataclasses import dataclass, field
+from typing import ClassVar
+
+import pytest
+
+from bed_bpp_env.data_model.dataclass_base import DataclassBase
+
+
+@pytest.mark.parametrize("slots", [False, True])
+def test_codecs_are_generated_at_class_creation(slots: bool) -> None:
+    """Tests whether the codecs consider the aliases and skip class variables and fields without `__init__`."""
+
+    @dataclass(slots=slots)
+    class Record(DataclassBase):
+        counter: ClassVar[int] = 0
+        name: str
+        length_mm: int = field(metadata={"alias": "length/mm"})
+        derived: int = field(init=False, default=0)
+
+    assert "_from_dict_codec" in Record.__dict__ and "_to_dict_codec" in Record.__dict__
+    assert Record.from_dict({"name": "a", "length/mm": 3}) == Record("a", 3)
+    assert Record.from_dict({"name": "a", "length_mm": 3}) == Record("a", 3)
+    assert Record("a", 3).to_dict() == {"name": "a", "length/mm": 3}
+
+
+def test_key_error_during_initialization_is_raised() -> None:
+    """Tests that a `KeyError` of the initialization is not mistaken for a missing key of the input."""
+    initializations = []
+
+    @dataclass
+    class Record(DataclassBase):
+        name: str
+
+        def __post_init__(self) -> None:
+            initializations.append(self.name)
+            raise KeyError("raised during the initialization")
+
+    with pytest.raises(KeyError, match="raised during the initialization"):
+        Record.from_dict({"name": "a"})
+    assert initializations == ["a"]
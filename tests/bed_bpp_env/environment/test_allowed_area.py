@@ -0,0 +1,29 @@
+"""Tests the module `allowed_area`."""
+
+import numpy as np
+import pytest
+
+from bed_bpp_env.environment.allowed_area import AllowedArea
+from bed_bpp_env.environment.storage_mode import StorageMode
+
+
+def test_allowed_area() -> None:
+    """Tests the bounds, the membership and the shared mask of an allowed area."""
+    allowed_area = AllowedArea((120, 80), (40, 30))
+    assert allowed_area.bounds == (0, 0, 80, 50)
+    assert (79, 49) in allowed_area
+    assert (80, 0) not in allowed_area
+    assert (0, 50) not in allowed_area
+
+    expected_mask = np.zeros((80, 120), dtype=int)
+    expected_mask[0:50, 0:80] = 1
+    np.testing.assert_array_equal(np.asarray(allowed_area), expected_mask)
+    assert allowed_area.shape == (80, 120)
+
+    # the masks are shared and read-only
+    assert AllowedArea((120, 80), (40, 30)).mask is allowed_area.mask
+    with pytest.raises(ValueError):
+        allowed_area.mask[0, 0] = 0
+    assert AllowedArea((120, 80), (40, 30), StorageMode.COMPACT).mask.dtype == np.uint8
+
+    assert not np.any(np.asarray(AllowedArea((120, 80), (130, 30))))
@@ -0,0 +1,82 @@
+"""Tests the module `batch_palletizing_environment`."""
+
+from collections.abc import Callable
+
+import numpy as np
+import pytest
+
+from bed_bpp_env.data_model.item import Item
+from bed_bpp_env.data_model.order import Order, Properties
+from bed_bpp_env.environment.batch_palletizing_environment import BatchPalletizingEnvironment
+
+
+def _make_order(make_item: Callable[..., Item], order_id: str, n_items: int, target: str = "euro-pallet") -> Order:
+    item_sequence = [
+        make_item(400, 300, 100, id=f"{order_id}-{i_item}", sequence=i_item + 1) for i_item in range(n_items)
+    ]
+    properties = Properties(id=order_id, order_number=order_id, type="type", target=target)
+    return Order(id=order_id, item_sequence=item_sequence, properties=properties)
+
+
+def _actions(x: list[int], orientation: list[int]) -> dict[str, np.ndarray]:
+    return {"x": np.array(x), "y": np.zeros(len(x), dtype=int), "orientation": np.array(orientation)}
+
+
+def test_batch_palletizing_environment(make_item: Callable[..., Item]) -> None:
+    """Tests the lockstep palletization, the next-step autoreset and the packing plans of the finished episodes."""
+    envs = BatchPalletizingEnvironment(num_envs=2)
+    orders = [_make_order(make_item, "a", 2), _make_order(make_item, "b", 1), _make_order(make_item, "c", 1)]
+
+    observations, infos = envs.reset(options={"order_sequence": orders})
+    assert observations.shape == (2, 800, 1200) and observations.max() == 0
+    assert infos["order_id"].tolist() == ["a", "b"]
+    assert [item.id for item in infos["next_items_selection"]] == ["a-0", "b-0"]
+
+    # the order "b" is finished after its only item
+    observations, rewards, terminations, truncations, infos = envs.step(_actions([0, 100], [0, 1]))
+    assert terminations.tolist() == [False, True] and rewards.tolist() == [0.0, 1.0]
+    assert not truncations.any()
+    assert infos["placed"].tolist() == [True, True] and infos["flb_z"].tolist() == [0, 0]
+    assert observations[0, :300, :400].min() == 100 and observations[0].sum() == 100 * 300 * 400
+    assert observations[1, :400, 100:400].min() == 100 and observations[1].sum() == 100 * 400 * 300
+
+    # the second sub-environment is reset with the order "c" and ignores its action
+    observations, rewards, terminations, _, infos = envs.step(_actions([0, 0], [0, 0]))
+    assert terminations.tolist() == [True, False]
+    assert infos["placed"].tolist() == [True, False]
+    assert infos["flb_z"].tolist() == [100, 0] and infos["support_area/%"].tolist() == [1.0, 0.0]
+    assert infos["order_id"].tolist() == ["a", "c"]
+    assert observations[0].max() == 200 and observations[1].max() == 0
+
+    # the order sequence is exhausted for the first sub-environment
+    _, _, terminations, _, infos = envs.step(_actions([0, 0], [0, 0]))
+    assert terminations.tolist() == [True, True]
+    assert infos["placed"].tolist() == [False, True]
+    assert infos["order_id"].tolist() == [None, "c"] and not infos["all_orders_considered"]
+
+    _, _, terminations, _, infos = envs.step(_actions([0, 0], [0, 0]))
+    assert terminations.tolist() == [True, True] and infos["all_orders_considered"]
+
+    packing_plans = envs.getPackingPlans()
+    assert [packing_plan.id for packing_plan in packing_plans] == ["b", "a", "c"]
+    assert [action.flb_coordinates.z for action in packing_plans[1].actions] == [0, 100]
+    assert packing_plans[0].actions[0].orientation == 1
+
+    # a reset without an order sequence keeps the finished orders
+    observations, infos = envs.reset()
+    assert observations.max() == 0 and envs.getPackingPlans() == []
+    assert infos["all_orders_considered"]
+
+
+def test_batch_palletizing_environment_rejects_wrong_items_and_targets(make_item: Callable[..., Item]) -> None:
+    """Tests that the items of the actions are checked and that orders of another target are rejected."""
+    envs = BatchPalletizingEnvironment(num_envs=2)
+    _, infos = envs.reset(options={"order_sequence": [_make_order(make_item, "a", 1), _make_order(make_item, "b", 1)]})
+
+    actions = _actions([0, 0], [0, 0])
+    actions["item"] = infos["next_items_selection"][::-1]
+    with pytest.raises(ValueError):
+        envs.step(actions)
+
+    with pytest.raises(ValueError):
+        envs.reset(options={"order_sequence": [_make_order(make_item, "c", 1, target="rollcontainer")]})
@@ -0,0 +1,85 @@
+"""Tests the module `batch_space_3d`."""
+
+from collections.abc import Callable
+
+import numpy as np
+
+from bed_bpp_env.data_model.item import Item
+from bed_bpp_env.environment.batch_space_3d import BatchSpace3D
+from bed_bpp_env.environment.cuboid import Cuboid
+from bed_bpp_env.environment.space_3d import Space3D
+
+
+def test_batch_space_3d_matches_space_3d(make_item: Callable[..., Item]) -> None:
+    """Tests whether each space of a `BatchSpace3D` has the same heights as a `Space3D` with identical placements."""
+    placements = [
+        # per step: (x, y, delta_x, delta_y, height) for space 0 and space 1
+        [(0, 0, 60, 40, 20), (10, 10, 30, 30, 10)],
+        [(30, 20, 40, 30, 15), (0, 0, 80, 20, 5)],
+        [(50, 0, 20, 60, 10), (20, 5, 30, 30, 30)],
+    ]
+    batch_space = BatchSpace3D(n_spaces=2, basesize=(100, 80))
+    spaces = [Space3D((100, 80)), Space3D((100, 80))]
+
+    for step_placements in placements:
+        x, y, delta_x, delta_y, height = (np.array(values) for values in zip(*step_placements))
+        flb_z, support_ratio = batch_space.addItems(x, y, delta_x, delta_y, height)
+
+        for i_space, (x_i, y_i, delta_x_i, delta_y_i, height_i) in enumerate(step_placements):
+            space_heights = spaces[i_space].getHeights()
+            area_below = space_heights[y_i : y_i + delta_y_i, x_i : x_i + delta_x_i]
+            expected_z = int(area_below.max())
+            expected_support_ratio = np.count_nonzero(area_below >= expected_z - 5) / area_below.size
+            cuboid = Cuboid(make_item(delta_x_i, delta_y_i, height_i))
+            spaces[i_space].addItem(cuboid, 0, [x_i, y_i, expected_z])
+
+            assert flb_z[i_space] == expected_z
+            assert support_ratio[i_space] == expected_support_ratio
+
+    for i_space, space in enumerate(spaces):
+        np.testing.assert_array_equal(batch_space.getHeights()[i_space], space.getHeights())
+    np.testing.assert_array_equal(batch_space.getNPlacedItems(), [3, 3])
+
+
+def test_batch_space_3d_inactive_and_reset() -> None:
+    """Tests whether inactive spaces are not changed and whether single spaces are reset."""
+    batch_space = BatchSpace3D(n_spaces=2, basesize=(100, 80))
+
+    flb_z, support_ratio = batch_space.addItems(
+        np.array([0, 0]),
+        np.array([0, 0]),
+        np.array([10, 10]),
+        np.array([10, 10]),
+        np.array([5, 5]),
+        active=np.array([True, False]),
+    )
+    assert flb_z.tolist() == [0, 0]
+    assert support_ratio.tolist() == [1.0, 0.0]
+    assert batch_space.getHeights()[0].max() == 5
+    assert batch_space.getHeights()[1].max() == 0
+
+    batch_space.reset(np.array([True, False]))
+    assert batch_space.getHeights().max() == 0
+    np.testing.assert_array_equal(batch_space.getNPlacedItems(), [0, 0])
+
+
+def test_batch_space_3d_crops_items() -> None:
+    """Tests whether items that exceed the base area are cropped in each space independently."""
+    batch_space = BatchSpace3D(n_spaces=3, basesize=(100, 80))
+    batch_space.addItems(np.array([90, 0, 40]), np.array([0, 70, 30]), 20, 20, np.array([5, 7, 9]))
+
+    heights = batch_space.getHeights()
+    assert heights[0, :20, 90:].min() == 5 and heights[0].sum() == 5 * 20 * 10
+    assert heights[1, 70:, :20].min() == 7 and heights[1].sum() == 7 * 10 * 20
+    assert heights[2, 30:50, 40:60].min() == 9 and heights[2].sum() == 9 * 20 * 20
+    np.testing.assert_array_equal(batch_space.getUppermostItems().max(axis=(1, 2)), [1, 1, 1])
+
+
+def test_batch_space_3d_skips_items_outside() -> None:
+    """Tests whether items whose footprint is completely outside the base area are not added."""
+    batch_space = BatchSpace3D(n_spaces=2, basesize=(100, 80))
+    flb_z, support_ratio = batch_space.addItems(np.array([100, 0]), np.array([0, -30]), 20, 20, 5)
+
+    assert flb_z.tolist() == [0, 0] and support_ratio.tolist() == [0.0, 0.0]
+    assert batch_space.getHeights().max() == 0
+    np.testing.assert_array_equal(batch_space.getNPlacedItems(), [0, 0])
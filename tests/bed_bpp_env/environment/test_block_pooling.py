@@ -0,0 +1,52 @@
+"""Tests the module `block_pooling`."""
+
+import numpy as np
+
+from bed_bpp_env.environment.allowed_area import AllowedArea
+from bed_bpp_env.environment.block_pooling import block_pool, pooled_shape, update_block_pool
+
+
+def _naive_block_pool(values: np.ndarray, blocksize: tuple, reduction) -> np.ndarray:
+    """Pools the blocks in a loop over the cells of the pooled array."""
+    pooled = np.zeros(pooled_shape(values.shape, blocksize), dtype=values.dtype)
+    for index in np.ndindex(pooled.shape):
+        pooled[index] = reduction(
+            values[
+                index[0] * blocksize[0] : (index[0] + 1) * blocksize[0],
+                index[1] * blocksize[1] : (index[1] + 1) * blocksize[1],
+            ]
+        )
+    return pooled
+
+
+def test_block_pool() -> None:
+    """Tests the pooling for a shape that is not divisible by the block size."""
+    rng = np.random.default_rng(3)
+    values = rng.integers(0, 1_000, size=(83, 127))
+
+    assert pooled_shape(values.shape, (10, 20)) == (8, 6)
+    np.testing.assert_array_equal(block_pool(values, (10, 20)), _naive_block_pool(values, (10, 20), np.amax))
+    np.testing.assert_array_equal(block_pool(values, (7, 3), np.minimum), _naive_block_pool(values, (7, 3), np.amin))
+
+
+def test_update_block_pool() -> None:
+    """Tests that an update of the blocks of a changed area equals the pooling of the entire array."""
+    rng = np.random.default_rng(4)
+    values = rng.integers(0, 1_000, size=(83, 127))
+    pooled = block_pool(values, (10, 10))
+
+    # the area is (x_start, y_start, x_end, y_end) and exceeds the pooled part of the array
+    values[35:83, 101:127] = 2_000
+    update_block_pool(pooled, values, (101, 35, 127, 83), (10, 10))
+    np.testing.assert_array_equal(pooled, block_pool(values, (10, 10)))
+
+
+def test_pool_allowed_area() -> None:
+    """Tests that the minimum pooling of an allowed area keeps exactly the blocks inside its rectangle."""
+    allowed_area = AllowedArea((120, 80), (45, 33))
+    pooled = block_pool(np.asarray(allowed_area), (10, 10), np.minimum)
+
+    _, _, end_x, end_y = allowed_area.bounds
+    expected = np.zeros((8, 12), dtype=pooled.dtype)
+    expected[: end_y // 10, : end_x // 10] = 1
+    np.testing.assert_array_equal(pooled, expected)
@@ -0,0 +1,58 @@
+"""Tests the module `cuboid`."""
+
+import copy
+import pickle
+from collections.abc import Callable
+
+import numpy as np
+import pytest
+
+from bed_bpp_env.data_model.item import Item
+from bed_bpp_env.data_model.position_3d import Position3D
+from bed_bpp_env.environment.cuboid import Cuboid
+
+
+def _make_cuboid(item: Item, flb: tuple[int, int, int]) -> Cuboid:
+    cuboid = Cuboid(item)
+    cuboid.flb = Position3D(*flb)
+    return cuboid
+
+
+def test_array_representation(make_item: Callable[..., Item]) -> None:
+    """Tests whether the array representation is a read-only view that follows the orientation."""
+    cuboid = _make_cuboid(make_item(60, 40, 20), (0, 0, 0))
+    assert cuboid.array_representation.shape == (40, 60)
+    assert not cuboid.array_representation.flags.writeable
+    assert np.all(cuboid.array_representation == 20)
+    assert cuboid.orientation == 0
+
+    cuboid.set_orientation(1)
+    assert cuboid.footprint_shape == (60, 40)
+    assert cuboid.array_representation.shape == (60, 40)
+    assert cuboid.orientation == 1
+    assert not hasattr(cuboid, "__dict__")
+
+
+def test_support_surfaces(make_item: Callable[..., Item]) -> None:
+    """Tests the support surfaces of an item that is supported by two items below."""
+    left_below = _make_cuboid(make_item(20, 40, 10), (0, 0, 0))
+    right_below = _make_cuboid(make_item(20, 20, 10), (30, 0, 0))
+    left_below.store_items_directly_below([])
+    right_below.store_items_directly_below([])
+
+    cuboid = _make_cuboid(make_item(50, 40, 10), (0, 0, 10))
+    cuboid.store_items_directly_below([left_below, right_below])
+
+    assert cuboid.percentage_direct_support_surface == pytest.approx((20 * 40 + 20 * 20) / (50 * 40))
+    assert int(cuboid.direct_support_surface.sum()) == 20 * 40 + 20 * 20
+    # the effective support surface is the convex hull of the corners of the supported area
+    assert int(cuboid.effective_support_surface.sum()) == 50 * 40
+    assert left_below.percentage_direct_support_surface == 1.0
+    assert int(left_below.effective_support_surface.sum()) == 20 * 40
+
+    # the cached arrays are created again after copying
+    copied_cuboid = copy.deepcopy(cuboid)
+    assert copied_cuboid._direct_support_surface is None
+    np.testing.assert_array_equal(copied_cuboid.direct_support_surface, cuboid.direct_support_surface)
+    unpickled_cuboid = pickle.loads(pickle.dumps(cuboid))
+    np.testing.assert_array_equal(unpickled_cuboid.effective_support_surface, cuboid.effective_support_surface)
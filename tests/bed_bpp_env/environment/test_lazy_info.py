@@ -0,0 +1,57 @@
+"""Tests the module `lazy_info`."""
+
+import copy
+import pickle
+
+import pytest
+
+from bed_bpp_env.environment.lazy_info import ExpiredInfoError, LazyInfo, parse_info_keys
+
+
+def test_lazy_info() -> None:
+    """Tests whether lazy values are computed once on first access and whether unproduced keys are ignored."""
+    calls = []
+
+    def compute(value: int) -> int:
+        calls.append(value)
+        return value * 2
+
+    info = LazyInfo(parse_info_keys("corner_points, next_items_selection"))
+    info.set_lazy("corner_points", compute, 21)
+    info.set_lazy("allowed_area", compute, 1)
+    info.update({"next_items_selection": [], "order_id": "order"})
+    assert list(info) == ["corner_points", "next_items_selection"]
+    assert calls == []
+
+    assert info["corner_points"] == 42
+    assert info.get("corner_points") == 42
+    assert calls == [21]
+    assert "allowed_area" not in info
+
+    step_info = LazyInfo()
+    step_info.set_lazy("corner_points", compute, 1)
+    step_info.set_lazy("allowed_area", compute, 2)
+    step_info["done"] = False
+    assert step_info.pop("done") is False
+    info.update(step_info)
+    assert calls == [21]
+
+    info.expire("step 2")
+    assert calls == [21]
+    assert dict(info) == {"next_items_selection": []}
+    with pytest.raises(ExpiredInfoError, match="'corner_points'.*step 2"):
+        info["corner_points"]
+    assert parse_info_keys("all") is None
+
+
+def test_copied_lazy_info_contains_all_values() -> None:
+    """Tests whether the lazy values are computed when an info is copied or pickled, such that the copy outlives the
+    state of the environment."""
+    info = LazyInfo()
+    info.set_lazy("corner_points", lambda value: value * 2, 21)
+    info["order_id"] = "order"
+
+    copied_info = copy.deepcopy(info)
+    pickled_info = pickle.loads(pickle.dumps(copy.copy(info)))
+    info.expire()
+    assert copied_info == pickled_info == {"corner_points": 42, "order_id": "order"}
@@ -0,0 +1,247 @@
+"""Tests the module `space_3d`."""
+
+import copy
+from collections.abc import Callable
+
+import numpy as np
+
+from bed_bpp_env.data_model.item import Item
+from bed_bpp_env.environment.cuboid import Cuboid
+from bed_bpp_env.environment.direction import Direction
+from bed_bpp_env.environment.skyline_space_3d import SkylineSpace3D
+from bed_bpp_env.environment.space_3d import Space3D
+from bed_bpp_env.environment.space_backend import create_space_3d
+from bed_bpp_env.environment.storage_mode import StorageMode
+
+
+def test_max_height_in_footprint(make_item: Callable[..., Item]) -> None:
+    """Tests the maximum height below footprints, including footprints that exceed the base area."""
+    space = Space3D((100, 80))
+    space.addItem(Cuboid(make_item(40, 30, 20)), 0, [0, 0, 0])
+    space.addItem(Cuboid(make_item(20, 20, 10)), 0, [80, 60, 0])
+
+    assert space.max_height_in_footprint(0, 0, 10, 10) == 20
+    assert space.max_height_in_footprint(39, 29, 10, 10) == 20
+    assert space.max_height_in_footprint(40, 30, 10, 10) == 0
+    # cropped at the edges of the base area
+    assert space.max_height_in_footprint(90, 70, 50, 50) == 10
+    assert space.max_height_in_footprint(100, 80, 10, 10) == 0
+
+
+def test_skyline_space_3d_matches_space_3d(make_item: Callable[..., Item]) -> None:
+    """Tests whether a `SkylineSpace3D` answers the footprint queries like the dense `Space3D`."""
+    placements = [
+        # (x, y, length, width, height)
+        (0, 0, 40, 30, 20),
+        (40, 0, 60, 30, 25),
+        (10, 10, 50, 40, 10),
+        (70, 50, 40, 40, 15),
+        (0, 50, 30, 30, 5),
+    ]
+    dense_space, skyline_space = Space3D((100, 80)), create_space_3d((100, 80), "skyline")
+    assert isinstance(skyline_space, SkylineSpace3D)
+
+    for x, y, length, width, height in placements:
+        flb_z = dense_space.max_height_in_footprint(x, y, length, width)
+        assert skyline_space.max_height_in_footprint(x, y, length, width) == flb_z
+        assert skyline_space.direct_support_area(x, y, length, width, flb_z) == dense_space.direct_support_area(
+            x, y, length, width, flb_z
+        )
+
+        dense_space.addItem(Cuboid(make_item(length, width, height)), 0, [x, y, flb_z])
+        skyline_space.addItem(Cuboid(make_item(length, width, height)), 0, [x, y, flb_z])
+
+    np.testing.assert_array_equal(skyline_space.getHeights(), dense_space.getHeights())
+    np.testing.assert_array_equal(skyline_space.getUppermostItems(), dense_space.getUppermostItems())
+    assert skyline_space.getCornerPointsIn3D((10, 10, 10)) == dense_space.getCornerPointsIn3D((10, 10, 10))
+    for dense_item, skyline_item in zip(dense_space.getPlacedItems(), skyline_space.getPlacedItems()):
+        assert [item.flb for item in skyline_item.items_below] == [item.flb for item in dense_item.items_below]
+
+    # the materialized surface is updated by added items, but it is not copied
+    copied_space = copy.deepcopy(skyline_space)
+    assert copied_space._surface_cache is None
+    skyline_space.addItem(Cuboid(make_item(20, 20, 20)), 0, [0, 0, 20])
+    assert skyline_space.getHeights()[0, 0] == 40
+    assert copied_space.getHeights()[0, 0] == 20
+
+
+def test_skyline_space_3d_merges_rectangles(make_item: Callable[..., Item]) -> None:
+    """Tests whether the visible parts of a covered rectangle are merged if they share a complete edge."""
+    space = create_space_3d((100, 80), "skyline")
+    space.addItem(Cuboid(make_item(20, 40, 10)), 0, [40, 0, 0])
+    space.addItem(Cuboid(make_item(20, 40, 10)), 0, [40, 40, 0])
+
+    # the target is left and right of the two items
+    assert sorted(map(tuple, space._rectangles[:, :4].tolist())) == [
+        (0, 0, 40, 80),
+        (40, 0, 60, 40),
+        (40, 40, 60, 80),
+        (60, 0, 100, 80),
+    ]
+
+
+def test_skyline_space_3d_without_height_map(make_item: Callable[..., Item]) -> None:
+    """
+    Tests that the height pyramid of a `SkylineSpace3D` is updated without a height map, and that a materialized height
+    map is reverted by `restore` instead of being dropped.
+    """
+    placements = [
+        # (x, y, length, width, flb_z, height)
+        (0, 0, 40, 30, 0, 20),
+        (35, 25, 33, 17, 0, 25),
+        (7, 43, 61, 29, 0, 10),
+        # lower than the heights below, thus, the maxima of the blocks decrease
+        (0, 0, 15, 15, 0, 5),
+    ]
+    dense_space = Space3D((100, 80), height_pyramid=(5, 10, 20))
+    skyline_space = create_space_3d((100, 80), "skyline", height_pyramid=(5, 10, 20))
+    token = skyline_space.snapshot()
+    for x, y, length, width, flb_z, height in placements:
+        dense_space.addItem(Cuboid(make_item(length, width, height)), 0, [x, y, flb_z])
+        skyline_space.addItem(Cuboid(make_item(length, width, height)), 0, [x, y, flb_z])
+        for blocksize, maxima in dense_space.getHeightPyramid().items():
+            np.testing.assert_array_equal(skyline_space.getHeightPyramid()[blocksize], maxima)
+    assert skyline_space._surface_cache is None
+
+    heights = skyline_space.getHeights()
+    np.testing.assert_array_equal(heights, dense_space.getHeights())
+    skyline_space.restore(token)
+    assert skyline_space.getHeights() is heights
+    assert not heights.any() and not skyline_space.getUppermostItems().any()
+
+
+def test_compact_storage_mode(make_item: Callable[..., Item]) -> None:
+    """Tests whether the compact storage mode uses small data types without changing the heights."""
+    for backend in ("dense", "skyline"):
+        default_space = create_space_3d((100, 80), backend)
+        compact_space = create_space_3d((100, 80), backend, StorageMode.COMPACT)
+
+        for space, storage_mode in ((default_space, StorageMode.DEFAULT), (compact_space, StorageMode.COMPACT)):
+            space.addItem(Cuboid(make_item(40, 30, 2_000), storage_mode), 0, [0, 0, 0])
+            cuboid = Cuboid(make_item(60, 40, 20), storage_mode)
+            space.addItem(cuboid, 0, [20, 20, space.max_height_in_footprint(20, 20, 60, 40)])
+
+        assert compact_space.getHeights().dtype == np.uint16
+        assert compact_space.getUppermostItems().dtype == np.uint16
+        assert cuboid.direct_support_surface.dtype == np.uint8
+        np.testing.assert_array_equal(compact_space.getHeights(), default_space.getHeights())
+        assert compact_space.direct_support_area(0, 0, 10, 10, 0) == 100
+
+
+def test_neighbors(make_item: Callable[..., Item]) -> None:
+    """Tests whether touching items with overlapping z-coordinates are identified as neighbors."""
+    space = Space3D((200, 100))
+    first_item = Cuboid(make_item(40, 30, 20))
+    east_item = Cuboid(make_item(40, 30, 20))
+    north_item = Cuboid(make_item(40, 30, 50))
+    far_item = Cuboid(make_item(40, 30, 20))
+    top_item = Cuboid(make_item(40, 30, 20))
+
+    space.addItem(first_item, 0, [0, 0, 0])
+    space.addItem(east_item, 0, [40, 0, 0])
+    space.addItem(north_item, 0, [0, 30, 0])
+    space.addItem(far_item, 0, [150, 0, 0])
+    space.addItem(top_item, 0, [0, 0, 20])
+
+    assert first_item.neighbors[Direction.EAST] == [east_item]
+    assert first_item.neighbors[Direction.NORTH] == [north_item]
+    assert east_item.neighbors[Direction.WEST] == [first_item]
+    assert far_item.neighbors == {direction: [] for direction in Direction}
+    # the item on top only touches the taller item in the north, but not the items below
+    assert top_item.neighbors[Direction.NORTH] == [north_item]
+    assert top_item.neighbors[Direction.EAST] == []
+    assert top_item.items_below == [first_item]
+
+
+def test_corner_point_cache(make_item: Callable[..., Item]) -> None:
+    """Tests whether the cached corner points equal the corner points of a space without cached values."""
+    placements = [
+        # (x, y, length, width, height)
+        (0, 0, 40, 30, 20),
+        (40, 0, 60, 30, 25),
+        (0, 30, 50, 40, 10),
+        (50, 30, 30, 20, 30),
+        (0, 0, 30, 20, 15),
+    ]
+    item_dimensions = [(10, 10, 10), (60, 50, 10), (20, 30, 2_990)]
+
+    space = Space3D((100, 80))
+    for i_placement, (x, y, length, width, height) in enumerate(placements):
+        flb_z = space.max_height_in_footprint(x, y, length, width)
+        space.addItem(Cuboid(make_item(length, width, height)), 0, [x, y, flb_z])
+
+        uncached_space = Space3D((100, 80))
+        for placed_item in space.getPlacedItems()[: i_placement + 1]:
+            item = Cuboid(make_item(placed_item.length, placed_item.width, placed_item.height))
+            uncached_space.addItem(item, 0, list(placed_item.flb.xyz))
+
+        for item_dimension in item_dimensions:
+            corner_points = space.getCornerPointsIn3D(item_dimension)
+            assert corner_points == uncached_space.getCornerPointsIn3D(item_dimension)
+            corner_points.append((-1, -1, -1))
+            assert space.getCornerPointsIn3D(item_dimension) == uncached_space.getCornerPointsIn3D(item_dimension)
+
+
+def test_snapshot_and_restore(make_item: Callable[..., Item]) -> None:
+    """Tests whether restoring a snapshot reverts the added items without copying the space."""
+    for backend in ("dense", "skyline"):
+        space = create_space_3d((100, 80), backend)
+        first_item = Cuboid(make_item(40, 30, 20))
+        space.addItem(first_item, 0, [0, 0, 0])
+        space.getHeights()
+        expected_heights = space.getHeights().copy()
+        expected_corner_points = space.getCornerPointsIn3D((10, 10, 10))
+
+        token = space.snapshot()
+        for _ in range(2):
+            space.addItem(Cuboid(make_item(40, 30, 20)), 0, [40, 0, 0])
+            space.addItem(Cuboid(make_item(20, 20, 10)), 0, [0, 0, 20])
+            assert first_item.neighbors[Direction.EAST] != []
+            assert space.getCornerPointsIn3D((10, 10, 10)) != expected_corner_points
+
+            space.restore(token)
+            assert len(space.getPlacedItems()) == 1
+            np.testing.assert_array_equal(space.getHeights(), expected_heights)
+            assert first_item.neighbors[Direction.EAST] == []
+            assert space.getCornerPointsIn3D((10, 10, 10)) == expected_corner_points
+            assert space._height_levels == [0, 20]
+
+        space.release(token)
+        assert space._journal is None
+        space.addItem(Cuboid(make_item(40, 30, 20)), 0, [40, 0, 0])
+        assert space.getUppermostItems()[0, 40] == 2
+
+
+def test_height_pyramid(make_item: Callable[..., Item]) -> None:
+    """Tests that the height pyramid equals the pooled heights after adding items and restoring a snapshot."""
+    placements = [
+        # (x, y, length, width, flb_z, height)
+        (0, 0, 40, 30, 0, 20),
+        (35, 25, 33, 17, 0, 25),
+        (7, 43, 61, 29, 0, 10),
+        # lower than the heights below, thus, the maxima of the blocks decrease
+        (0, 0, 15, 15, 0, 5),
+    ]
+    space = Space3D((100, 80), height_pyramid=(10, 5, 20))
+    assert list(space.getHeightPyramid()) == [5, 10, 20]
+
+    def assert_pyramid_matches_heights() -> None:
+        heights = space.getHeights()
+        for blocksize, maxima in space.getHeightPyramid().items():
+            expected = heights.reshape(80 // blocksize, blocksize, 100 // blocksize, blocksize).max(axis=(1, 3))
+            np.testing.assert_array_equal(maxima, expected)
+
+    token = None
+    for counter, (x, y, length, width, flb_z, height) in enumerate(placements):
+        if counter == 2:
+            token = space.snapshot()
+        space.addItem(Cuboid(make_item(length, width, height)), 0, [x, y, flb_z])
+        assert_pyramid_matches_heights()
+
+    heights = space.getHeights()
+    for x, y, delta_x, delta_y in [(0, 0, 100, 80), (3, 7, 41, 33), (12, 18, 6, 4), (55, 61, 80, 80)]:
+        expected = heights[y : y + delta_y, x : x + delta_x].max(initial=0)
+        assert space.max_height_in_footprint(x, y, delta_x, delta_y) == expected
+
+    space.restore(token)
+    assert_pyramid_matches_heights()
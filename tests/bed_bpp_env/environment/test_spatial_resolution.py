@@ -0,0 +1,98 @@
+"""Tests the module `spatial_resolution`."""
+
+from collections.abc import Callable
+
+import pytest
+
+from bed_bpp_env.data_model.item import Item
+from bed_bpp_env.environment.cuboid import Cuboid
+from bed_bpp_env.environment.sim_pal_env import SimPalEnv, conf
+from bed_bpp_env.environment.space_3d import Space3D
+from bed_bpp_env.environment.spatial_resolution import (
+    coordinates_in_mm,
+    footprint_in_cells,
+    height_pyramid_in_cells,
+    parse_spatial_resolution,
+    size_in_cells,
+)
+
+
+def test_conservative_rounding() -> None:
+    """Tests that the target is rounded down and the footprints are rounded up."""
+    assert parse_spatial_resolution("(10,20)") == (10, 20)
+    with pytest.raises(ValueError):
+        parse_spatial_resolution("(0,10)")
+
+    assert size_in_cells((1205, 800), (10, 20)) == (120, 40)
+    assert footprint_in_cells(401, 300, 0, (10, 20)) == (41, 15)
+    assert footprint_in_cells(401, 300, 1, (10, 20)) == (30, 21)
+    assert coordinates_in_mm(3, 4, (10, 20)) == (30, 80)
+
+
+def test_cuboid_in_cells(make_item: Callable[..., Item]) -> None:
+    """Tests the footprint of a cuboid in cells and that its volume is still given in cubic millimeters."""
+    cuboid = Cuboid(make_item(401, 300, 200), resolution=(10, 20))
+    assert cuboid.footprint_shape == (15, 41)
+    assert cuboid.orientation == 0
+    assert cuboid.volume == 401 * 300 * 200
+
+    cuboid.set_orientation(1)
+    assert cuboid.footprint_shape == (21, 30)
+    assert cuboid.orientation == 1
+
+
+def test_placements_in_cells_are_feasible_in_mm(make_item: Callable[..., Item]) -> None:
+    """Tests that items that do not overlap in cells do not overlap in millimeters and are inside the target."""
+    resolution, size_mm = (10, 10), (1205, 803)
+    space = Space3D(size_in_cells(size_mm, resolution))
+    items = [make_item(395, 301, 100), make_item(402, 299, 120), make_item(333, 250, 90)]
+
+    x = 0
+    for item in items:
+        cuboid = Cuboid(item, resolution=resolution)
+        delta_y, delta_x = cuboid.footprint_shape
+        flb_z = space.max_height_in_footprint(x, 0, delta_x, delta_y)
+        space.addItem(cuboid, 0, [x, 0, flb_z])
+
+        x_mm, _ = coordinates_in_mm(x, 0, resolution)
+        next_x = x + delta_x
+        assert x_mm + item.length_mm <= coordinates_in_mm(next_x, 0, resolution)[0] <= size_mm[0]
+        assert item.width_mm <= delta_y * resolution[1] <= size_mm[1]
+        x = next_x
+
+    assert space.getHeights().shape == (80, 120)
+
+
+def test_height_pyramid_at_coarse_resolution(make_item: Callable[..., Item]) -> None:
+    """Tests that the block sizes of the height pyramid are converted from millimeters to cells."""
+    assert height_pyramid_in_cells((10, 50, 100), (10, 10)) == (1, 5, 10)
+    assert height_pyramid_in_cells((), (10, 20)) == ()
+    with pytest.raises(ValueError):
+        height_pyramid_in_cells((50,), (20, 20))
+    with pytest.raises(ValueError):
+        height_pyramid_in_cells((100,), (10, 20))
+
+    resolution = (10, 10)
+    space = Space3D(
+        size_in_cells((1200, 800), resolution), height_pyramid=height_pyramid_in_cells((10, 50, 100), resolution)
+    )
+    cuboid = Cuboid(make_item(400, 300, 200), resolution=resolution)
+    space.addItem(cuboid, 0, [0, 0, 0])
+
+    pyramid = space.getHeightPyramid()
+    assert pyramid[5].shape == (16, 24)
+    assert pyramid[10][:3, :4].max() == 200 and pyramid[10][3:, 4:].max() == 0
+
+
+def test_environment_with_height_pyramid_at_coarse_resolution() -> None:
+    """Tests that an environment can be configured with both a coarse spatial resolution and a height pyramid."""
+    original = conf.get("default", "spatial_resolution"), conf.get("environment", "height_pyramid")
+    conf.set("default", "spatial_resolution", "(10,10)")
+    conf.set("environment", "height_pyramid", "10,50,100")
+    try:
+        env = SimPalEnv()
+    finally:
+        conf.set("default", "spatial_resolution", original[0])
+        conf.set("environment", "height_pyramid", original[1])
+
+    assert env.observation_space.shape == (80, 120)
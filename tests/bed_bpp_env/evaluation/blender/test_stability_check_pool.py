@@ -0,0 +1,117 @@
+"""Tests the module `stability_check_pool`."""
+
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from bed_bpp_env.data_model.order import Order
+from bed_bpp_env.data_model.packing_plan import PackingPlan
+from bed_bpp_env.evaluation.blender.stability_check_pool import (
+    STABILITY_FILE_NAME,
+    StabilityCheckPool,
+    append_stability_result,
+)
+
+FAKE_BLENDER = """
+import json, pathlib, socket, sys, time
+
+args = sys.argv[sys.argv.index("--") + 1 :]
+commands = dict(zip(args[::2], args[1::2]))
+with open(pathlib.Path(__file__).parent / "starts", "a") as file:
+    file.write("started\\n")
+
+
+def evaluate(order_number, output_dir):
+    crash_marker = pathlib.Path(output_dir) / "crashed"
+    if order_number == "hang":
+        time.sleep(30)
+    if order_number == "crash" and not crash_marker.exists():
+        crash_marker.touch()
+        sys.exit(1)
+    return {"mean_z-movements/m": 0.0, "max_z-movements/m": len(order_number) / 1000}
+
+
+if "worker_address" in commands:
+    host, port = commands["worker_address"].rsplit(":", maxsplit=1)
+    if (pathlib.Path(__file__).parent / "malformed_hello").exists():
+        with socket.create_connection((host, int(port))) as connection:
+            connection.sendall(b"{malformed\\n")
+    stream = socket.create_connection((host, int(port))).makefile("rw")
+    stream.write(json.dumps({"token": commands["worker_token"]}) + "\\n")
+    stream.flush()
+    for line in stream:
+        request = json.loads(line)
+        if request == "shutdown":
+            break
+        movements = evaluate(request["order_number"], request["output_dir"])
+        stream.write(json.dumps({"order_number": request["order_number"], "movements": movements}) + "\\n")
+        stream.flush()
+else:
+    movements = evaluate(commands["order_number"], commands["output_dir"])
+    with open(commands["result_file"], "w") as file:
+        json.dump(movements, file)
+"""
+
+
+def _make_fake_blender(directory: Path) -> Path:
+    """Creates an executable that writes the result file like `scene_creation.py`."""
+    blender_path = directory / "blender"
+    blender_path.write_text(f"#!{sys.executable}\n{FAKE_BLENDER}")
+    blender_path.chmod(0o755)
+    return blender_path
+
+
+@pytest.mark.parametrize("persistent_workers", [False, True])
+def test_stability_check_pool(
+    tmp_path: Path, persistent_workers: bool, make_packing_plan: Callable[..., tuple[Order, PackingPlan]]
+) -> None:
+    """Tests that the results are collected per order and that crashed and hanging checks are retried."""
+    output_dir = tmp_path / "evaluation"
+    pool = StabilityCheckPool(
+        _make_fake_blender(tmp_path),
+        output_dir,
+        n_workers=3,
+        timeout=1.0,
+        max_attempts=2,
+        persistent_workers=persistent_workers,
+    )
+    with pool:
+        order_ids = ["a", "bb", "crash", "hang"]
+        futures = {order_id: pool.submit(*make_packing_plan(order_id), {}) for order_id in order_ids}
+    results = {order_id: future.result() for order_id, future in futures.items()}
+
+    assert results["bb"].movements == {"mean_z-movements/m": 0.0, "max_z-movements/m": 0.002}
+    assert results["bb"].attempts == 1
+    assert results["crash"].movements is not None and results["crash"].attempts == 2
+    assert results["hang"].movements is None and results["hang"].attempts == 2
+    assert "timed out" in results["hang"].error
+
+    for order_id in ["a", "bb"]:
+        append_stability_result(output_dir, results[order_id])
+    lines = (output_dir / STABILITY_FILE_NAME).read_text().splitlines()
+    assert lines == [f"a:{results['a'].movements}", f"bb:{results['bb'].movements}"]
+
+
+def test_persistent_worker_is_started_once(
+    tmp_path: Path, make_packing_plan: Callable[..., tuple[Order, PackingPlan]]
+) -> None:
+    """Tests that a persistent worker evaluates all packing plans of its thread in one Blender process."""
+    blender_path = _make_fake_blender(tmp_path)
+    with StabilityCheckPool(blender_path, tmp_path / "evaluation", persistent_workers=True) as pool:
+        futures = [pool.submit(*make_packing_plan(order_id), {}) for order_id in ["a", "bb", "ccc"]]
+    assert [future.result().movements["max_z-movements/m"] for future in futures] == [0.001, 0.002, 0.003]
+    assert len((tmp_path / "starts").read_text().splitlines()) == 1
+
+
+def test_worker_ignores_malformed_hello(
+    tmp_path: Path, make_packing_plan: Callable[..., tuple[Order, PackingPlan]]
+) -> None:
+    """Tests that a connection with a malformed hello is closed and that the worker is still awaited."""
+    blender_path = _make_fake_blender(tmp_path)
+    (tmp_path / "malformed_hello").touch()
+    with StabilityCheckPool(blender_path, tmp_path / "evaluation", persistent_workers=True) as pool:
+        future = pool.submit(*make_packing_plan("a"), {})
+    assert future.result().movements == {"mean_z-movements/m": 0.0, "max_z-movements/m": 0.001}
+    assert future.result().attempts == 1
@@ -0,0 +1,95 @@
+"""Tests the module `kpis`."""
+
+import statistics
+from collections.abc import Callable
+
+import numpy as np
+import pytest
+
+from bed_bpp_env.data_model.item import Item
+from bed_bpp_env.data_model.order import Order, Properties
+from bed_bpp_env.environment.cuboid import Cuboid
+from bed_bpp_env.environment.space_3d import Space3D
+from bed_bpp_env.evaluation.kpis import KPIs
+
+PLACEMENTS = [(400, 300, 0, 0, 0), (400, 300, 400, 0, 0), (300, 200, 200, 100, 100), (200, 200, 900, 500, 0)]
+"""The size `(length, width)` of each item and its FLB coordinates `(x, y, z)`."""
+
+
+def _expected_values(space: Space3D, order: Order) -> dict:
+    """Calculates the values of the KPIs from all placed items."""
+    placed_items = space.getPlacedItems()
+    percentages = [item.percentage_direct_support_surface for item in placed_items]
+    heights = space.getHeights()
+    volume = sum([item.volume / 1000.0 for item in placed_items])
+    return {
+        "unpalletized_items": len(order.item_sequence) - len(placed_items),
+        "maximum_palletizing_height/mm": np.amax(heights),
+        "vol_items/cm^3": volume,
+        "packing_stability": {
+            "support_area": {
+                "current": percentages[-1],
+                "min": min(percentages),
+                "mean": statistics.fmean(percentages),
+                "stdev": statistics.stdev(percentages) if len(percentages) > 1 else 0,
+            }
+        },
+        "volume_utilization": volume / (1e-3 * heights.size * np.amax(heights)),
+    }
+
+
+def _assert_values(kpis: KPIs, expected: dict) -> None:
+    values = kpis.getValues()
+    support_area = values.pop("packing_stability")["support_area"]
+    expected_support_area = expected.pop("packing_stability")["support_area"]
+    assert values == expected
+    # the types are compared as well, since numpy scalars are rounded differently than Python numbers
+    assert {key: type(value) for key, value in values.items()} == {key: type(value) for key, value in expected.items()}
+    assert support_area == pytest.approx(expected_support_area)
+
+
+@pytest.fixture
+def order(make_item: Callable[..., Item]) -> Order:
+    items = [make_item(length, width, weight_kg=5.0) for length, width, *_ in PLACEMENTS] + [
+        make_item(100, 100, weight_kg=5.0)
+    ]
+    return Order(id="order", item_sequence=items, properties=Properties("order", "order", "type", "euro-pallet"))
+
+
+def test_update_matches_recalculation(order: Order) -> None:
+    """Tests that the incrementally updated KPIs equal the KPIs that are calculated from all placed items."""
+    space = Space3D((1200, 800))
+    kpis = KPIs()
+    kpis.reset(space, order)
+
+    for item, (_, _, *flb) in zip(order.item_sequence, PLACEMENTS):
+        space.addItem(Cuboid(item), 0, flb)
+        kpis.update()
+        _assert_values(kpis, _expected_values(space, order))
+
+
+def test_update_after_restore(order: Order) -> None:
+    """Tests the KPIs after items were removed, both with and without restoring the state of the KPIs."""
+    space = Space3D((1200, 800))
+    kpis = KPIs()
+    kpis.reset(space, order)
+    for item, (_, _, *flb) in zip(order.item_sequence[:2], PLACEMENTS):
+        space.addItem(Cuboid(item), 0, flb)
+        kpis.update()
+
+    space_token, kpi_state = space.snapshot(), kpis.getState()
+    for item, (_, _, *flb) in zip(order.item_sequence[2:], PLACEMENTS[2:]):
+        space.addItem(Cuboid(item), 0, flb)
+        kpis.update()
+
+    space.restore(space_token)
+    kpis.setState(kpi_state)
+    _assert_values(kpis, _expected_values(space, order))
+
+    # the running statistics are rebuilt if only the space was restored
+    space.addItem(Cuboid(order.item_sequence[2]), 0, PLACEMENTS[2][2:])
+    kpis.update()
+    space.restore(space_token)
+    space.addItem(Cuboid(order.item_sequence[3]), 0, PLACEMENTS[3][2:])
+    kpis.update()
+    _assert_values(kpis, _expected_values(space, order))
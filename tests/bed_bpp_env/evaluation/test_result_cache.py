@@ -0,0 +1,59 @@
+"""Tests the module `result_cache`."""
+
+from collections.abc import Callable
+from pathlib import Path
+
+from bed_bpp_env.data_model.order import Order
+from bed_bpp_env.data_model.packing_plan import PackingPlan
+from bed_bpp_env.evaluation.packing_plan_evaluator import PackingPlanEvaluator
+from bed_bpp_env.evaluation.result_cache import EvaluationResultCache
+from bed_bpp_env.evaluation.static_stability import StaticStability
+
+
+def test_result_cache_is_content_addressed(
+    tmp_path: Path, make_packing_plan: Callable[..., tuple[Order, PackingPlan]]
+) -> None:
+    """Tests that identical packing plans of different orders share the cached results and changed ones do not."""
+    with EvaluationResultCache(tmp_path / "cache.sqlite") as cache:
+        cache.put_stability(*make_packing_plan("order_1"), {"mean_z-movements/m": 0.0, "max_z-movements/m": 0.01})
+
+    with EvaluationResultCache(tmp_path / "cache.sqlite") as cache:
+        assert cache.get_stability(*make_packing_plan("order_2"))["max_z-movements/m"] == 0.01
+        assert cache.get_stability(*make_packing_plan("order_2", z_of_second_item=201)) is None
+        assert cache.statistics["stability"] == {"hits": 1, "misses": 1}
+
+
+def test_evaluator_uses_cached_kpis(
+    tmp_path: Path, make_packing_plan: Callable[..., tuple[Order, PackingPlan]]
+) -> None:
+    """Tests that the evaluator returns the cached KPIs of an identical packing plan under the current order id."""
+    with EvaluationResultCache(tmp_path / "cache.sqlite") as cache:
+        evaluator = PackingPlanEvaluator(cache)
+        order, packing_plan = make_packing_plan("order_1")
+        assert evaluator.precheckStability(packing_plan, order) is StaticStability.STABLE
+        kpis = evaluator.evaluate(packing_plan, order)
+        assert cache.statistics["kpis"] == {"hits": 0, "misses": 1}
+
+        order, packing_plan = make_packing_plan("order_2")
+        evaluator = PackingPlanEvaluator(cache)
+        evaluator.precheckStability(packing_plan, order)
+        assert evaluator.lookupCachedKPIs(packing_plan, order) is not None
+        cached_kpis = evaluator.evaluate(packing_plan, order)
+        assert cache.statistics["kpis"] == {"hits": 1, "misses": 1}
+
+    assert cached_kpis.pop("order_id") == "order_2"
+    assert kpis.pop("order_id") == "order_1"
+    assert cached_kpis == kpis
+
+
+def test_cached_kpis_depend_on_stability_source(
+    tmp_path: Path, make_packing_plan: Callable[..., tuple[Order, PackingPlan]]
+) -> None:
+    """Tests that KPIs with a verdict of the static stability check are not returned to a run without the check."""
+    with EvaluationResultCache(tmp_path / "cache.sqlite") as cache:
+        order, packing_plan = make_packing_plan("order_1")
+        evaluator = PackingPlanEvaluator(cache)
+        evaluator.precheckStability(packing_plan, order)
+        evaluator.evaluate(packing_plan, order)
+
+        assert PackingPlanEvaluator(cache).lookupCachedKPIs(packing_plan, order) is None
@@ -0,0 +1,86 @@
+"""Tests the module `stability_results`."""
+
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from bed_bpp_env.data_model.action import Action
+from bed_bpp_env.data_model.item import Item
+from bed_bpp_env.data_model.order import Order, Properties
+from bed_bpp_env.data_model.packing_plan import PackingPlan
+from bed_bpp_env.data_model.position_3d import Position3D
+from bed_bpp_env.evaluation.packing_plan_evaluator import PackingPlanEvaluator
+from bed_bpp_env.evaluation.stability_results import StabilityResultStore
+
+
+def _movements(max_z_movement: float) -> dict[str, float]:
+    return {"mean_z-movements/m": 0.0, "max_z-movements/m": max_z_movement}
+
+
+def test_store_reads_appended_lines(tmp_path: Path) -> None:
+    """Tests that lines of other writers are indexed, that the last result counts, and that partial lines wait."""
+    file_path = tmp_path / "stability.txt"
+    file_path.write_text(f"a:{_movements(0.5)}\na:{_movements(0.1)}\n")
+    store = StabilityResultStore(file_path)
+    assert store.get("a") == _movements(0.1)
+    assert store.get("b") is None
+
+    with open(file_path, "a") as file:
+        file.write(f"b:{_movements(0.2)}\nc:{{'mean_z")
+    assert store.get("b") == _movements(0.2)
+    assert "c" not in store
+
+    with open(file_path, "a") as file:
+        file.write("-movements/m': 0.0, 'max_z-movements/m': 0.3}\n")
+    assert store.get("c") == _movements(0.3)
+
+    # a result of another writer for a known order replaces the known result
+    with open(file_path, "a") as file:
+        file.write(f"a:{_movements(0.7)}\n")
+    assert store.get("a") == _movements(0.7)
+
+
+def test_concurrent_appends(tmp_path: Path) -> None:
+    """Tests that the results of several threads are written as complete lines."""
+    file_path = tmp_path / "evaluation" / "stability.txt"
+    store = StabilityResultStore(file_path)
+    order_ids = [f"order_{i}" for i in range(200)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda order_id: store.append(order_id, _movements(0.01)), order_ids))
+
+    reloaded_store = StabilityResultStore(file_path)
+    assert all(reloaded_store.get(order_id) == _movements(0.01) for order_id in order_ids)
+    assert len(file_path.read_text().splitlines()) == len(order_ids)
+
+
+def test_evaluator_uses_store(tmp_path: Path, make_item: Callable[..., Item]) -> None:
+    """Tests that the evaluator decides the stability from the store and memoizes it during an evaluation."""
+    item = make_item(400, 300, 200, weight_kg=5.0)
+    order = Order(id="order", item_sequence=[item], properties=Properties("order", "order", "type", "euro-pallet"))
+    packing_plan = PackingPlan(id="order", actions=[Action(item, 0, Position3D(0, 0, 0))])
+
+    store = StabilityResultStore(tmp_path / "stability.txt")
+    store.append("order", _movements(0.5))
+    evaluator = PackingPlanEvaluator(stability_results=store)
+    evaluator.evaluate(packing_plan, order)
+    assert evaluator.evalStability() == 0
+
+    # the verdict is memoized until the order is evaluated again
+    store.append("order", _movements(0.0))
+    assert evaluator.evalStability() == 0
+    evaluator.evaluate(packing_plan, order)
+    assert evaluator.evalStability() == 1
+
+
+def test_append_reads_lines_of_other_writers_first(tmp_path: Path) -> None:
+    """Tests that an older line of another writer does not replace an appended result and that own lines are skipped."""
+    file_path = tmp_path / "stability.txt"
+    store = StabilityResultStore(file_path)
+    store.append("a", _movements(0.1))
+    assert store._offset == file_path.stat().st_size
+
+    with open(file_path, "a") as file:
+        file.write(f"a:{_movements(0.2)}\n")
+    store.append("a", _movements(0.3))
+    assert store.get("a") == _movements(0.3)
+    assert store._offset == file_path.stat().st_size
@@ -0,0 +1,83 @@
+"""Tests the module `static_stability`."""
+
+from collections.abc import Callable
+from typing import Optional
+
+import pytest
+
+from bed_bpp_env.data_model.item import Item
+from bed_bpp_env.environment.cuboid import Cuboid
+from bed_bpp_env.environment.space_3d import Space3D
+from bed_bpp_env.evaluation.static_stability import (
+    StaticStability,
+    check_static_stability,
+    convex_hull,
+    signed_distance_to_polygon,
+)
+
+
+def _build_pile(
+    make_item: Callable[..., Item],
+    placements: list[tuple[int, int, int, int, int]],
+    weights: Optional[list[float]] = None,
+) -> list[Cuboid]:
+    """
+    Places items with the size `(length, width)` and a height of 100 in the FLB coordinates `(x, y, z)`, which weigh
+    5 kg unless other weights are given.
+    """
+    weights = weights or [5.0] * len(placements)
+    space = Space3D((1200, 800))
+    for (length, width, x, y, z), weight in zip(placements, weights):
+        space.addItem(Cuboid(make_item(length, width, 100, weight_kg=weight)), 0, [x, y, z])
+    return space.getPlacedItems()
+
+
+def test_signed_distance_to_polygon() -> None:
+    """Tests the distance to the convex hull of two rectangles, which is positive inside."""
+    hull = convex_hull([(0, 0), (0, 10), (10, 0), (10, 10), (30, 0), (30, 10), (20, 0), (20, 10)])
+    assert sorted(hull) == [(0, 0), (0, 10), (30, 0), (30, 10)]
+    assert signed_distance_to_polygon((15, 5), hull) == pytest.approx(5)
+    assert signed_distance_to_polygon((35, 5), hull) == pytest.approx(-5)
+
+
+@pytest.mark.parametrize(
+    "placements, expected",
+    [
+        # an aligned tower
+        ([(400, 300, 0, 0, 0), (400, 300, 0, 0, 100)], StaticStability.STABLE),
+        # a bridge over two items
+        ([(200, 300, 0, 0, 0), (200, 300, 300, 0, 0), (500, 300, 0, 0, 100)], StaticStability.STABLE),
+        # the center of mass of the upper item is above the edge of the lower item
+        ([(400, 300, 0, 0, 0), (400, 300, 200, 0, 100)], StaticStability.UNCERTAIN),
+        # the upper item tips over
+        ([(400, 300, 0, 0, 0), (400, 300, 300, 0, 100)], StaticStability.UNSTABLE),
+        # the item floats
+        ([(400, 300, 0, 0, 100)], StaticStability.UNSTABLE),
+    ],
+)
+def test_check_static_stability(make_item: Callable[..., Item], placements: list, expected: StaticStability) -> None:
+    """Tests the classification of clear-cut and uncertain piles."""
+    assert check_static_stability(_build_pile(make_item, placements), target_size=(1200, 800)) is expected
+
+
+def test_load_stabilizes_overhang(make_item: Callable[..., Item]) -> None:
+    """Tests that an overhanging item that carries a load is not classified as unstable."""
+    placements = [(400, 300, 0, 0, 0), (400, 300, 300, 0, 100), (200, 300, 300, 0, 200)]
+    assert check_static_stability(_build_pile(make_item, placements)) is StaticStability.UNCERTAIN
+
+
+def test_indeterminate_load_split_is_uncertain(make_item: Callable[..., Item]) -> None:
+    """
+    Tests that a pile is not stable if an admissible split of the load of a bridge tips an item. The bridge rests on a
+    tower and on an item that overhangs its pedestal, and the heavy item on the bridge is above the overhang.
+    """
+    placements = [
+        (110, 300, 0, 0, 0),
+        (160, 300, 0, 0, 100),
+        (400, 300, 300, 0, 0),
+        (400, 300, 300, 0, 100),
+        (560, 300, 140, 0, 200),
+        (80, 300, 140, 0, 300),
+    ]
+    weights = [5.0, 20.0, 5.0, 5.0, 5.0, 50.0]
+    assert check_static_stability(_build_pile(make_item, placements, weights)) is StaticStability.UNCERTAIN
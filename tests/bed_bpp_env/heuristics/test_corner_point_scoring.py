@@ -0,0 +1,42 @@
+"""Tests the module `corner_point_scoring`."""
+
+import numpy as np
+import pytest
+
+from bed_bpp_env.heuristics.corner_point_scoring import score_corner_points
+
+WEIGHTS = [1.3, -2.0, -1.00001, -1.2]
+
+
+def _score_corner_point(observation: np.ndarray, cornerpoint: list, itemsize: list) -> float:
+    """Scores a single corner point by slicing its footprint from the observation."""
+    x, y, _, orientation = cornerpoint
+    delta_x, delta_y = (itemsize[1], itemsize[0]) if orientation == 1 else (itemsize[0], itemsize[1])
+    footprint = observation[y : y + delta_y, x : x + delta_x]
+    maximum = int(footprint.max())
+
+    support_area = np.count_nonzero((footprint > maximum - 10) & (footprint < maximum + 10)) / footprint.size
+    z = maximum + itemsize[2]
+    distance = np.sqrt(x**2 + y**2 + z**2) / np.sqrt(observation.shape[0] ** 2 + observation.shape[1] ** 2 + 2_000**2)
+    return float(np.dot([support_area, z / max(observation.max(), z), orientation, distance], WEIGHTS))
+
+
+@pytest.mark.parametrize("dtype", [int, np.uint16])
+def test_score_corner_points(dtype: type) -> None:
+    """
+    Tests whether the batched scores equal the scores of single corner points, also at the edges of the target and
+    below the tolerance in the unsigned heights of the compact storage mode.
+    """
+    rng = np.random.default_rng(0)
+    observation = (rng.integers(0, 4, size=(80, 120)) * 100).astype(dtype)
+    observation[60:, :] = 250
+    observation[:5, 100:105] = 3
+
+    cornerpoints = [[0, 0, 0, 0], [0, 0, 0, 1], [110, 70, 0, 0], [37, 55, 0, 1], [90, 10, 0, 0], [5, 79, 0, 1]]
+    cornerpoints += [[100, 0, 0, 0]]
+    itemsizes = [[30, 20, 100], [30, 20, 100], [30, 20, 50], [17, 33, 10], [64, 5, 200], [30, 20, 100], [5, 5, 10]]
+
+    scores = score_corner_points(observation, cornerpoints, itemsizes, WEIGHTS)
+    expected_scores = [_score_corner_point(observation, cp, size) for cp, size in zip(cornerpoints, itemsizes)]
+    assert scores == pytest.approx(expected_scores, rel=0, abs=1e-12)
+    assert score_corner_points(observation, [], [], WEIGHTS).shape == (0,)
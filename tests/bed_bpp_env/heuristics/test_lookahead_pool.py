@@ -0,0 +1,57 @@
+"""Tests the module `lookahead_pool`."""
+
+import pytest
+
+from bed_bpp_env.data_model.item import Item
+from bed_bpp_env.environment.cuboid import Cuboid
+from bed_bpp_env.environment.space_3d import Space3D
+from bed_bpp_env.heuristics.lookahead_pool import LookaheadPool
+
+
+def _simulate(space: Space3D, stepactions: list) -> list:
+    """Places an item in each given x-coordinate and returns the resulting heights in these coordinates."""
+    for x in stepactions:
+        item = Item(
+            article="article",
+            id="id",
+            product_group="product_group",
+            length_mm=20,
+            width_mm=20,
+            height_mm=10,
+            weight_kg=1.0,
+            sequence=1,
+        )
+        space.addItem(Cuboid(item), 0, [x, 0, space.max_height_in_footprint(x, 0, 20, 20)])
+    return [int(space.getHeights()[0, x]) for x in stepactions]
+
+
+def test_lookahead_pool_matches_serial_simulation() -> None:
+    """Tests whether the pool returns the results of a serial simulation in the same order."""
+    space = Space3D((100, 80))
+    _simulate(space, [0, 10])
+    actionsequences = [[x, (x + 30) % 80, x] for x in range(0, 80, 10)]
+
+    token = space.snapshot()
+    expected_results = []
+    for actions in actionsequences:
+        expected_results.append(_simulate(space, actions))
+        space.restore(token)
+    space.release(token)
+
+    pool = LookaheadPool(workers=2, chunksize=3)
+    try:
+        pool.set_state(_simulate, space)
+        assert pool.map(actionsequences) == expected_results
+        # the workers keep the state until the next call of `set_state`
+        assert pool.map(actionsequences[::-1]) == expected_results[::-1]
+
+        # an action outside the base area cannot be simulated, the error names the action sequence
+        with pytest.raises(RuntimeError, match="action sequence 4 in chunk 1") as excinfo:
+            pool.map(actionsequences[:4] + [[200]] + actionsequences[4:])
+        assert isinstance(excinfo.value.__cause__, IndexError)
+        assert pool.map(actionsequences) == expected_results
+    finally:
+        pool.close()
+
+    with pytest.raises(ValueError):
+        LookaheadPool(workers=0, chunksize=1)
@@ -0,0 +1,37 @@
+"""Tests the module `columnar_dataset`."""
+
+import pickle
+from pathlib import Path
+
+import numpy as np
+
+from bed_bpp_env.columnar_dataset import ColumnarOrderDataset, convert_order_sequence_to_columnar
+from bed_bpp_env.io_utils import load_order_sequence
+
+ORDER_SEQUENCE_PATH = Path(__file__).parents[2] / "example_data" / "5_bed-bpp.json"
+
+
+def test_columnar_dataset(tmp_path: Path) -> None:
+    """Tests that the orders of the columnar dataset equal the orders of the JSON file and that items are views."""
+    order_sequence = load_order_sequence(ORDER_SEQUENCE_PATH)
+    convert_order_sequence_to_columnar(ORDER_SEQUENCE_PATH, tmp_path)
+    dataset = ColumnarOrderDataset(tmp_path)
+
+    assert len(dataset) == len(order_sequence)
+    assert dataset.order_ids == [order.id for order in order_sequence]
+    # the orders are requested in reverse
+    for order in reversed(order_sequence):
+        assert dataset.order(order.id) == order
+        assert dataset.target(order.id) == order.properties.target
+        assert dataset.n_items(order.id) == len(order.item_sequence)
+
+    order = order_sequence[1]
+    items = dataset.items(order.id, start=2, stop=5)
+    assert isinstance(items.dimensions, np.memmap) and not items.dimensions.flags.writeable
+    np.testing.assert_array_equal(
+        items.dimensions, [[item.length_mm, item.width_mm, item.height_mm] for item in order.item_sequence[2:5]]
+    )
+    assert [dataset.articles[code] for code in items.articles] == [item.article for item in order.item_sequence[2:5]]
+
+    unpickled_dataset = pickle.loads(pickle.dumps(dataset))
+    assert unpickled_dataset.order(order.id) == order
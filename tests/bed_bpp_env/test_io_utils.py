@@ -0,0 +1,104 @@
+"""Tests the module `io_utils`."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from bed_bpp_env.io_utils import (
+    PackingPlanStreamWriter,
+    StreamedLookup,
+    compact_packing_plan_stream,
+    iter_json_object_items,
+    iter_json_object_keys,
+    iter_order_ids,
+    iter_order_sequence,
+    load_order_sequence,
+    load_packing_plan_sequence,
+)
+
+ORDER_SEQUENCE_PATH = Path(__file__).parents[2] / "example_data" / "5_bed-bpp.json"
+
+
+def _make_actions(n_actions: int) -> list[dict]:
+    return [
+        {
+            "item": {
+                "article": f"article_{i}",
+                "id": f"id_{i}",
+                "product_group": "product_group",
+                "length/mm": 400,
+                "width/mm": 300,
+                "height/mm": 200,
+                "weight/kg": 3.5,
+                "sequence": i + 1,
+            },
+            "orientation": i % 2,
+            "flb_coordinates": [100 * i, 0, 0],
+        }
+        for i in range(n_actions)
+    ]
+
+
+def test_packing_plan_stream(tmp_path: Path) -> None:
+    """Tests that streamed packing plans are compacted to the legacy format and can be loaded in both formats."""
+    serialized_packing_plans = {"order_1": _make_actions(3), "order_2": _make_actions(1), "order_3": _make_actions(2)}
+
+    stream_path = tmp_path / "packing_plans.jsonl"
+    writer = PackingPlanStreamWriter(stream_path, fsync_interval=2)
+    for order_id in ["order_1", "order_2"]:
+        writer.write(order_id, serialized_packing_plans[order_id])
+    writer.close()
+    # the packing plans that are written after closing are appended
+    writer.write("order_3", serialized_packing_plans["order_3"])
+    writer.close()
+    assert len(stream_path.read_text().splitlines()) == 3
+
+    compacted_path = tmp_path / "packing_plans.json"
+    compact_packing_plan_stream(stream_path, compacted_path)
+    with open(compacted_path) as file:
+        assert json.load(file) == serialized_packing_plans
+
+    assert load_packing_plan_sequence(stream_path) == load_packing_plan_sequence(compacted_path)
+    assert [packing_plan.id for packing_plan in load_packing_plan_sequence(stream_path)] == list(
+        serialized_packing_plans
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1 << 16])
+def test_iter_json_object_items(tmp_path: Path, chunk_size: int) -> None:
+    """Tests that a streamed JSON object equals the loaded one, also if values span several chunks."""
+    serialized = {
+        "a": 12345,
+        "b": {"c": [1.5, "x, y: {z}", None]},
+        'd\\"': [],
+        "e": -0.25e3,
+        "f": ["]}\\", {"g": '\\"[{'}, [[]]],
+        "h": '\\\\"',
+    }
+    file_path = tmp_path / "object.json"
+    file_path.write_text(json.dumps(serialized, indent=4))
+
+    assert list(iter_json_object_items(file_path, chunk_size)) == list(serialized.items())
+    assert list(iter_json_object_keys(file_path, chunk_size)) == list(serialized)
+
+    file_path.write_text(" { } ")
+    assert list(iter_json_object_items(file_path, chunk_size)) == []
+    assert list(iter_json_object_keys(file_path, chunk_size)) == []
+
+    file_path.write_text('{"a": [1, "]"')
+    with pytest.raises(ValueError, match="ended within a value"):
+        list(iter_json_object_keys(file_path, chunk_size))
+
+
+def test_stream_order_sequence() -> None:
+    """Tests the streamed orders, the identifiers, and the lookup of orders that are requested in a different order."""
+    order_sequence = load_order_sequence(ORDER_SEQUENCE_PATH)
+    assert list(iter_order_sequence(ORDER_SEQUENCE_PATH)) == order_sequence
+    assert list(iter_order_ids(ORDER_SEQUENCE_PATH)) == [order.id for order in order_sequence]
+
+    orders = StreamedLookup((order.id, order) for order in iter_order_sequence(ORDER_SEQUENCE_PATH))
+    assert orders.pop(order_sequence[2].id) == order_sequence[2]
+    assert orders.pop(order_sequence[0].id) == order_sequence[0]
+    with pytest.raises(KeyError):
+        orders.pop(order_sequence[0].id)
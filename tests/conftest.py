@@ -0,0 +1,51 @@
+"""Fixtures that are shared by the tests."""
+
+from collections.abc import Callable
+
+import pytest
+
+from bed_bpp_env.data_model.action import Action
+from bed_bpp_env.data_model.item import Item
+from bed_bpp_env.data_model.order import Order, Properties
+from bed_bpp_env.data_model.packing_plan import PackingPlan
+from bed_bpp_env.data_model.position_3d import Position3D
+
+
+@pytest.fixture
+def make_item() -> Callable[..., Item]:
+    """
+    Fixture that returns a factory of sample items. The size is given as `(length, width, height)`, the other fields,
+    e.g., the weight, can be given as keywords.
+    """
+
+    def _make_item(length: int = 300, width: int = 200, height: int = 100, **fields) -> Item:
+        sample_fields = {
+            "article": "article",
+            "id": "id",
+            "product_group": "product_group",
+            "weight_kg": 1.0,
+            "sequence": 1,
+        }
+        return Item(length_mm=length, width_mm=width, height_mm=height, **(sample_fields | fields))
+
+    return _make_item
+
+
+@pytest.fixture
+def make_packing_plan(make_item: Callable[..., Item]) -> Callable[..., tuple[Order, PackingPlan]]:
+    """
+    Fixture that returns a factory of sample orders of two items with the given id, and of packing plans that stack the
+    second item on the first item.
+    """
+
+    def _make_packing_plan(order_id: str, z_of_second_item: int = 200) -> tuple[Order, PackingPlan]:
+        items = [make_item(400, 300, 200, id=f"id_{i}", weight_kg=5.0, sequence=i + 1) for i in range(2)]
+        properties = Properties(id=order_id, order_number=order_id, type="type", target="euro-pallet")
+        order = Order(id=order_id, item_sequence=items, properties=properties)
+        actions = [
+            Action(item=items[0], orientation=0, flb_coordinates=Position3D(0, 0, 0)),
+            Action(item=items[1], orientation=0, flb_coordinates=Position3D(0, 0, z_of_second_item)),
+        ]
+        return order, PackingPlan(id=order_id, actions=actions)
+
+    return _make_packing_plan